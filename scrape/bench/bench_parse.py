@@ -0,0 +1,109 @@
+# bench/bench_parse.py
+"""
+Inflexer parse 엔진 비교 벤치마크 (pandas vs dict).
+
+같은 합성 payload로 두 엔진을 돌려 소요 시간/처리량을 비교하고, 결과 행이 같은지 확인합니다.
+DB/네트워크는 사용하지 않습니다.
+
+사용법 (scrape 디렉터리에서):
+    python bench/bench_parse.py
+    python bench/bench_parse.py --sizes 1000 10000 --repeat 5 --import-time
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings  # noqa: E402
+from scrapers.inflexer import InflexerScraper, MEDIA_MAP, TYPE_MAP  # noqa: E402
+
+ENGINES = ("pandas", "dict")
+
+
+def make_payload(n: int, seed: int = 42) -> list:
+    """Inflexer /search 응답의 result 항목과 같은 모양의 합성 데이터 (중복/공백/빈 날짜 포함)"""
+    rnd = random.Random(seed)
+    medias = list(MEDIA_MAP) + ["XX_"]
+    types = list(TYPE_MAP) + ["ETC"]
+    items = []
+    for i in range(n):
+        # 약 5%는 앞 행과 충돌 키가 같은 중복
+        j = rnd.randrange(i) if i and rnd.random() < 0.05 else i
+        day = 1 + j % 28
+        items.append({
+            "domain": rnd.choice(["revu", "dinnerqueen", "gangnam"]) if j == i else items[j]["domain"],
+            "title": f"  캠페인 {j} 강남점 " if j % 7 == 0 else f"캠페인 {j}",
+            "offer": f"{j % 50}만원 상당 이용권",
+            "url": f"https://example.com/c/{j}",
+            "media": medias[j % len(medias)],
+            "type": types[j % len(types)],
+            "apl_due_dt": f"2026-02-{day:02d}",
+            "pub_due_dt": "" if j % 11 == 0 else f"2026-03-{day:02d}",
+            "apl_stt_dt": f"2026-01-{day:02d}",
+            "region": "강남",
+            "search_text": "강남",
+        })
+    return items
+
+
+def run_engine(scraper: InflexerScraper, engine: str, items: list):
+    settings.batch.PARSE_ENGINE = engine
+    # pandas 엔진은 scrape가 만든 DataFrame을 받으므로 변환 비용까지 포함
+    if engine == "pandas":
+        import pandas as pd
+        return scraper.parse(pd.DataFrame(items))
+    return scraper.parse(items)
+
+
+def bench(scraper: InflexerScraper, items: list, repeat: int) -> dict:
+    results = {}
+    for engine in ENGINES:
+        best = float("inf")
+        out = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            out = run_engine(scraper, engine, items)
+            best = min(best, time.perf_counter() - t0)
+        results[engine] = (best, out)
+    return results
+
+
+def import_time(module: str) -> float:
+    """새 인터프리터에서 module import에 걸리는 시간(초)"""
+    code = f"import time; t=time.perf_counter(); import {module}; print(time.perf_counter()-t)"
+    return float(subprocess.check_output([sys.executable, "-c", code]).decode().strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inflexer parse 엔진 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--import-time", action="store_true", help="pandas/numpy cold import 시간도 측정")
+    args = parser.parse_args()
+
+    scraper = InflexerScraper()
+    original = settings.batch.PARSE_ENGINE
+    try:
+        print(f"{'rows':>8} {'engine':>7} {'best(s)':>9} {'rows/s':>11} {'out':>8}")
+        for n in args.sizes:
+            items = make_payload(n)
+            results = bench(scraper, items, args.repeat)
+            for engine, (sec, out) in results.items():
+                print(f"{n:>8} {engine:>7} {sec:>9.4f} {n / sec:>11,.0f} {len(out):>8}")
+            same = results["pandas"][1] == results["dict"][1]
+            speedup = results["pandas"][0] / results["dict"][0]
+            print(f"{'':>8} 결과 일치: {same}, dict 엔진 {speedup:.1f}배")
+    finally:
+        settings.batch.PARSE_ENGINE = original
+
+    if args.import_time:
+        for module in ("numpy", "pandas"):
+            print(f"import {module}: {import_time(module):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
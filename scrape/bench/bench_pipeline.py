@@ -0,0 +1,276 @@
+# bench/bench_pipeline.py
+"""
+스크레이프 파이프라인 단계별 벤치마크.
+
+합성 Inflexer payload(기본 1k/10k/100k 캠페인)로 scrape → parse → enrich → save →
+_load_existing_map 을 실행하며 단계마다 소요 시간, rows/s, DB 왕복 수, 최대 RSS를 측정합니다.
+- 외부 API는 tools/stub_server.py의 StubServer가 합성 응답으로 대신합니다 (쿼터 사용 없음).
+- DB는 POSTGRES_* 설정의 로컬 Postgres를 사용합니다. 벤치 데이터는 platform 'bench-*',
+  title '벤치 캠페인 *'으로 만들어 실행 전후에 해당 행만 지웁니다. 운영 DB에는 실행하지 마세요.
+- 크기마다 새 프로세스에서 실행하므로 최대 RSS(ru_maxrss)는 크기별 값입니다
+  (단계별 값은 그 단계까지의 최대치).
+- 결과는 JSON으로 저장하고, --baseline으로 이전 결과와 비교할 수 있습니다.
+- BENCH_STUB_RATE_429(비율)/BENCH_STUB_THROTTLE_FIRST(경로별 처음 N건)로 local search와 geocode에 429를 주입합니다.
+  THROTTLE_FIRST를 주면 enrich 단계에서 두 엔드포인트 모두 api_throttled가 집계됐는지 확인하고,
+  아니면 실패로 끝냅니다 (재시도/백오프 경로가 동작하지 않는 것).
+
+사용법 (scrape 디렉터리에서):
+    python bench/bench_pipeline.py
+    python bench/bench_pipeline.py --sizes 1000 10000 --output bench/results/after.json \\
+        --baseline bench/results/before.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+SCRAPE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPE_ROOT)
+
+KEYWORD = "벤치"
+# 429 주입 대상 (Naver local search, geocode) — api_throttled의 endpoint 라벨과 짝
+FAULT_PATHS = {"local_search": "/v1/search/local.json", "geocode": "/map-geocode/v2/geocode"}
+STAGES = ["scrape", "parse", "enrich", "save", "save_unchanged", "load_existing_keys", "load_existing_all"]
+
+# 벤치 실행에 맞춘 기본값 (환경변수로 덮어쓸 수 있음)
+BENCH_ENV_DEFAULTS = {
+    "ENRICH_MODE": "async",
+    "NAVER_SEARCH_CLIENT_ID": "bench",
+    "NAVER_SEARCH_CLIENT_SECRET": "bench",
+    "NAVER_SEARCH_RATE_PER_WINDOW": "1000000",
+    "NAVER_MAP_CLIENT_ID": "bench",
+    "NAVER_MAP_CLIENT_SECRET": "bench",
+    "CHECKPOINT_ENABLED": "false",
+}
+
+
+def make_campaigns(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Inflexer /search result 항목 모양의 합성 캠페인 (약 3% 중복 키 포함)"""
+    rnd = random.Random(seed)
+    medias = ["BP_", "IP_", "IR_", "BP_IP_", "YP_", ""]
+    types = ["VST", "VST", "SHP", "PRS"]
+    items = []
+    for i in range(n):
+        j = rnd.randrange(i) if i and rnd.random() < 0.03 else i
+        day = 1 + j % 28
+        items.append({
+            "domain": f"bench-{j % 5}",
+            "title": f"벤치 캠페인 {j}",
+            "offer": f"{j % 50}만원 상당 이용권",
+            "url": f"https://example.com/c/{j}",
+            "media": medias[j % len(medias)],
+            "type": types[j % len(types)],
+            "apl_due_dt": f"2026-02-{day:02d}",
+            "pub_due_dt": f"2026-03-{day:02d}",
+            "apl_stt_dt": f"2026-01-{day:02d}",
+        })
+    return items
+
+
+def make_cassettes(items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """StubServer용 합성 응답. local search/geocode는 경로 단위로 템플릿을 돌려가며 반환(on_miss=cycle)."""
+    from urllib.parse import urlencode
+
+    def entry(key: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"key": key, "status": 200, "content_type": "application/json", "body": json.dumps(body, ensure_ascii=False)}
+
+    search_key = "/search?" + urlencode({"query": KEYWORD})
+    map_key = "/map?" + urlencode(sorted({"query": KEYWORD, "type": "VST"}.items()))
+    map_result = [
+        {"title": it["title"], "latitude": 37.4 + (i % 100) / 1000, "longitude": 127.0 + (i % 100) / 1000}
+        for i, it in enumerate(items) if i % 3 == 0
+    ]
+    local_templates = [
+        {"items": [{"roadAddress": f"벤치시 {k}로 1", "mapx": str(1270000000 + k * 1000), "mapy": str(375000000 + k * 1000),
+                    "category": "음식점>한식"}]}
+        for k in range(8)
+    ] + [
+        {"items": [{"roadAddress": "벤치시 좌표없음로 1", "mapx": "", "mapy": "", "category": "카페"}]},
+        {"items": []},
+    ]
+    return {
+        search_key: [entry(search_key, {"is_valid": True, "result": items})],
+        map_key: [entry(map_key, {"result": map_result})],
+        "/v1/search/local.json?": [entry("/v1/search/local.json?", body) for body in local_templates],
+        "/map-geocode/v2/geocode?": [entry("/map-geocode/v2/geocode?", {"addresses": [{"y": "37.51", "x": "127.01"}]})],
+    }
+
+
+def peak_rss_mb() -> float:
+    # Linux: KiB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(n: int) -> Dict[str, Any]:
+    """한 크기에 대한 측정 (새 프로세스에서 실행)"""
+    from tools.stub_server import StubServer
+
+    items = make_campaigns(n)
+    throttle_first = int(os.getenv("BENCH_STUB_THROTTLE_FIRST", "0"))
+    stub = StubServer(
+        make_cassettes(items),
+        latency_ms=float(os.getenv("BENCH_STUB_LATENCY_MS", "0")),
+        rate_429=float(os.getenv("BENCH_STUB_RATE_429", "0")),
+        fault_paths=list(FAULT_PATHS.values()),
+        throttle_first=throttle_first,
+    ).start()
+    for name in ("INFLEXER_BASE_URL", "NAVER_OPENAPI_BASE_URL", "NAVER_MAPS_BASE_URL"):
+        os.environ[name] = stub.url
+    for name, value in BENCH_ENV_DEFAULTS.items():
+        os.environ.setdefault(name, value)
+
+    from sqlalchemy import text
+
+    from core import metrics
+    from core.db import get_engine
+    from scrapers import load_scraper_class
+
+    engine = get_engine()
+
+    def cleanup():
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM campaign WHERE platform LIKE 'bench-%'"))
+            conn.execute(text("DELETE FROM local_search_cache WHERE title LIKE '벤치 캠페인 %'"))
+            conn.execute(text("DELETE FROM geocode_cache WHERE address LIKE '벤치시 %'"))
+            # 남아 있으면 다음 실행이 negative TTL 동안 해당 조회를 건너뛰어 측정값이 달라짐
+            if conn.execute(text("SELECT to_regclass('scrape_negative_cache')")).scalar() is not None:
+                conn.execute(text(
+                    "DELETE FROM scrape_negative_cache WHERE cache = 'local' AND key_text LIKE '벤치 캠페인 %'"
+                ))
+                conn.execute(text(
+                    "DELETE FROM scrape_negative_cache WHERE cache = 'geocode' AND key_text LIKE '벤치시 %'"
+                ))
+
+    cleanup()
+    scraper = load_scraper_class("inflexer")()
+    stages: Dict[str, Dict[str, Any]] = {}
+
+    def measure(stage: str, rows: int, fn):
+        # 단계마다 새 run 메트릭을 활성화해 core.db의 커서가 세는 DB 왕복 수를 단계별로 얻음
+        stage_metrics = metrics.RunMetrics("bench", KEYWORD)
+        token = metrics.activate(stage_metrics)
+        started = time.perf_counter()
+        try:
+            out = fn()
+        finally:
+            seconds = time.perf_counter() - started
+            metrics.deactivate(token)
+        stages[stage] = {
+            "rows": rows,
+            "seconds": round(seconds, 4),
+            "rows_per_s": round(rows / seconds, 1) if seconds > 0 else None,
+            "db_round_trips": int(stage_metrics.total("db_round_trips")),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        }
+        throttled = {ep: int(stage_metrics.total("api_throttled", endpoint=ep)) for ep in FAULT_PATHS}
+        if any(throttled.values()):
+            stages[stage]["api_throttled"] = throttled
+        return out
+
+    try:
+        raw = measure("scrape", n, lambda: scraper.scrape(KEYWORD))
+        parsed = measure("parse", n, lambda: scraper.parse(raw))
+        enriched = measure("enrich", len(parsed), lambda: scraper.enrich(parsed, KEYWORD))
+        measure("save", len(enriched), lambda: scraper.save(enriched))
+        measure("save_unchanged", len(enriched), lambda: scraper.save(enriched))
+        keys = [scraper._conflict_key(r) for r in enriched]
+        measure("load_existing_keys", len(keys), lambda: scraper._load_existing_map(keys=keys))
+        existing = measure("load_existing_all", 0, lambda: scraper._load_existing_map())
+        stages["load_existing_all"]["rows"] = len(existing)
+        s = stages["load_existing_all"]
+        s["rows_per_s"] = round(len(existing) / s["seconds"], 1) if s["seconds"] > 0 else None
+    finally:
+        cleanup()
+        stub.stop()
+
+    if throttle_first:
+        throttled = stages["enrich"].get("api_throttled", {})
+        missing = [ep for ep in FAULT_PATHS if not throttled.get(ep)]
+        if missing:
+            raise RuntimeError(f"429를 주입했지만 api_throttled가 집계되지 않은 엔드포인트: {missing} ({throttled})")
+
+    return {"rows": n, "stages": stages, "stub": dict(stub.stats)}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRAPE_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Dict[int, Dict[str, Any]]) -> None:
+    print(f"{'rows':>7} {'stage':>18} {'seconds':>9} {'rows/s':>11} {'db_rt':>7} {'rss_mb':>8} {'vs base':>8}")
+    for res in results:
+        base_stages = baseline.get(res["rows"], {}).get("stages", {})
+        for stage in STAGES:
+            s = res["stages"].get(stage)
+            if not s:
+                continue
+            delta = ""
+            base = base_stages.get(stage)
+            if base and base["seconds"]:
+                delta = f"{(s['seconds'] - base['seconds']) / base['seconds'] * 100:+.0f}%"
+            rps = f"{s['rows_per_s']:,.0f}" if s["rows_per_s"] else "-"
+            print(
+                f"{res['rows']:>7} {stage:>18} {s['seconds']:>9.3f} {rps:>11} "
+                f"{s['db_round_trips']:>7} {s['peak_rss_mb']:>8.1f} {delta:>8}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크레이프 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: bench/results/pipeline-<시각>.json)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker), ensure_ascii=False))
+        return
+
+    results = []
+    for n in args.sizes:
+        print(f"[bench] {n}건 실행 중...", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(n)],
+            cwd=SCRAPE_ROOT, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr[-4000:])
+            sys.exit(f"[bench] {n}건 실행 실패")
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "revision": git_revision(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "env": {k: os.getenv(k, v) for k, v in BENCH_ENV_DEFAULTS.items() if "CLIENT" not in k},
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        SCRAPE_ROOT, "bench", "results", f"pipeline-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {r["rows"]: r for r in json.load(f)["results"]}
+    print_results(results, baseline)
+    print(f"결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
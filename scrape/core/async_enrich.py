@@ -0,0 +1,55 @@
+# core/async_enrich.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+
+from .logger import get_logger
+
+log = get_logger("async_enrich")
+
+
+class EndpointLimiter:
+    """
+    엔드포인트(local search, geocode 등)별로 동시 호출 수를 제한합니다.
+    워커 스레드에서 호출되므로 threading 세마포어를 사용합니다.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self._sems = {
+            name: threading.BoundedSemaphore(max(1, int(n)))
+            for name, n in limits.items()
+        }
+
+    def call(self, endpoint: str, fn: Callable, *args, **kwargs):
+        sem = self._sems.get(endpoint)
+        if sem is None:
+            return fn(*args, **kwargs)
+        with sem:
+            return fn(*args, **kwargs)
+
+
+async def _gather_in_threads(items: List[Any], worker: Callable[[Any], Any], max_workers: int) -> List[Any]:
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrich")
+    loop.set_default_executor(executor)
+    gate = asyncio.Semaphore(max_workers)
+
+    async def _one(item):
+        async with gate:
+            return await asyncio.to_thread(worker, item)
+
+    return await asyncio.gather(*(_one(item) for item in items))
+
+
+def run_concurrently(items: Iterable[Any], worker: Callable[[Any], Any], max_workers: int) -> List[Any]:
+    """
+    items 각각에 대해 worker를 스레드풀에서 실행하고, 입력 순서대로 결과를 반환합니다.
+    동시에 실행되는 worker 수는 max_workers로 제한됩니다.
+    """
+    items = list(items)
+    if not items:
+        return []
+    max_workers = max(1, int(max_workers))
+    log.info(f"async enrich 실행 — 대상 {len(items)}건, 동시 처리 {max_workers}")
+    return asyncio.run(_gather_in_threads(items, worker, max_workers))
@@ -1,18 +1,39 @@
 # core/base.py (API 중심 최종 버전)
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Optional
-from core.logger import get_logger
+from typing import Any, List, Dict, Optional, Tuple
+from core.logger import activate_sampler, deactivate_sampler, get_logger, log_sampled
 from core.config import settings
+from core.key_scheduler import NaverKeyScheduler
+from core.write_buffer import CacheWriteBuffer
+from core.category import CategoryResolver
+from core.checkpoint import EnrichCheckpoint
+from core.db import get_engine, local_settings_sql
+from core import metrics
+from core.memcache import LruTtlCache
+from core.normalize import canonical_address, canonical_title
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
+import contextvars
+import csv
+import hashlib
+import io
 import math
+import numbers
+import queue
+import threading
 
 log = get_logger("scraper.base")
 
+_STREAM_END = object()  # 스트리밍 파이프라인 큐 종료 표시
+
 DRIFT_METERS = 50  # 필요시 per-scraper override 가능
 
+# campaign.content_hash 컬럼 존재 여부 (프로세스당 한 번 확인, None이면 아직 확인 전)
+_content_hash_column: Optional[bool] = None
+_content_hash_lock = threading.Lock()
+
 class BaseScraper(ABC):
     """
     모든 스크레이퍼를 위한 추상 기본 클래스입니다.
@@ -77,12 +98,38 @@ class BaseScraper(ABC):
         self.settings = settings
         self.logger = get_logger(f"scraper.{self.PLATFORM_NAME}")
 
-        self.engine = create_engine(
-            self.settings.db.url, 
-            pool_pre_ping=True
-        )
+        # 엔진/커넥션 풀은 프로세스 전체가 공유 (core/db.py)
+        self.engine = get_engine()
         self.Session = sessionmaker(bind=self.engine)
 
+        # 검색 키 스케줄러는 인스턴스 단위로 공유 (키별 쿨다운/요청 수가 run 사이에도 유지됨)
+        self.key_scheduler = self.get_key_scheduler()
+
+        # 캐시 쓰기는 버퍼에 모아 두었다가 배치 upsert (run 종료 시 flush)
+        self.cache_writer = CacheWriteBuffer(
+            self.engine,
+            key_hash=self._cache_hash,
+            local_key=self._local_key,
+            geocode_key=self._geocode_key,
+            max_pending=self.settings.batch.CACHE_WRITE_BATCH_SIZE,
+            flush_interval=self.settings.batch.CACHE_WRITE_FLUSH_SECONDS,
+        )
+        # local_search_cache / geocode_cache 앞단 메모리 tier (키워드 워커 스레드가 공유)
+        # 키는 ("local" | "geocode", 조회 키), 값은 DB 캐시 행과 같은 형태의 dict
+        batch = self.settings.batch
+        self.memory_cache = LruTtlCache(
+            max_entries=batch.MEMORY_CACHE_MAX_ENTRIES,
+            max_bytes=int(batch.MEMORY_CACHE_MAX_MB * 1024 * 1024),
+            ttl_seconds=batch.MEMORY_CACHE_TTL_SECONDS,
+        ) if batch.MEMORY_CACHE_ENABLED else None
+        self._db_tier_lock = threading.Lock()
+        self._db_tier = {"hits": 0, "misses": 0}
+        # 원본 카테고리 → 표준 카테고리 매핑은 메모리 인덱스로 처리 (첫 조회 시 로드)
+        self.category_resolver = CategoryResolver(
+            self.engine,
+            refresh_seconds=self.settings.batch.CATEGORY_INDEX_REFRESH_SECONDS,
+        )
+
     @abstractmethod
     def scrape(self, keyword: Optional[str] = None) -> List[Dict[str, Any]]:
         raise NotImplementedError
@@ -98,70 +145,482 @@ class BaseScraper(ABC):
         self.logger.info("Enrich 단계는 구현되지 않아 건너뜁니다.")
         return parsed_data
 
-    def save(self, data: List[Dict[str, Any]]) -> None:
+    # campaign upsert 대상 컬럼 (충돌 키 4개 + 갱신 컬럼)
+    CONFLICT_COLUMNS = ["platform", "title", "offer", "campaign_channel"]
+    UPSERT_COLUMNS = CONFLICT_COLUMNS + [
+        "company", "content_link", "company_link", "source", "campaign_type", "region",
+        "apply_deadline", "review_deadline", "address", "lat", "lng", "category_id", "img_url",
+    ]
+    INT_COLUMNS = {"category_id"}
+    # 갱신 컬럼 내용의 지문. 값이 같으면 ON CONFLICT에서 UPDATE를 건너뜀
+    FINGERPRINT_COLUMN = "content_hash"
+
+    @property
+    def _skip_unchanged(self) -> bool:
+        """SAVE_SKIP_UNCHANGED가 켜져 있고 campaign.content_hash 컬럼이 있을 때만 지문을 사용"""
+        return self.settings.batch.SAVE_SKIP_UNCHANGED and self._has_content_hash_column()
+
+    def _has_content_hash_column(self) -> bool:
+        """
+        add_content_hash_to_campaign.sql 적용 여부를 프로세스당 한 번 확인합니다.
+        컬럼이 없거나 확인에 실패하면 경고를 남기고 지문 없는 기존 upsert로 저장합니다.
+        """
+        global _content_hash_column
+        if _content_hash_column is None:
+            with _content_hash_lock:
+                if _content_hash_column is None:
+                    try:
+                        with self.engine.connect() as conn:
+                            found = conn.execute(text("""
+                                SELECT 1 FROM information_schema.columns
+                                WHERE table_schema = current_schema()
+                                AND table_name = 'campaign' AND column_name = :col
+                            """), {"col": self.FINGERPRINT_COLUMN}).first()
+                        _content_hash_column = found is not None
+                    except Exception as e:
+                        log.warning(f"campaign.{self.FINGERPRINT_COLUMN} 컬럼 확인 실패: {e}")
+                        _content_hash_column = False
+                    if not _content_hash_column:
+                        log.warning(
+                            f"campaign.{self.FINGERPRINT_COLUMN} 컬럼이 없어 SAVE_SKIP_UNCHANGED를 끄고 저장합니다 "
+                            "(add_content_hash_to_campaign.sql 적용 필요)"
+                        )
+        return _content_hash_column
+
+    def _write_columns(self) -> List[str]:
+        """INSERT에 쓰는 컬럼 목록 (지문 사용 시 content_hash 포함)"""
+        if self._skip_unchanged:
+            return self.UPSERT_COLUMNS + [self.FINGERPRINT_COLUMN]
+        return list(self.UPSERT_COLUMNS)
+
+    def _fingerprint(self, row: Dict[str, Any]) -> str:
+        """
+        upsert 컬럼 값의 안정적인 sha1 지문(hex).
+        None/NaN, 정수 컬럼의 7.0/7, Timestamp/datetime 표기 차이가 지문을 바꾸지 않도록 정규화합니다.
+        숫자(Decimal/int/float/numpy)는 float로 바꿔 repr로 적으므로, DB에서 읽은 Decimal 좌표와
+        파싱/API에서 온 float 좌표가 같은 값이면 같은 지문이 됩니다.
+        """
+        parts = []
+        for col in self.UPSERT_COLUMNS:
+            v = row.get(col)
+            if isinstance(v, numbers.Number) and not isinstance(v, bool):
+                v = float(v)
+            if v is None or (isinstance(v, float) and math.isnan(v)):
+                parts.append("")
+            elif col in self.INT_COLUMNS:
+                parts.append(str(int(v)))
+            elif isinstance(v, float):
+                parts.append(repr(v))
+            elif hasattr(v, "isoformat"):
+                parts.append(v.isoformat())
+            else:
+                parts.append(str(v))
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _with_fingerprint(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self._skip_unchanged:
+            return data
+        return [{**row, self.FINGERPRINT_COLUMN: self._fingerprint(row)} for row in data]
+
+    def _upsert_conflict_sql(self) -> str:
+        """ON CONFLICT 절 (save의 모든 경로가 공유). 지문이 같으면 UPDATE 하지 않습니다."""
+        updates = ", ".join(
+            f"{col} = EXCLUDED.{col}" for col in self._write_columns() if col not in self.CONFLICT_COLUMNS
+        )
+        sql = f"ON CONFLICT ({', '.join(self.CONFLICT_COLUMNS)}) DO UPDATE SET {updates}, updated_at = NOW()"
+        if self._skip_unchanged:
+            fp = self.FINGERPRINT_COLUMN
+            sql += f" WHERE campaign.{fp} IS DISTINCT FROM EXCLUDED.{fp}"
+        return sql
+
+    def save(self, data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """최종 데이터를 저장하고 결과 건수를 현재 run 메트릭(rows)에 기록합니다."""
+        result = self._save(data)
+        for name, n in result.items():
+            if n:
+                metrics.incr("rows", n, result=name)
+        return result
+
+    def _save(self, data: List[Dict[str, Any]]) -> Dict[str, int]:
         """
         최종 데이터를 데이터베이스에 저장합니다.
+        BatchSettings.SAVE_MODE가 "copy"면 COPY + 스테이징 테이블 병합 경로를 사용합니다.
+        SAVE_SKIP_UNCHANGED면 content_hash가 같은 행은 UPDATE 하지 않고 skipped로 집계합니다.
+        반환: {"saved", "inserted", "updated", "skipped", "failed"} 건수
+        (upsert 모드는 inserted/updated를 구분하지 않고 saved로만 집계)
         """
+        result = {"saved": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0}
         if not data:
             log.warning("저장할 최종 데이터가 없습니다.")
-            return
+            return result
+
+        data = self._with_fingerprint(data)
+        if self.settings.batch.SAVE_MODE == "copy":
+            return self._save_copy(data)
 
         log.info(f"정제된 최종 데이터 {len(data)}건을 DB에 저장 시작...")
-        
+
+        cols = self._write_columns()
         with self.Session() as session:
             try:
                 upsert_sql = text(f"""
-                    INSERT INTO campaign (
-                        platform, title, offer, campaign_channel, company, content_link, 
-                        company_link, source, campaign_type, region, apply_deadline, 
-                        review_deadline, address, lat, lng, category_id, img_url
-                    ) VALUES (
-                        :platform, :title, :offer, :campaign_channel, :company, :content_link, 
-                        :company_link, :source, :campaign_type, :region, :apply_deadline, 
-                        :review_deadline, :address, :lat, :lng, :category_id, :img_url
-                    )
-                    ON CONFLICT (platform, title, offer, campaign_channel) DO UPDATE SET
-                        company = EXCLUDED.company, source = EXCLUDED.source,
-                        content_link = EXCLUDED.content_link, company_link = EXCLUDED.company_link,
-                        campaign_type = EXCLUDED.campaign_type, region = EXCLUDED.region,
-                        apply_deadline = EXCLUDED.apply_deadline, review_deadline = EXCLUDED.review_deadline,
-                        address = EXCLUDED.address, lat = EXCLUDED.lat, lng = EXCLUDED.lng,
-                        category_id = EXCLUDED.category_id, img_url = EXCLUDED.img_url,
-                        updated_at = NOW();
+                    INSERT INTO campaign ({", ".join(cols)})
+                    VALUES ({", ".join(":" + c for c in cols)})
+                    {self._upsert_conflict_sql()}
                 """)
-                session.execute(upsert_sql, data)
+                res = session.execute(upsert_sql, [{c: row.get(c) for c in cols} for row in data])
                 session.commit()
-                log.info(f"DB 저장 완료. 총 {len(data)}건의 데이터가 성공적으로 처리되었습니다.")
+                # 지문이 같아 UPDATE 되지 않은 행은 rowcount에 포함되지 않음
+                written = res.rowcount if res.rowcount is not None and res.rowcount >= 0 else len(data)
+                result["saved"] = written
+                result["skipped"] = len(data) - written
+                log.info(
+                    f"DB 저장 완료. 총 {len(data)}건 중 {written}건 저장, "
+                    f"변경 없음 {result['skipped']}건"
+                )
             except Exception as e:
                 log.error(f"DB 저장 중 에러 발생: {e}", exc_info=True)
                 session.rollback()
+                result["failed"] = len(data)
+        return result
+
+    @staticmethod
+    def _apply_local_settings(cur) -> None:
+        """raw 커넥션 트랜잭션 시작 시 SET LOCAL 적용 (PgBouncer 모드, 엔진 begin 이벤트를 타지 않는 경로용)"""
+        sql = local_settings_sql()
+        if sql:
+            cur.execute(sql)
+
+    def _copy_value(self, col: str, v) -> Any:
+        """COPY(csv)용 값 변환. None → NULL 마커, 정수 컬럼의 7.0 → 7"""
+        if v is None or (isinstance(v, float) and math.isnan(v)):
+            return r"\N"
+        if col in self.INT_COLUMNS and isinstance(v, float):
+            return int(v)
+        return v
 
-    def run(self, keyword: Optional[str] = None) -> None:
+    def _save_copy(self, data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        COPY로 임시 스테이징 테이블에 적재한 뒤 INSERT ... SELECT ... ON CONFLICT 한 번으로 병합합니다.
+        SAVE_CHUNK_SIZE 단위로 커밋하며, 실패한 청크는 행 단위(SAVEPOINT)로 다시 저장해
+        문제 있는 행만 건너뜁니다.
+        """
+        # 같은 충돌 키가 여러 번 있으면 마지막 값 사용 (executemany 경로와 동일)
+        deduped = list({tuple(row.get(c) for c in self.CONFLICT_COLUMNS): row for row in data}.values())
+        chunk_size = max(1, self.settings.batch.SAVE_CHUNK_SIZE)
+        result = {"saved": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0}
+        log.info(f"정제된 최종 데이터 {len(deduped)}건을 COPY 모드로 저장 시작 (chunk={chunk_size})")
+
+        raw = self.engine.raw_connection()
+        try:
+            for start in range(0, len(deduped), chunk_size):
+                chunk = deduped[start:start + chunk_size]
+                try:
+                    inserted, updated = self._copy_merge_chunk(raw, chunk)
+                    raw.commit()
+                    failed = 0
+                    skipped = len(chunk) - inserted - updated
+                except Exception as e:
+                    raw.rollback()
+                    log.warning(f"COPY 청크({start}~{start + len(chunk) - 1}) 실패 → 행 단위 재시도: {e}")
+                    inserted, updated, skipped, failed = self._save_rows_individually(raw, chunk)
+                result["inserted"] += inserted
+                result["updated"] += updated
+                result["skipped"] += skipped
+                result["failed"] += failed
+        finally:
+            raw.close()
+
+        result["saved"] = result["inserted"] + result["updated"]
+        log.info(
+            f"DB 저장 완료 (COPY). 신규 {result['inserted']}건, 갱신 {result['updated']}건, "
+            f"변경 없음 {result['skipped']}건, 실패 {result['failed']}건"
+        )
+        return result
+
+    def _copy_merge_chunk(self, raw, chunk: List[Dict[str, Any]]):
+        """
+        청크 하나를 COPY → 병합합니다. (inserted, updated)를 반환하며 커밋은 호출자가 합니다.
+        지문이 같아 건너뛴 행은 RETURNING에 나오지 않으므로 둘 다에 포함되지 않습니다.
+        """
+        columns = self._write_columns()
+        cols = ", ".join(columns)
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in chunk:
+            writer.writerow([self._copy_value(c, row.get(c)) for c in columns])
+        buf.seek(0)
+
+        with raw.cursor() as cur:
+            self._apply_local_settings(cur)
+            cur.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS campaign_stage ON COMMIT DROP AS
+                SELECT {cols} FROM campaign WITH NO DATA
+            """)
+            cur.copy_expert(f"COPY campaign_stage ({cols}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buf)
+            cur.execute(f"""
+                INSERT INTO campaign ({cols})
+                SELECT {cols} FROM campaign_stage
+                {self._upsert_conflict_sql()}
+                RETURNING (xmax = 0) AS inserted
+            """)
+            flags = [r[0] for r in cur.fetchall()]
+        inserted = sum(1 for f in flags if f)
+        return inserted, len(flags) - inserted
+
+    def _save_rows_individually(self, raw, chunk: List[Dict[str, Any]]):
+        """행마다 SAVEPOINT를 두고 저장합니다. (inserted, updated, skipped, failed)를 반환합니다."""
+        columns = self._write_columns()
+        cols = ", ".join(columns)
+        placeholders = ", ".join(f"%({c})s" for c in columns)
+        sql = f"""
+            INSERT INTO campaign ({cols}) VALUES ({placeholders})
+            {self._upsert_conflict_sql()}
+            RETURNING (xmax = 0) AS inserted
+        """
+        inserted = updated = skipped = failed = 0
+        with raw.cursor() as cur:
+            self._apply_local_settings(cur)
+            for row in chunk:
+                params = {c: row.get(c) for c in columns}
+                cur.execute("SAVEPOINT save_row")
+                try:
+                    cur.execute(sql, params)
+                    returned = cur.fetchone()
+                    if returned is None:
+                        skipped += 1
+                    elif returned[0]:
+                        inserted += 1
+                    else:
+                        updated += 1
+                    cur.execute("RELEASE SAVEPOINT save_row")
+                except Exception as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT save_row")
+                    failed += 1
+                    log.error(f"행 저장 실패 {self._conflict_key(params)}: {e}")
+        raw.commit()
+        return inserted, updated, skipped, failed
+
+    def run(self, keyword: Optional[str] = None) -> str:
         """
         스크레이핑 전체 파이프라인 (Scrape -> Parse -> Enrich -> Save)을 실행합니다.
+        PIPELINE_MODE에 따라 run_batch/run_streaming을 실행하고, 끝나면 run 메트릭을 내보냅니다.
+        반환: "success" 또는 "failed" (단계 에러는 로그로만 남고 예외가 올라오지 않으므로 호출자는 이 값으로 판단)
         """
+        run_metrics = metrics.RunMetrics(self.PLATFORM_NAME, keyword)
+        token = metrics.activate(run_metrics)
+        # 로그 샘플링 건수도 run마다 새로 셈 (한 프로세스의 여러 키워드가 각자 처음 N건을 남기도록)
+        sampler_token = activate_sampler()
+        status = "failed"
+        try:
+            if self.settings.batch.PIPELINE_MODE == "stream":
+                self.run_streaming(keyword=keyword)
+            else:
+                self.run_batch(keyword=keyword)
+        except BaseException:
+            metrics.incr("run_errors")
+            raise
+        finally:
+            # 실행 경로는 에러를 로그로만 남기므로 run_errors/실패 행 카운터로 성공 여부 판단
+            failed = run_metrics.total("run_errors") or run_metrics.total("rows", result="failed")
+            status = "failed" if failed else "success"
+            run_metrics.finish(status)
+            run_metrics.export()
+            self.logger.info("캐시 tier 통계: %s", self.cache_tier_stats())
+            deactivate_sampler(sampler_token)
+            metrics.deactivate(token)
+        return status
+
+    def run_batch(self, keyword: Optional[str] = None) -> None:
+        """단계를 차례로 실행합니다 (Scrape -> Parse -> Enrich -> Save)."""
         self.logger.info(f"===== {self.PLATFORM_NAME} 스크레이핑 시작 (키워드: {keyword or '전체'}) =====")
         try:
-            raw_data = self.scrape(keyword=keyword)
+            with metrics.stage("scrape"):
+                raw_data = self.scrape(keyword=keyword)
             if not raw_data:
                 self.logger.warning("scrape 단계에서 데이터를 가져오지 못했습니다.")
                 return
 
-            parsed_data = self.parse(raw_data)
+            with metrics.stage("parse"):
+                parsed_data = self.parse(raw_data)
             if not parsed_data:
                 self.logger.warning("parse 단계에서 데이터가 파싱되지 않았습니다.")
                 return
             self.logger.info(f"총 {len(parsed_data)}개의 아이템을 파싱했습니다.")
 
-            enriched_data = self.enrich(parsed_data)
-            
-            self.save(enriched_data)
+            with metrics.stage("enrich"):
+                enriched_data = self.enrich(parsed_data)
+
+            with metrics.stage("save"):
+                self.save(enriched_data)
 
         except Exception as e:
             self.logger.error(f"스크레이핑 실행 중 에러 발생: {e}", exc_info=True)
+            metrics.incr("run_errors")
         finally:
+            self.flush_writes()
             self.logger.info(f"===== {self.PLATFORM_NAME} 스크레이핑 종료 =====")
 
+    # ----- 스트리밍 파이프라인 -----
+
+    def prepare_enrich(self, keyword: Optional[str] = None) -> Dict[str, Any]:
+        """스트리밍 모드에서 청크마다 반복하지 않을 enrich 준비물 (예: 키워드 단위 API 호출)"""
+        return {}
+
+    def enrich_chunk(self, chunk: List[Dict[str, Any]], keyword: Optional[str], state: Dict[str, Any]):
+        """스트리밍 모드에서 파싱된 청크 하나를 보강합니다."""
+        return self.enrich(chunk)
+
+    @staticmethod
+    def _iter_raw_chunks(raw, size: int):
+        """scrape 결과(list 또는 DataFrame)를 size 단위로 나눕니다."""
+        slicer = raw.iloc if hasattr(raw, "iloc") else raw
+        for start in range(0, len(raw), size):
+            yield slicer[start:start + size]
+
+    def run_streaming(self, keyword: Optional[str] = None) -> Dict[str, int]:
+        """
+        parse → enrich → save를 청크 단위로 겹쳐 실행합니다.
+        - 단계 사이는 크기가 제한된 큐로 연결되어, 뒤 단계가 밀리면 앞 단계가 기다립니다(backpressure).
+        - 청크는 보강이 끝나는 대로 저장/커밋되므로 전체 결과를 여러 벌 들고 있지 않습니다.
+        - 청크 사이에 같은 충돌 키가 다시 나오면 처음 것만 남깁니다 (parse의 keep="first"와 동일).
+        """
+        batch = self.settings.batch
+        chunk_size = max(1, batch.PIPELINE_CHUNK_SIZE)
+        totals = {"chunks": 0, "parsed": 0, "saved": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0}
+
+        self.logger.info(
+            f"===== {self.PLATFORM_NAME} 스트리밍 스크레이핑 시작 "
+            f"(키워드: {keyword or '전체'}, chunk={chunk_size}) ====="
+        )
+        try:
+            with metrics.stage("scrape"):
+                raw_data = self.scrape(keyword=keyword)
+            if raw_data is None or len(raw_data) == 0:
+                self.logger.warning("scrape 단계에서 데이터를 가져오지 못했습니다.")
+                return totals
+
+            parsed_q: queue.Queue = queue.Queue(maxsize=max(1, batch.PIPELINE_QUEUE_SIZE))
+            enriched_q: queue.Queue = queue.Queue(maxsize=max(1, batch.PIPELINE_QUEUE_SIZE))
+            errors: List[BaseException] = []
+            stop = threading.Event()
+
+            def parse_stage():
+                seen = set()
+                try:
+                    for raw_chunk in self._iter_raw_chunks(raw_data, chunk_size):
+                        if stop.is_set():
+                            break
+                        parsed = []
+                        with metrics.stage("parse"):
+                            parsed_rows = self.parse(raw_chunk) or []
+                        for row in parsed_rows:
+                            key = self._conflict_key(row)
+                            if key not in seen:
+                                seen.add(key)
+                                parsed.append(row)
+                        if parsed:
+                            totals["parsed"] += len(parsed)
+                            parsed_q.put(parsed)
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+                finally:
+                    parsed_q.put(_STREAM_END)
+
+            def enrich_stage():
+                try:
+                    with metrics.stage("enrich"):
+                        state = self.prepare_enrich(keyword)
+                    while True:
+                        chunk = parsed_q.get()
+                        if chunk is _STREAM_END:
+                            break
+                        if not stop.is_set():
+                            with metrics.stage("enrich"):
+                                enriched = self.enrich_chunk(chunk, keyword, state)
+                            enriched_q.put(enriched)
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+                    # parse 단계가 put에서 막히지 않도록 남은 청크를 비움
+                    while parsed_q.get() is not _STREAM_END:
+                        pass
+                finally:
+                    enriched_q.put(_STREAM_END)
+
+            # 단계 스레드도 같은 run 메트릭에 기록하도록 현재 context를 복사해 실행
+            stages = [
+                threading.Thread(target=contextvars.copy_context().run, args=(fn,), name=f"{self.PLATFORM_NAME}-{name}",
+                                 daemon=True)
+                for name, fn in (("parse", parse_stage), ("enrich", enrich_stage))
+            ]
+            for t in stages:
+                t.start()
+
+            # save 단계는 현재 스레드에서 실행
+            try:
+                while True:
+                    chunk = enriched_q.get()
+                    if chunk is _STREAM_END:
+                        break
+                    if stop.is_set() or not chunk:
+                        continue
+                    with metrics.stage("save"):
+                        result = self.save(chunk)
+                    totals["chunks"] += 1
+                    for name, n in (result or {}).items():
+                        if name in totals:
+                            totals[name] += n
+                    self.logger.info(
+                        f"청크 {totals['chunks']} 저장 → {len(chunk)}건 (누적 저장 {totals['saved']}, 파싱 {totals['parsed']})"
+                    )
+            except BaseException:
+                # 앞 단계가 put에서 막히지 않도록 멈추고 남은 청크를 비움
+                stop.set()
+                while enriched_q.get() is not _STREAM_END:
+                    pass
+                raise
+
+            for t in stages:
+                t.join()
+            if errors:
+                raise errors[0]
+            if not totals["failed"]:
+                self.clear_checkpoint(keyword)
+            return totals
+
+        except Exception as e:
+            self.logger.error(f"스트리밍 실행 중 에러 발생: {e}", exc_info=True)
+            metrics.incr("run_errors")
+            return totals
+        finally:
+            self.flush_writes()
+            self.logger.info(
+                f"===== {self.PLATFORM_NAME} 스트리밍 스크레이핑 종료 — 청크 {totals['chunks']}, "
+                f"파싱 {totals['parsed']}, 저장 {totals['saved']}, 변경 없음 {totals['skipped']}, 실패 {totals['failed']} ====="
+            )
+
+    def flush_writes(self) -> None:
+        """버퍼에 모아 둔 캐시/카테고리 쓰기를 DB에 반영합니다."""
+        self.category_resolver.flush()
+        self.cache_writer.flush()
+
+    def get_checkpoint(self, keyword: Optional[str] = None) -> Optional[EnrichCheckpoint]:
+        """enrich 체크포인트 (CHECKPOINT_ENABLED=false면 None)"""
+        batch = self.settings.batch
+        if not batch.CHECKPOINT_ENABLED:
+            return None
+        return EnrichCheckpoint(
+            self.engine, self.PLATFORM_NAME, keyword, max_age_hours=batch.CHECKPOINT_MAX_AGE_HOURS
+        )
+
+    def clear_checkpoint(self, keyword: Optional[str] = None) -> None:
+        """저장까지 성공한 키워드의 체크포인트를 지웁니다."""
+        checkpoint = self.get_checkpoint(keyword)
+        if checkpoint:
+            checkpoint.clear()
+
     def get_api_keys(self) -> list:
         keys = []
         if self.settings.naver_api.SEARCH_CLIENT_ID and self.settings.naver_api.SEARCH_CLIENT_SECRET:
@@ -171,35 +630,18 @@ class BaseScraper(ABC):
         if self.settings.naver_api.SEARCH_CLIENT_ID_3 and self.settings.naver_api.SEARCH_CLIENT_SECRET_3:
             keys.append((self.settings.naver_api.SEARCH_CLIENT_ID_3, self.settings.naver_api.SEARCH_CLIENT_SECRET_3))
         return keys
-    
-    @staticmethod
-    def _safe_float(x):
-        try:
-            return float(x)
-        except Exception:
-            return None
-        
-    @classmethod
-    def _from_mapxy(cls, place: dict):
-        """
-        네이버 Local API 응답에서 mapx/mapy를 위경도로 변환.
-        - mapx: 경도(longitude)
-        - mapy: 위도(latitude)
-        - 반환: (lat, lng) or (None, None)
-        """
-        mx = cls._safe_float(place.get("mapx"))
-        my = cls._safe_float(place.get("mapy"))
-        if mx is None or my is None:
-            return None, None
-
-        lon = mx / 1e7
-        lat = my / 1e7
 
-        # 한국 좌표 대략 범위 체크
-        if not (33.0 <= lat <= 39.5 and 124.0 <= lon <= 132.0):
-            return None, None
-
-        return lat, lon
+    def get_key_scheduler(self) -> NaverKeyScheduler:
+        """get_api_keys()의 키들로 검색 키 스케줄러를 만듭니다."""
+        naver = self.settings.naver_api
+        return NaverKeyScheduler(
+            self.get_api_keys(),
+            rate_per_window=naver.SEARCH_RATE_PER_WINDOW,
+            window_seconds=naver.SEARCH_RATE_WINDOW_SECONDS,
+            cooldown_seconds=naver.SEARCH_COOLDOWN_SECONDS,
+            max_cooldown_seconds=naver.SEARCH_MAX_COOLDOWN_SECONDS,
+            max_wait_seconds=naver.SEARCH_MAX_WAIT_SECONDS,
+        )
     
     @staticmethod
     def _haversine(lat1, lng1, lat2, lng2):
@@ -217,90 +659,326 @@ class BaseScraper(ABC):
         )
         return 2 * R * math.asin(math.sqrt(a))
     
-    def _load_existing_map(self):
-        """현재 캠페인 테이블의 핵심 컬럼만 키로 로딩."""
-        with self.engine.begin() as conn:
-            rows = conn.execute(text("""
-                SELECT platform, title, offer, campaign_channel, address, lat, lng, category_id
-                FROM campaign
-            """)).mappings().all()
+    EXISTING_COLUMNS = "platform, title, offer, campaign_channel, address, lat, lng, category_id"
+
+    @staticmethod
+    def _conflict_key(row) -> tuple:
+        """campaign 테이블의 충돌 키 (platform, title, offer, campaign_channel)"""
+        return (row["platform"], row["title"], row["offer"], row["campaign_channel"])
+
+    def _load_existing_map(self, keys=None) -> Dict[tuple, Dict[str, Any]]:
+        """
+        캠페인 테이블의 핵심 컬럼을 충돌 키로 로딩.
+        - keys가 주어지면 현재 배치에 있는 키만 조회합니다 (메모리/시간이 배치 크기에 비례).
+        - keys가 None이면 서버 사이드 커서로 전체 테이블을 청크 단위로 읽습니다.
+        """
+        if keys is not None:
+            return self._load_existing_rows(keys)
+        existing = {}
+        for chunk in self._iter_existing_rows():
+            existing.update((self._conflict_key(r), r) for r in chunk)
+        return existing
+
+    def _load_existing_rows(self, keys) -> Dict[tuple, Dict[str, Any]]:
+        """주어진 충돌 키들만 unnest 배열 조인으로 청크 단위 조회합니다."""
+        keys = list(dict.fromkeys(tuple(k) for k in keys))
+        existing: Dict[tuple, Dict[str, Any]] = {}
+        if not keys:
+            return existing
+
+        chunk_size = max(1, self.settings.batch.EXISTING_LOOKUP_CHUNK)
+        q = text(f"""
+            SELECT {", ".join("c." + col for col in self.EXISTING_COLUMNS.split(", "))}
+            FROM unnest(
+                CAST(:platforms AS text[]), CAST(:titles AS text[]),
+                CAST(:offers AS text[]), CAST(:channels AS text[])
+            ) AS k(platform, title, offer, campaign_channel)
+            JOIN campaign c
+              ON c.platform = k.platform AND c.title = k.title
+             AND c.offer = k.offer AND c.campaign_channel = k.campaign_channel
+        """)
+        with self.engine.connect() as conn:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start:start + chunk_size]
+                platforms, titles, offers, channels = (list(col) for col in zip(*chunk))
+                rows = conn.execute(q, {
+                    "platforms": platforms, "titles": titles, "offers": offers, "channels": channels,
+                }).mappings()
+                existing.update((self._conflict_key(r), dict(r)) for r in rows)
+
+        self.logger.info(f"기존 캠페인 조회 → 키 {len(keys)}건 중 {len(existing)}건 존재")
+        return existing
+
+    def _iter_existing_rows(self, chunk_size: Optional[int] = None):
+        """서버 사이드 커서로 campaign 전체를 chunk_size 행씩 읽어 list[dict]로 내보냅니다."""
+        chunk_size = chunk_size or self.settings.batch.EXISTING_LOOKUP_CHUNK
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+                text(f"SELECT {self.EXISTING_COLUMNS} FROM campaign")
+            )
+            for partition in result.mappings().partitions(chunk_size):
+                yield [dict(r) for r in partition]
+
+    @staticmethod
+    def _cache_hash(value: str) -> bytes:
+        """캐시 테이블의 digest(value, 'sha1')와 같은 해시를 Python에서 계산합니다."""
+        return hashlib.sha1(value.strip().encode("utf-8")).digest()
+
+    def _local_key(self, title: str) -> str:
+        """local_search_cache 조회 키 (CACHE_KEY_MODE=canonical이면 정규화된 제목)"""
+        if self.settings.batch.CACHE_KEY_MODE == "canonical":
+            return canonical_title(title)
+        return title.strip()
+
+    def _geocode_key(self, address: str) -> str:
+        """geocode_cache 조회 키 (CACHE_KEY_MODE=canonical이면 정규화된 주소)"""
+        if self.settings.batch.CACHE_KEY_MODE == "canonical":
+            return canonical_address(address)
+        return address.strip()
+
+    def cache_tier_stats(self) -> Dict[str, Dict[str, Any]]:
+        """캐시 tier별 누적 통계 (memory: LRU 캐시, db: local_search_cache/geocode_cache 조회)"""
+        with self._db_tier_lock:
+            hits, misses = self._db_tier["hits"], self._db_tier["misses"]
+        lookups = hits + misses
         return {
-            (r['platform'], r['title'], r['offer'], r['campaign_channel']): r
-            for r in rows
+            "memory": self.memory_cache.stats() if self.memory_cache is not None else {"enabled": False},
+            "db": {"hits": hits, "misses": misses, "hit_ratio": round(hits / lookups, 4) if lookups else 0.0},
         }
-    
-    def _get_geocode_cache(self, address: str):
-        if not address:
+
+    def _count_db_tier(self, cache: str, hits: int, misses: int) -> None:
+        with self._db_tier_lock:
+            self._db_tier["hits"] += hits
+            self._db_tier["misses"] += misses
+        if hits:
+            metrics.incr("cache_tier", hits, cache=cache, tier="db", result="hit")
+        if misses:
+            metrics.incr("cache_tier", misses, cache=cache, tier="db", result="miss")
+
+    def _memory_get(self, cache: str, key: str) -> Optional[Dict[str, Any]]:
+        if self.memory_cache is None:
+            return None
+        row = self.memory_cache.get((cache, key))
+        metrics.incr("cache_tier", cache=cache, tier="memory", result="hit" if row is not None else "miss")
+        return row
+
+    def _memory_put(self, cache: str, key: str, row: Dict[str, Any]) -> None:
+        if self.memory_cache is not None and key and row is not None:
+            self.memory_cache.put((cache, key), row)
+
+    def _prefetch_cache(self, label: str, sql: str, values, key_fn,
+                        memory: Optional[str] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        values 전체를 청크 단위 `= ANY(:hashes)` 쿼리로 조회합니다.
+        반환 dict는 key_fn(value)로 만든 조회 키를 쓰며, 요청한 모든 키가 들어 있고 캐시에 없으면 값이 None입니다.
+        (키가 dict에 있으면 '조회 완료'이므로 행 단위 SELECT가 필요 없음)
+        memory("local" | "geocode")를 주면 메모리 tier에 있는 키는 DB에 묻지 않고, DB HIT 행은 메모리 tier에 넣습니다.
+        """
+        keys = list(dict.fromkeys(
+            k for k in (key_fn(v) for v in values if isinstance(v, str) and v.strip()) if k
+        ))
+        found: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(keys)
+        if not keys:
+            return found
+
+        to_query = keys
+        if memory is not None and self.memory_cache is not None:
+            to_query = []
+            for k in keys:
+                row = self.memory_cache.get((memory, k))
+                if row is not None:
+                    found[k] = row
+                else:
+                    to_query.append(k)
+            memory_hits = len(keys) - len(to_query)
+            if memory_hits:
+                metrics.incr("cache_tier", memory_hits, cache=memory, tier="memory", result="hit")
+            if to_query:
+                metrics.incr("cache_tier", len(to_query), cache=memory, tier="memory", result="miss")
+
+        chunk_size = max(1, self.settings.batch.CACHE_PREFETCH_CHUNK)
+        chunks = 0
+        db_hits = 0
+        if to_query:
+            with self.engine.begin() as conn:
+                for start in range(0, len(to_query), chunk_size):
+                    by_hash = {self._cache_hash(k): k for k in to_query[start:start + chunk_size]}
+                    rows = conn.execute(text(sql), {"hashes": list(by_hash)}).mappings().all()
+                    for r in rows:
+                        row = dict(r)
+                        key = by_hash.get(bytes(row.pop("key_hash")))
+                        if key is not None and found[key] is None:
+                            found[key] = row
+                            db_hits += 1
+                            if memory is not None:
+                                self._memory_put(memory, key, row)
+                    chunks += 1
+            if memory is not None:
+                self._count_db_tier(memory, db_hits, len(to_query) - db_hits)
+
+        hits = sum(1 for v in found.values() if v is not None)
+        if memory is not None and self.memory_cache is not None:
+            self.logger.info(
+                f"[{label}] prefetch {len(keys)}건 → HIT {hits} (memory {len(keys) - len(to_query)}, DB {db_hits}), "
+                f"MISS {len(keys) - hits} ({chunks} chunks)"
+            )
+        else:
+            self.logger.info(f"[{label}] prefetch {len(keys)}건 → HIT {hits}, MISS {len(keys) - hits} ({chunks} chunks)")
+        return found
+
+    def _prefetch_local_cache(self, titles) -> Dict[str, Optional[Dict[str, Any]]]:
+        """run에 등장하는 title들의 local_search_cache를 한 번에 조회합니다."""
+        return self._prefetch_cache("local_cache", """
+            SELECT title_hash AS key_hash, address, lat, lng, category, updated_at
+            FROM local_search_cache
+            WHERE title_hash = ANY(:hashes)
+            AND updated_at > NOW() - INTERVAL '30 days'
+        """, titles, self._local_key, memory="local")
+
+    def _prefetch_geocode_cache(self, addresses) -> Dict[str, Optional[Tuple[Any, Any]]]:
+        """run에 등장하는 주소들의 geocode_cache를 한 번에 조회합니다. 값은 (lat, lng) 또는 None."""
+        found = self._prefetch_cache("geocode_cache", """
+            SELECT address_hash AS key_hash, lat, lng
+            FROM geocode_cache
+            WHERE address_hash = ANY(:hashes)
+        """, addresses, self._geocode_key, memory="geocode")
+        return {k: ((v["lat"], v["lng"]) if v else None) for k, v in found.items()}
+
+    def _prefetch_negative_cache(self, cache: str, values) -> Optional[set]:
+        """
+        TTL 안의 negative 캐시 키 집합 ("local": title, "geocode": address).
+        NEGATIVE_CACHE_ENABLED=false거나 조회에 실패하면(마이그레이션 전 등) None — negative 캐시를 쓰지 않음.
+        """
+        batch = self.settings.batch
+        if not batch.NEGATIVE_CACHE_ENABLED:
+            return None
+        key_fn = self._local_key if cache == "local" else self._geocode_key
+        try:
+            found = self._prefetch_cache(f"negative_{cache}", f"""
+                SELECT key_hash
+                FROM scrape_negative_cache
+                WHERE cache = '{cache}' AND key_hash = ANY(:hashes)
+                AND updated_at > NOW() - make_interval(secs => {float(batch.NEGATIVE_CACHE_TTL_HOURS) * 3600})
+            """, values, key_fn)
+        except Exception as e:
+            self.logger.warning(f"[negative_cache] 조회 실패, 이번 run은 사용 안 함: {e}")
+            return None
+        return {k for k, v in found.items() if v is not None}
+
+    def _negative_hit(self, cache: str, value: str, negative: Optional[set]) -> bool:
+        """value가 최근에 결과 없음으로 확인된 키인지 (negative가 None이면 항상 False)"""
+        if negative is None or not value:
+            return False
+        key = self._local_key(value) if cache == "local" else self._geocode_key(value)
+        if key not in negative:
+            return False
+        metrics.incr("negative_cache", cache=cache, result="hit")
+        log_sampled(self.logger, f"negative_cache.{cache}", "[negative_cache] HIT (%s) %s", cache, value)
+        return True
+
+    def _put_negative_cache(self, cache: str, value: str, negative: Optional[set]) -> None:
+        if negative is None or not value:
+            return
+        self.cache_writer.put_negative(cache, value)
+        negative.add(self._local_key(value) if cache == "local" else self._geocode_key(value))
+        metrics.incr("negative_cache", cache=cache, result="put")
+
+    def _get_geocode_cache(self, address: str, prefetched: Optional[Dict] = None):
+        key = self._geocode_key(address) if address else None
+        if not key:
             return None
+        if prefetched is not None and key in prefetched:
+            cached = prefetched[key]
+            metrics.incr("cache_lookups", cache="geocode", result="hit" if cached else "miss", source="prefetch")
+            log_sampled(self.logger, "geocode_cache.prefetch", "[geocode_cache] %s (prefetch) %s",
+                        "HIT" if cached else "MISS", address)
+            return cached
+        mem = self._memory_get("geocode", key)
+        if mem is not None:
+            metrics.incr("cache_lookups", cache="geocode", result="hit", source="memory")
+            log_sampled(self.logger, "geocode_cache.memory", "[geocode_cache] HIT (memory) %s", address)
+            return (mem["lat"], mem["lng"])
+        pending = self.cache_writer.get_geocode(address)
+        if pending:
+            metrics.incr("cache_lookups", cache="geocode", result="hit", source="pending")
+            log_sampled(self.logger, "geocode_cache.pending", "[geocode_cache] HIT (pending) %s", address)
+            return pending
         with self.engine.begin() as conn:
             row = conn.execute(
-                text("""SELECT lat, lng FROM geocode_cache WHERE address_hash = digest(:addr, 'sha1')"""),
-                {"addr": address.strip()}
+                text("""SELECT lat, lng FROM geocode_cache WHERE address_hash = :hash"""),
+                {"hash": self._cache_hash(key)}
             ).mappings().first()
+        metrics.incr("cache_lookups", cache="geocode", result="hit" if row else "miss", source="db")
+        self._count_db_tier("geocode", 1 if row else 0, 0 if row else 1)
         if row:
-            self.logger.info(f"[geocode_cache] HIT {address} → ({row['lat']}, {row['lng']})")
+            self._memory_put("geocode", key, dict(row))
+            log_sampled(self.logger, "geocode_cache.hit", "[geocode_cache] HIT %s → (%s, %s)",
+                        address, row["lat"], row["lng"])
         else:
-            self.logger.info(f"[geocode_cache] MISS {address}")
+            log_sampled(self.logger, "geocode_cache.miss", "[geocode_cache] MISS %s", address)
         return (row["lat"], row["lng"]) if row else None
 
 
-    def _put_geocode_cache(self, address: str, lat: float, lng: float):
+    def _put_geocode_cache(self, address: str, lat: float, lng: float, prefetched: Optional[Dict] = None):
         if not address or lat is None or lng is None:
-            self.logger.debug(f"[geocode_cache] SKIP {address} lat={lat}, lng={lng}")
+            self.logger.debug("[geocode_cache] SKIP %s lat=%s, lng=%s", address, lat, lng)
             return
-        with self.engine.begin() as conn:
-            conn.execute(text("""
-                INSERT INTO geocode_cache (address_hash, address, lat, lng, updated_at)
-                VALUES (digest(:addr, 'sha1'), :addr, :lat, :lng, NOW())
-                ON CONFLICT (address_hash) DO UPDATE
-                SET address = EXCLUDED.address,
-                    lat = EXCLUDED.lat,
-                    lng = EXCLUDED.lng,
-                    updated_at = NOW()
-            """), {"addr": address.strip(), "lat": lat, "lng": lng})
-        self.logger.info(f"[geocode_cache] PUT {address} → ({lat}, {lng})")
+        self.cache_writer.put_geocode(address, lat, lng)
+        self._memory_put("geocode", self._geocode_key(address), {"lat": lat, "lng": lng})
+        if prefetched is not None:
+            prefetched[self._geocode_key(address)] = (lat, lng)
+        log_sampled(self.logger, "geocode_cache.put", "[geocode_cache] PUT %s → (%s, %s)", address, lat, lng)
 
     
-    def _get_local_cache(self, title: str):
-        if not title:
+    def _get_local_cache(self, title: str, prefetched: Optional[Dict] = None):
+        key = self._local_key(title) if title else None
+        if not key:
             return None
-        
+        if prefetched is not None and key in prefetched:
+            row = prefetched[key]
+            metrics.incr("cache_lookups", cache="local", result="hit" if row else "miss", source="prefetch")
+            log_sampled(self.logger, "local_cache.prefetch", "[local_cache] %s (prefetch) %s",
+                        "HIT" if row else "MISS", title)
+            return row
+        row = self._memory_get("local", key)
+        if row is not None:
+            metrics.incr("cache_lookups", cache="local", result="hit", source="memory")
+            log_sampled(self.logger, "local_cache.memory", "[local_cache] HIT (memory) %s", title)
+            return row
+        pending = self.cache_writer.get_local(title)
+        if pending:
+            metrics.incr("cache_lookups", cache="local", result="hit", source="pending")
+            log_sampled(self.logger, "local_cache.pending", "[local_cache] HIT (pending) %s", title)
+            return pending
+
         with self.engine.begin() as conn:
             row = conn.execute(
                 text("""
                     SELECT address, lat, lng, category, updated_at
                     FROM local_search_cache
-                    WHERE title_hash = digest(:title, 'sha1')
+                    WHERE title_hash = :hash
                     AND updated_at > NOW() - INTERVAL '30 days'
                 """),
-                {"title": title.strip()}
+                {"hash": self._cache_hash(key)}
             ).mappings().first()
+        metrics.incr("cache_lookups", cache="local", result="hit" if row else "miss", source="db")
+        self._count_db_tier("local", 1 if row else 0, 0 if row else 1)
         if row:
-            self.logger.info(f"[local_cache] HIT {title} (updated_at={row['updated_at']})")
+            row = dict(row)
+            self._memory_put("local", key, row)
+            log_sampled(self.logger, "local_cache.hit", "[local_cache] HIT %s (updated_at=%s)", title, row["updated_at"])
             return row
         else:
-            self.logger.info(f"[local_cache] MISS {title}")
+            log_sampled(self.logger, "local_cache.miss", "[local_cache] MISS %s", title)
             return None
 
-    def _put_local_cache(self, title: str, address: str, lat: float, lng: float, category: str = None):
+    def _put_local_cache(self, title: str, address: str, lat: float, lng: float, category: str = None,
+                         prefetched: Optional[Dict] = None):
         if not title:
             return
     
-        with self.engine.begin() as conn:
-            conn.execute(text("""
-                INSERT INTO local_search_cache (title_hash, title, address, lat, lng, category, updated_at)
-                VALUES (digest(:title, 'sha1'), :title, :address, :lat, :lng, :category, NOW())
-                ON CONFLICT (title_hash) DO UPDATE
-                SET address = EXCLUDED.address,
-                    lat = EXCLUDED.lat,
-                    lng = EXCLUDED.lng,
-                    category = EXCLUDED.category,
-                    updated_at = NOW()
-            """), {
-                "title": title.strip(),
-                "address": address,
-                "lat": lat,
-                "lng": lng,
-                "category": category
-            })
-        self.logger.info(f"[local_cache] PUT {title} → ({lat}, {lng})")
+        entry = self.cache_writer.put_local(title, address, lat, lng, category)
+        self._memory_put("local", self._local_key(title), entry)
+        if prefetched is not None:
+            prefetched[self._local_key(title)] = entry
+        log_sampled(self.logger, "local_cache.put", "[local_cache] PUT %s → (%s, %s)", title, lat, lng)
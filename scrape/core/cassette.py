@@ -0,0 +1,73 @@
+# core/cassette.py
+"""
+HTTP 응답 기록(cassette) 형식.
+
+HTTP_RECORD_DIR을 지정하면 http_client가 받은 응답을 호스트별 JSONL 파일(<host>.jsonl)에 한 줄씩 기록하고,
+tools/stub_server.py가 같은 파일을 읽어 재생합니다.
+요청 헤더(API 키)는 기록하지 않습니다.
+"""
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .logger import get_logger
+
+log = get_logger("cassette")
+
+
+def request_key(path: str, query: Iterable[Tuple[str, str]]) -> str:
+    """경로 + 정렬된 쿼리 파라미터 → 재생 시 응답을 찾는 키"""
+    return f"{path}?{urlencode(sorted(query))}"
+
+
+def url_key(url: str) -> str:
+    parts = urlsplit(url)
+    return request_key(parts.path, parse_qsl(parts.query, keep_blank_values=True))
+
+
+class CassetteRecorder:
+    """응답을 <dir>/<host>.jsonl 에 추가합니다. 여러 스레드에서 동시에 사용할 수 있습니다."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, netloc: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", netloc) + ".jsonl")
+
+    def record(self, response) -> None:
+        url = response.request.url
+        entry = {
+            "url": url,
+            "key": url_key(url),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "application/json"),
+            "body": response.text,
+            "elapsed_ms": round(response.elapsed.total_seconds() * 1000, 1),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        try:
+            with self._lock, open(self._path(urlsplit(url).netloc), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            log.warning(f"cassette 기록 실패: {e}")
+
+
+def load_cassettes(directory: str) -> Dict[str, List[Dict[str, Any]]]:
+    """디렉터리의 모든 *.jsonl → {요청 키: [응답, ...]} (기록 순서 유지)"""
+    by_key: Dict[str, List[Dict[str, Any]]] = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".jsonl"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    by_key.setdefault(entry["key"], []).append(entry)
+    return by_key
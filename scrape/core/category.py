@@ -0,0 +1,103 @@
+# core/category.py
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .logger import get_logger
+
+log = get_logger("category")
+
+
+class CategoryResolver:
+    """
+    raw_categories / category_mappings를 메모리에 올려 두고 원본 카테고리 텍스트를
+    표준 카테고리 ID로 변환합니다.
+    - 조회는 dict에서 바로 처리합니다 (행마다 DB 왕복 없음).
+    - 처음 보는 원본 텍스트는 대기열에 모았다가 flush() 때 한 번에 INSERT 합니다.
+      새 원본 텍스트에는 아직 매핑이 있을 수 없으므로 결과는 None이며,
+      get_or_create_raw_category + find_mapped_category_id 조합과 같은 값입니다.
+    - refresh_seconds가 지나면 다음 조회 시 인덱스를 다시 읽어 관리자가 추가한 매핑을 반영합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, engine: Engine, refresh_seconds: float = 600.0):
+        self.engine = engine
+        self.refresh_seconds = float(refresh_seconds)
+
+        self._raw_ids: Dict[str, int] = {}        # raw_text → raw_categories.id
+        self._mappings: Dict[int, int] = {}       # raw_category_id → standard_category_id
+        self._pending: Set[str] = set()           # 아직 raw_categories에 없는 raw_text
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """두 테이블 전체를 읽어 인덱스를 새로 만듭니다."""
+        with self.engine.connect() as conn:
+            raw_rows = conn.execute(text("SELECT id, raw_text FROM raw_categories")).all()
+            map_rows = conn.execute(
+                text("SELECT raw_category_id, standard_category_id FROM category_mappings")
+            ).all()
+        with self._lock:
+            self._raw_ids = {raw_text: raw_id for raw_id, raw_text in raw_rows}
+            self._mappings = {raw_id: std_id for raw_id, std_id in map_rows}
+            self._loaded_at = time.monotonic()
+        log.info(f"카테고리 인덱스 로드 → raw {len(raw_rows)}건, mapping {len(map_rows)}건")
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.refresh_seconds:
+            self.load()
+
+    def resolve(self, raw_text: Optional[str]) -> Optional[int]:
+        """원본 카테고리 텍스트 → 매핑된 standard_category_id (없으면 None)"""
+        if not raw_text or not raw_text.strip():
+            return None
+        clean_text = raw_text.strip()
+
+        self._ensure_loaded()
+        with self._lock:
+            raw_id = self._raw_ids.get(clean_text)
+            if raw_id is None:
+                if clean_text not in self._pending:
+                    log.info(f"새로운 원본 카테고리 발견: '{clean_text}'")
+                    self._pending.add(clean_text)
+                return None
+            return self._mappings.get(raw_id)
+
+    def flush(self) -> int:
+        """대기 중인 새 원본 텍스트를 한 번에 INSERT 하고 인덱스에 반영합니다."""
+        with self._lock:
+            pending, self._pending = list(self._pending), set()
+        if not pending:
+            return 0
+
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("""
+                    INSERT INTO raw_categories (raw_text)
+                    SELECT unnest(CAST(:texts AS text[]))
+                    ON CONFLICT (raw_text) DO NOTHING
+                """), {"texts": pending})
+                # 다른 파드가 먼저 넣었을 수도 있으므로 ID와 매핑을 다시 읽어 반영
+                raw_rows = conn.execute(
+                    text("SELECT id, raw_text FROM raw_categories WHERE raw_text = ANY(:texts)"),
+                    {"texts": pending},
+                ).all()
+                map_rows = conn.execute(text("""
+                    SELECT raw_category_id, standard_category_id FROM category_mappings
+                    WHERE raw_category_id = ANY(:ids)
+                """), {"ids": [raw_id for raw_id, _ in raw_rows]}).all()
+        except Exception as e:
+            with self._lock:
+                self._pending.update(pending)
+            log.error(f"원본 카테고리 {len(pending)}건 저장 실패: {e}", exc_info=True)
+            return 0
+
+        with self._lock:
+            self._raw_ids.update({raw_text: raw_id for raw_id, raw_text in raw_rows})
+            self._mappings.update({raw_id: std_id for raw_id, std_id in map_rows})
+        log.info(f"새 원본 카테고리 {len(pending)}건 저장")
+        return len(pending)
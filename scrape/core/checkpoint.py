@@ -0,0 +1,131 @@
+# core/checkpoint.py
+import hashlib
+import json
+import math
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .logger import get_logger
+
+log = get_logger("checkpoint")
+
+
+class EnrichCheckpoint:
+    """
+    scraper + keyword 단위로 '보강이 끝난 행'과 그 결과를 scrape_enrich_checkpoint 테이블에 기록합니다.
+    파드가 enrich 도중 종료되어 재시작되면, 이미 보강된 행은 결과를 복원하고 건너뜁니다.
+    - load()는 인스턴스당 한 번만 읽습니다. 스트리밍 모드에서는 run 단위로 하나를 만들어 청크마다 get()으로 조회합니다.
+    - record()는 메모리에 모으고 flush() 때 한 번에 upsert 합니다.
+    - max_age_hours보다 오래된 체크포인트는 무시합니다 (다음 정기 실행은 새로 보강).
+    - 체크포인트 I/O 실패는 로그만 남기고 run을 실패시키지 않습니다.
+    """
+
+    def __init__(self, engine: Engine, scraper: str, keyword: Optional[str], max_age_hours: float = 12.0):
+        self.engine = engine
+        self.scraper = scraper
+        self.keyword = keyword or ""
+        self.max_age_hours = float(max_age_hours)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._done: Optional[Dict[str, Dict[str, Any]]] = None
+        self.disabled = False
+
+    @staticmethod
+    def row_key(conflict_key: tuple) -> str:
+        """충돌 키 → 체크포인트 행 키 (sha1 hex)"""
+        raw = "\x1f".join("" if v is None else str(v) for v in conflict_key)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _clean(value):
+        """
+        jsonb에 넣을 수 있는 값으로 변환 (NaN → None, numpy 스칼라 → Python 값).
+        DB에서 온 Decimal 좌표는 float로 바꿔, 복원한 값이 새로 보강한 값과 같은 타입이 되게 합니다.
+        """
+        if value is None:
+            return None
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif hasattr(value, "item"):
+            value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        if isinstance(value, (int, float, str, bool)):
+            return value
+        return str(value)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """유효한 체크포인트 전체를 {row_key: 결과} 로 읽습니다 (첫 호출 때만 DB 조회)."""
+        if self._done is None:
+            self._done = self._read()
+        return self._done
+
+    def get(self, conflict_key: tuple) -> Optional[Dict[str, Any]]:
+        """충돌 키의 보강 결과 (없으면 None)"""
+        return self.load().get(self.row_key(conflict_key))
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if self.disabled:
+            return {}
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text("""
+                    SELECT row_key, result FROM scrape_enrich_checkpoint
+                    WHERE scraper = :scraper AND keyword = :keyword
+                    AND updated_at > NOW() - make_interval(secs => :max_age)
+                """), {
+                    "scraper": self.scraper, "keyword": self.keyword, "max_age": self.max_age_hours * 3600,
+                }).all()
+        except Exception as e:
+            log.warning(f"체크포인트 로드 실패 → 체크포인트 없이 진행: {e}")
+            self.disabled = True
+            return {}
+        if rows:
+            log.info(f"[{self.scraper}/{self.keyword}] 체크포인트 {len(rows)}건 로드")
+        return {row_key: result for row_key, result in rows}
+
+    def record(self, conflict_key: tuple, result: Dict[str, Any]) -> None:
+        if self.disabled:
+            return
+        self._pending[self.row_key(conflict_key)] = {k: self._clean(v) for k, v in result.items()}
+
+    def flush(self) -> int:
+        """모아 둔 결과를 한 트랜잭션으로 기록합니다."""
+        pending, self._pending = self._pending, {}
+        if self.disabled or not pending:
+            return 0
+        keys = list(pending)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("""
+                    INSERT INTO scrape_enrich_checkpoint (scraper, keyword, row_key, result, updated_at)
+                    SELECT :scraper, :keyword, t.row_key, t.result, NOW()
+                    FROM unnest(CAST(:keys AS text[]), CAST(:results AS jsonb[])) AS t(row_key, result)
+                    ON CONFLICT (scraper, keyword, row_key) DO UPDATE
+                    SET result = EXCLUDED.result, updated_at = NOW()
+                """), {
+                    "scraper": self.scraper,
+                    "keyword": self.keyword,
+                    "keys": keys,
+                    "results": [json.dumps(pending[k], ensure_ascii=False) for k in keys],
+                })
+        except Exception as e:
+            log.warning(f"체크포인트 기록 실패 ({len(keys)}건): {e}")
+            return 0
+        log.info(f"[{self.scraper}/{self.keyword}] 체크포인트 {len(keys)}건 기록")
+        return len(keys)
+
+    def clear(self) -> None:
+        """저장까지 끝난 run의 체크포인트를 지웁니다."""
+        if self.disabled:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    text("DELETE FROM scrape_enrich_checkpoint WHERE scraper = :scraper AND keyword = :keyword"),
+                    {"scraper": self.scraper, "keyword": self.keyword},
+                )
+        except Exception as e:
+            log.warning(f"체크포인트 삭제 실패: {e}")
@@ -16,6 +16,17 @@ class DatabaseSettings(BaseSettings):
     PORT: str = os.getenv("POSTGRES_PORT", "5432")
     DB: str = os.getenv("POSTGRES_DB", "")
 
+    # 커넥션 풀 (프로세스당 공유 엔진 1개). 파드 수 × (POOL_SIZE + MAX_OVERFLOW) ≤ max_connections 로 잡을 것
+    POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "4"))
+    MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "4"))
+    POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    # 쿼리 하나의 최대 실행 시간(ms), 0이면 서버 기본값
+    STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "60000"))
+    # transaction pooling 모드 PgBouncer 뒤에서 실행 (NullPool + SET LOCAL)
+    PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    APPLICATION_NAME: str = os.getenv("DB_APPLICATION_NAME", "reviewmaps-scraper")
+
     @property
     def url(self) -> str:
         """SQLAlchemy 접속을 위한 데이터베이스 URL을 생성합니다."""
@@ -25,6 +36,10 @@ class DatabaseSettings(BaseSettings):
 class NaverAPISettings(BaseSettings):
     """네이버 API 관련 클라이언트 ID 및 시크릿 설정"""
 
+    # API 주소 (오프라인 부하 테스트 시 tools/stub_server.py 주소로 지정)
+    OPENAPI_BASE_URL: str = os.getenv("NAVER_OPENAPI_BASE_URL", "https://openapi.naver.com").rstrip("/")
+    MAPS_BASE_URL: str = os.getenv("NAVER_MAPS_BASE_URL", "https://maps.apigw.ntruss.com").rstrip("/")
+
     MAP_CLIENT_ID: str = os.getenv("NAVER_MAP_CLIENT_ID", "")
     MAP_CLIENT_SECRET: str = os.getenv("NAVER_MAP_CLIENT_SECRET", "")
 
@@ -35,6 +50,37 @@ class NaverAPISettings(BaseSettings):
     SEARCH_CLIENT_ID_3: str = os.getenv("NAVER_SEARCH_CLIENT_ID_3", "")
     SEARCH_CLIENT_SECRET_3: str = os.getenv("NAVER_SEARCH_CLIENT_SECRET_3", "")
 
+    # 검색 키 스케줄러: 키당 윈도우(초) 내 허용 요청 수
+    SEARCH_RATE_PER_WINDOW: int = int(os.getenv("NAVER_SEARCH_RATE_PER_WINDOW", "10"))
+    SEARCH_RATE_WINDOW_SECONDS: float = float(os.getenv("NAVER_SEARCH_RATE_WINDOW_SECONDS", "1.0"))
+    # 429 수신 시 첫 쿨다운(초), 연속 429마다 2배씩 최대값까지 증가
+    SEARCH_COOLDOWN_SECONDS: float = float(os.getenv("NAVER_SEARCH_COOLDOWN_SECONDS", "1.0"))
+    SEARCH_MAX_COOLDOWN_SECONDS: float = float(os.getenv("NAVER_SEARCH_MAX_COOLDOWN_SECONDS", "60"))
+    # 모든 키가 쿨다운 중일 때 최대 대기 시간(초)
+    SEARCH_MAX_WAIT_SECONDS: float = float(os.getenv("NAVER_SEARCH_MAX_WAIT_SECONDS", "30"))
+
+
+class InflexerSettings(BaseSettings):
+    """Inflexer API 관련 설정"""
+
+    # API 주소 (오프라인 부하 테스트 시 tools/stub_server.py 주소로 지정)
+    BASE_URL: str = os.getenv("INFLEXER_BASE_URL", "https://inflexer.net:5000").rstrip("/")
+
+
+class HttpSettings(BaseSettings):
+    """외부 API 호출용 공유 HTTP 클라이언트 설정 (core/http_client.py)"""
+
+    # 호스트당 유지할 keep-alive 커넥션 수 (동시 호출 수 이상으로)
+    POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+    CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "3.05"))
+    # 호출부에서 timeout을 지정하지 않았을 때의 읽기 타임아웃
+    READ_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "10"))
+    # 커넥션 실패 시 재시도 횟수/backoff
+    CONNECT_RETRIES: int = int(os.getenv("HTTP_CONNECT_RETRIES", "2"))
+    RETRY_BACKOFF_SECONDS: float = float(os.getenv("HTTP_RETRY_BACKOFF_SECONDS", "0.2"))
+    # 지정하면 모든 응답을 이 디렉터리에 cassette(JSONL)로 기록 (tools/stub_server.py로 재생)
+    RECORD_DIR: str = os.getenv("HTTP_RECORD_DIR", "")
+
 
 class BatchSettings(BaseSettings):
     """배치(Batch) 작업 실행 관련 설정"""
@@ -53,6 +99,77 @@ class BatchSettings(BaseSettings):
     # WAIT_TIMEOUT
     WAIT_TIMEOUT: int = os.getenv("WAIT_TIMEOUT", 15)
 
+    # 파이프라인 모드: "batch"(단계별 전체 처리) 또는 "stream"(청크 단위로 parse/enrich/save 겹쳐 실행)
+    PIPELINE_MODE: str = os.getenv("PIPELINE_MODE", "batch").lower()
+    PIPELINE_CHUNK_SIZE: int = int(os.getenv("PIPELINE_CHUNK_SIZE", "500"))
+    # 단계 사이 큐에 쌓아 둘 최대 청크 수 (backpressure)
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "2"))
+
+    # main.py --import-profile: 콜드 스타트 import 시간 예산(ms), 넘으면 종료 코드 1
+    IMPORT_BUDGET_MS: float = float(os.getenv("IMPORT_BUDGET_MS", "800"))
+
+    # run 메트릭 내보내기 (빈 값이면 해당 출력 안 함, JSON 요약은 항상 로그로 출력)
+    METRICS_JSON_DIR: str = os.getenv("METRICS_JSON_DIR", "")
+    # node_exporter textfile collector 디렉터리
+    METRICS_TEXTFILE_DIR: str = os.getenv("METRICS_TEXTFILE_DIR", "")
+    METRICS_PUSHGATEWAY_URL: str = os.getenv("METRICS_PUSHGATEWAY_URL", "")
+
+    # 한 프로세스에서 여러 키워드를 처리할 때 동시에 돌릴 워커 수
+    KEYWORD_WORKERS: int = int(os.getenv("KEYWORD_WORKERS", "1"))
+
+    # enrich 체크포인트: 중간에 종료된 run을 재시작하면 보강이 끝난 행은 건너뜀
+    CHECKPOINT_ENABLED: bool = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    # 몇 행마다 체크포인트를 기록할지
+    CHECKPOINT_EVERY: int = int(os.getenv("CHECKPOINT_EVERY", "200"))
+    # 이보다 오래된 체크포인트는 무시 (시간)
+    CHECKPOINT_MAX_AGE_HOURS: float = float(os.getenv("CHECKPOINT_MAX_AGE_HOURS", "12"))
+
+    # parse 엔진: "pandas"(DataFrame) 또는 "dict"(pandas 없이 dict 레코드로 처리)
+    PARSE_ENGINE: str = os.getenv("PARSE_ENGINE", "pandas").lower()
+
+    # enrich 실행 모드: "sync"(행 단위 순차) 또는 "async"(엔드포인트별 동시 호출)
+    ENRICH_MODE: str = os.getenv("ENRICH_MODE", "sync").lower()
+    # async 모드에서 동시에 처리할 최대 행 수
+    ENRICH_CONCURRENCY: int = int(os.getenv("ENRICH_CONCURRENCY", "8"))
+    # async 모드에서 엔드포인트별 최대 동시 호출 수
+    LOCAL_SEARCH_CONCURRENCY: int = int(os.getenv("LOCAL_SEARCH_CONCURRENCY", "4"))
+    GEOCODE_CONCURRENCY: int = int(os.getenv("GEOCODE_CONCURRENCY", "4"))
+    # 한 run 안에서 같은 검색어/주소의 Naver 호출을 한 번으로 합침 (single-flight)
+    ENRICH_COALESCE: bool = os.getenv("ENRICH_COALESCE", "true").lower() == "true"
+    # 증분 enrich: DB에 주소/좌표가 이미 있고 입력이 바뀌지 않은 캠페인은 저장된 값을 그대로 사용
+    ENRICH_INCREMENTAL: bool = os.getenv("ENRICH_INCREMENTAL", "false").lower() == "true"
+    # 증분 모드에서도 드리프트 재검증을 위해 다시 조회할 행 비율 (0~1, 날짜별로 대상이 바뀜)
+    ENRICH_REVERIFY_RATE: float = float(os.getenv("ENRICH_REVERIFY_RATE", "0.05"))
+    # 캐시 조회 키: "raw"(앞뒤 공백만 제거) 또는 "canonical"(core/normalize.py 정규화 키)
+    # canonical로 바꾸기 전에 tools/rekey_cache.py로 기존 캐시 행을 새 키로 복사할 것
+    CACHE_KEY_MODE: str = os.getenv("CACHE_KEY_MODE", "raw").lower()
+    # negative 캐시: Naver 검색/지오코딩 결과가 없었던 title/address를 TTL 동안 다시 조회하지 않음
+    # (scrape_negative_cache 테이블, 성공 결과 캐시(30일)보다 짧게)
+    NEGATIVE_CACHE_ENABLED: bool = os.getenv("NEGATIVE_CACHE_ENABLED", "true").lower() == "true"
+    NEGATIVE_CACHE_TTL_HOURS: float = float(os.getenv("NEGATIVE_CACHE_TTL_HOURS", "72"))
+    # local_search_cache / geocode_cache 앞단 프로세스 메모리 LRU 캐시 (core/memcache.py)
+    # 엔트리 수/근사 용량(MB) 중 하나라도 넘으면 오래 안 쓴 엔트리부터 내보냄.
+    # 다른 파드가 DB에 쓴 값은 TTL이 지나야 반영되므로 DB 캐시(30일)보다 훨씬 짧게
+    MEMORY_CACHE_ENABLED: bool = os.getenv("MEMORY_CACHE_ENABLED", "true").lower() == "true"
+    MEMORY_CACHE_MAX_ENTRIES: int = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "50000"))
+    MEMORY_CACHE_MAX_MB: float = float(os.getenv("MEMORY_CACHE_MAX_MB", "64"))
+    MEMORY_CACHE_TTL_SECONDS: float = float(os.getenv("MEMORY_CACHE_TTL_SECONDS", "21600"))
+    # 캐시 일괄 조회 시 `= ANY(...)` 한 번에 넣을 키 수
+    CACHE_PREFETCH_CHUNK: int = int(os.getenv("CACHE_PREFETCH_CHUNK", "1000"))
+    # 캐시 write-behind 버퍼: 대기 건수/시간(초)이 넘으면 배치 upsert
+    CACHE_WRITE_BATCH_SIZE: int = int(os.getenv("CACHE_WRITE_BATCH_SIZE", "500"))
+    CACHE_WRITE_FLUSH_SECONDS: float = float(os.getenv("CACHE_WRITE_FLUSH_SECONDS", "5"))
+    # 기존 캠페인 조회 시 한 번에 조회할 충돌 키 수 (전체 스캔 시 커서 fetch 크기)
+    EXISTING_LOOKUP_CHUNK: int = int(os.getenv("EXISTING_LOOKUP_CHUNK", "1000"))
+    # 저장 모드: "upsert"(executemany) 또는 "copy"(COPY + 스테이징 병합, 청크 커밋)
+    SAVE_MODE: str = os.getenv("SAVE_MODE", "upsert").lower()
+    SAVE_CHUNK_SIZE: int = int(os.getenv("SAVE_CHUNK_SIZE", "2000"))
+    # campaign.content_hash 지문이 같으면 UPDATE 생략 (add_content_hash_to_campaign.sql 적용 필요,
+    # 컬럼이 없으면 프로세스 시작 후 첫 저장 때 경고를 남기고 꺼짐)
+    SAVE_SKIP_UNCHANGED: bool = os.getenv("SAVE_SKIP_UNCHANGED", "true").lower() == "true"
+    # 카테고리 인덱스(raw_categories/category_mappings) 재로딩 주기(초)
+    CATEGORY_INDEX_REFRESH_SECONDS: float = float(os.getenv("CATEGORY_INDEX_REFRESH_SECONDS", "600"))
+
     @property
     def tz(self) -> ZoneInfo:
         """설정된 타임존을 ZoneInfo 객체로 변환합니다."""
@@ -74,6 +191,8 @@ class Settings(BaseSettings):
     # 클래스로 그룹화된 설정들을 포함시킵니다.
     db: DatabaseSettings = DatabaseSettings()
     naver_api: NaverAPISettings = NaverAPISettings()
+    inflexer: InflexerSettings = InflexerSettings()
+    http: HttpSettings = HttpSettings()
     batch: BatchSettings = BatchSettings()
 
 
@@ -0,0 +1,178 @@
+# core/db.py
+"""
+프로세스 전체가 공유하는 SQLAlchemy 엔진/커넥션 풀.
+
+스크레이퍼 인스턴스, 캐시 버퍼, 카테고리 인덱스, 체크포인트가 모두 get_engine()의 엔진 하나를 씁니다.
+풀 크기는 DatabaseSettings로 조절하며, 파드 수 × (DB_POOL_SIZE + DB_MAX_OVERFLOW)가
+Postgres max_connections를 넘지 않도록 잡아야 합니다.
+
+DB_PGBOUNCER=true (transaction pooling 모드 PgBouncer 뒤):
+- 커넥션 풀링은 PgBouncer가 하므로 NullPool을 씁니다.
+- 서버 커넥션이 트랜잭션마다 바뀌어 세션 단위 SET/startup 옵션을 쓸 수 없으므로,
+  statement_timeout은 트랜잭션 시작마다 SET LOCAL로 적용합니다.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+import psycopg2.extensions
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from . import metrics as run_metrics
+from .config import settings
+from .logger import get_logger
+
+log = get_logger("db")
+
+_engine: Optional[Engine] = None
+_lock = threading.Lock()
+
+
+class PoolMetrics:
+    """풀 이벤트(connect/checkout/checkin/invalidate) 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0       # 새로 연 DBAPI 커넥션 수
+        self.checkouts = 0      # 풀에서 커넥션을 빌린 횟수
+        self.checkins = 0
+        self.invalidated = 0
+        self.in_use = 0         # 현재 빌려 간 커넥션 수
+        self.peak_in_use = 0
+
+    def on_connect(self, *_):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, *_):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def on_checkin(self, *_):
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(0, self.in_use - 1)
+
+    def on_invalidate(self, *_):
+        with self._lock:
+            self.invalidated += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidated": self.invalidated,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+            }
+
+
+metrics = PoolMetrics()
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    """DB 왕복 수를 현재 run 메트릭(db_round_trips)에 기록하는 커서"""
+
+    def execute(self, query, vars=None):
+        run_metrics.incr("db_round_trips")
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        # psycopg2의 executemany는 파라미터 묶음마다 한 번씩 서버에 보냄
+        vars_list = list(vars_list)
+        run_metrics.incr("db_round_trips", len(vars_list))
+        return super().executemany(query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        run_metrics.incr("db_round_trips")
+        return super().copy_expert(sql, file, size)
+
+    def fetchmany(self, size=None):
+        if self.name:  # 서버 사이드 커서는 fetch마다 왕복
+            run_metrics.incr("db_round_trips")
+        return super().fetchmany(size) if size is not None else super().fetchmany()
+
+
+def _on_connect(dbapi_conn, _):
+    metrics.on_connect()
+    dbapi_conn.cursor_factory = CountingCursor
+
+
+def local_settings_sql() -> Optional[str]:
+    """PgBouncer 모드에서 트랜잭션 시작마다 실행할 SET LOCAL 문 (필요 없으면 None)"""
+    db = settings.db
+    if db.PGBOUNCER and db.STATEMENT_TIMEOUT_MS > 0:
+        return f"SET LOCAL statement_timeout = {int(db.STATEMENT_TIMEOUT_MS)}"
+    return None
+
+
+def _build_engine() -> Engine:
+    db = settings.db
+    connect_args: Dict[str, Any] = {"application_name": db.APPLICATION_NAME}
+    kwargs: Dict[str, Any] = {"pool_pre_ping": True}
+
+    if db.PGBOUNCER:
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            pool_size=db.POOL_SIZE,
+            max_overflow=db.MAX_OVERFLOW,
+            pool_timeout=db.POOL_TIMEOUT_SECONDS,
+            pool_recycle=db.POOL_RECYCLE_SECONDS,
+        )
+        if db.STATEMENT_TIMEOUT_MS > 0:
+            connect_args["options"] = f"-c statement_timeout={int(db.STATEMENT_TIMEOUT_MS)}"
+
+    engine = create_engine(db.url, connect_args=connect_args, **kwargs)
+
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+
+    set_local = local_settings_sql()
+    if set_local:
+        @event.listens_for(engine, "begin")
+        def _apply_local_settings(conn):
+            conn.exec_driver_sql(set_local)
+
+    if db.PGBOUNCER:
+        log.info(f"DB 엔진 생성 (PgBouncer 모드, NullPool, statement_timeout={db.STATEMENT_TIMEOUT_MS}ms)")
+    else:
+        log.info(
+            f"DB 엔진 생성 (pool_size={db.POOL_SIZE}, max_overflow={db.MAX_OVERFLOW}, "
+            f"statement_timeout={db.STATEMENT_TIMEOUT_MS}ms)"
+        )
+    return engine
+
+
+def get_engine() -> Engine:
+    """프로세스 공유 엔진 (첫 호출 시 생성)"""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = _build_engine()
+    return _engine
+
+
+def dispose_engine() -> None:
+    """공유 엔진의 커넥션을 모두 닫고, 다음 get_engine() 때 새로 만들도록 합니다."""
+    global _engine
+    with _lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+def pool_stats() -> Dict[str, Any]:
+    """풀 이벤트 카운터 + 현재 풀 상태"""
+    stats: Dict[str, Any] = metrics.snapshot()
+    if _engine is not None:
+        stats["pool"] = _engine.pool.status()
+    return stats
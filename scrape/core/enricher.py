@@ -1,99 +1,143 @@
-from typing import Optional, Dict, Tuple, List
-import requests, time, random
+from typing import Any, Callable, Optional, Dict, Hashable, Tuple, List, Union
+import requests, threading, time
 from sqlalchemy.engine import Engine
 from sqlalchemy import text
 
-from .logger import get_logger
+from . import http_client, metrics
+from .config import settings
+from .logger import get_logger, log_sampled
+from .key_scheduler import NaverKeyScheduler
 
 log = get_logger("enricher")
 
 
-def naver_local_search(api_keys: List[Tuple[str, str]], query: str) -> Optional[Dict]:
+class _NotFound:
+    """정상 응답이지만 결과가 없음 (실패 None과 구분해 negative 캐시에 씀). bool 값은 False."""
+
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "NOT_FOUND"
+
+
+NOT_FOUND = _NotFound()
+
+
+def clean_local_query(query: str) -> str:
+    """Local 검색에 실제로 보내는 검색어 (single-flight 키로도 사용)"""
+    return (query or "").replace("[", "").replace("]", "").replace("/", " ").strip()
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
     """
-    키를 라운드로빈하지 않고, 1번 키를 최대한 소진 → 429가 일정 횟수 누적되면 '해당 키 소진'으로 판단하여
-    리스트에서 제거하고 다음 키로 넘어간다.
+    같은 키의 업스트림 호출을 한 번으로 합칩니다 (run 단위로 하나씩 생성).
+    - 같은 키가 호출 중이면 끝날 때까지 기다렸다가 그 결과를 함께 씁니다.
+    - 끝난 결과(None 포함)도 인스턴스가 살아 있는 동안 재사용하며, 예외는 기억하지 않습니다.
     """
 
-    url = "https://openapi.naver.com/v1/search/local.json"
-    clean_q = (query or "").replace("[", "").replace("]", "").replace("/", " ").strip()
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0   # 실제 업스트림 호출 수
+        self.saved = 0   # 합쳐져서 생략된 호출 수
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.saved += 1
+
+        if not leader:
+            metrics.incr("api_calls_saved", endpoint=self.endpoint)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args)
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._flights.pop(key, None)
+            raise
+        finally:
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"endpoint": self.endpoint, "calls": self.calls, "saved": self.saved}
+
+
+def naver_local_search(api_keys: Union[NaverKeyScheduler, List[Tuple[str, str]]], query: str) -> Optional[Dict]:
+    """
+    키 스케줄러가 고른 키(여유가 가장 큰 키)로 호출한다.
+    429는 해당 키만 쿨다운시키고 다른 키로 즉시 재시도하며, 쿨다운이 끝난 키는 다시 로테이션에 들어간다.
+    일시적인 네트워크 오류는 키를 제거하지 않는다.
+    반환: 첫 번째 장소, 결과가 없으면 NOT_FOUND, 실패하면 None
+    """
+
+    url = f"{settings.naver_api.OPENAPI_BASE_URL}/v1/search/local.json"
+    clean_q = clean_local_query(query)
     params = {"query": clean_q, "display": 1}
 
-    if not api_keys:
+    scheduler = api_keys if isinstance(api_keys, NaverKeyScheduler) else NaverKeyScheduler(api_keys)
+    if not len(scheduler):
         log.error("Local API 키 없음")
         return None
 
-    # 429 일시 속도 제한을 위한 백오프 파라미터
-    # - 동일 키에서 429가 STRIKE_LIMIT 번 이상 발생하면 '소진' 판단
-    STRIKE_LIMIT = 3  # 이 횟수 이상 429면 키 소진 처리
-    INITIAL_SLEEP = 0.4  # 첫 백오프(초)
-    BACKOFF_FACTOR = 1.7  # 지수 백오프 계수
-    MAX_BACKOFF = 6.0  # 같은 키에서 한 번 시도 시 최대 대기
-    JITTER = (0.0, 0.3)  # 지터 범위
-
-    # 항상 첫 번째 키부터 시도 → 소진되면 pop(0)으로 제거
-    # (원본 리스트를 수정해 다음 호출(enrich_once 루프)에도 상태가 반영되도록 함)
-    while api_keys:
-        client_id, client_secret = api_keys[0]
-        headers = {
-            "X-Naver-Client-Id": client_id,
-            "X-Naver-Client-Secret": client_secret,
-        }
-
-        strikes = 0
-        backoff = INITIAL_SLEEP
-
-        while True:
-            try:
-                log.info(
-                    f"Naver Local API 호출 (현재 키: ...{client_id[-4:]}, 잔여키수: {len(api_keys)}, "
-                    f"Query(raw)='{query}', Query(clean)='{clean_q}')"
-                )
-                r = requests.get(url, headers=headers, params=params, timeout=5)
-                r.raise_for_status()
-                items = r.json().get("items", [])
-                # 성공했어도 라운드로빈 금지: 같은 키 그대로 유지
-                # (다음 요청도 이 키로 시도; enrich_once 루프에서 자연스러운 pace를 위해 약간 쉼)
-                return items[0] if items else None
-
-            except requests.RequestException as e:
-                status = getattr(getattr(e, "response", None), "status_code", None)
-
-                # 429 → 같은 키로 재시도(지수 백오프 + 지터). STRIKE_LIMIT 넘으면 '소진' 처리.
-                if status == 429:
-                    strikes += 1
-                    if strikes >= STRIKE_LIMIT:
-                        log.warning(
-                            f"Key ...{client_id[-4:]} 429 {strikes}회 → 소진 판단, 키 제거 후 다음 키로 이동."
-                        )
-                        api_keys.pop(0)  # 이 키 제거 → 다음 키로 넘어감
-                        break  # 외부 while로 나가 다음 키 시도
-                    sleep_for = min(MAX_BACKOFF, backoff) + random.uniform(*JITTER)
-                    log.warning(
-                        f"429(Too Many Requests): 같은 키 재시도까지 {sleep_for:.2f}s 대기 "
-                        f"(strike {strikes}/{STRIKE_LIMIT}, key ...{client_id[-4:]})"
-                    )
-                    time.sleep(sleep_for)
-                    backoff *= BACKOFF_FACTOR
-                    continue
-
-                # 네트워크/기타 오류 → 같은 키로 짧게 재시도(두세 번만)
-                # 여기서는 429와 다르게 strikes 카운트를 쓰지 않고, 2~3회 정도만 빠르게 재도전 후 키 소진 처리해도 됨.
-                # 단순화를 위해 한 번 더만 시도:
-                log.warning(
-                    f"Naver Local API 실패(status={status}): {e}. 같은 키로 1회 재시도."
-                )
-                time.sleep(0.5 + random.uniform(*JITTER))
-                try:
-                    r = requests.get(url, headers=headers, params=params, timeout=5)
-                    r.raise_for_status()
-                    items = r.json().get("items", [])
-                    return items[0] if items else None
-                except Exception as e2:
-                    log.warning(f"재시도 실패: {e2}. 키 소진으로 판단하고 제거.")
-                    api_keys.pop(0)
-                    break  # 다음 키로 이동
-
-    # 여기 도달 = 모든 키가 소진됨
+    # 키 수에 비례한 최대 시도 횟수 (모든 키가 몇 번씩 429를 받아도 무한 루프 방지)
+    MAX_ATTEMPTS = 3 * len(scheduler) + 2
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        key = scheduler.acquire()
+        if key is None:
+            break
+
+        try:
+            log_sampled(
+                log, "naver.local_search",
+                "Naver Local API 호출 (현재 키: %s, 시도: %d/%d, Query(raw)='%s', Query(clean)='%s')",
+                key.label, attempt, MAX_ATTEMPTS, query, clean_q,
+            )
+            metrics.incr("api_calls", endpoint="local_search", key=key.label)
+            r = http_client.get(url, headers=key.headers, params=params, timeout=5)
+            r.raise_for_status()
+            items = r.json().get("items", [])
+            scheduler.report_success(key)
+            return items[0] if items else NOT_FOUND
+
+        except requests.RequestException as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+
+            if status == 429:
+                metrics.incr("api_throttled", endpoint="local_search", key=key.label)
+                scheduler.report_throttled(key)
+                continue
+
+            metrics.incr("api_errors", endpoint="local_search", status=status)
+            log.warning(f"Naver Local API 실패(status={status}, key {key.label}): {e}")
+            scheduler.report_error(key, status)
+
+    # 여기 도달 = 시도 횟수 초과 또는 사용 가능한 키 없음
     log.error(f"Naver Local API 모든 키 소진(또는 실패): {clean_q}")
     return None
 
@@ -101,8 +145,8 @@ def naver_local_search(api_keys: List[Tuple[str, str]], query: str) -> Optional[
 def naver_geocode(
     map_id: str, map_secret: str, address: str
 ) -> Optional[Tuple[float, float]]:
-    # 반환값: (lat, lng)
-    url = "https://maps.apigw.ntruss.com/map-geocode/v2/geocode"
+    # 반환값: (lat, lng), 결과가 없으면 NOT_FOUND, 실패하면 None
+    url = f"{settings.naver_api.MAPS_BASE_URL}/map-geocode/v2/geocode"
     headers = {"x-ncp-apigw-api-key-id": map_id, "x-ncp-apigw-api-key": map_secret}
     params = {"query": address}
     max_retries = 3
@@ -110,23 +154,28 @@ def naver_geocode(
 
     for attempt in range(max_retries):
         try:
-            r = requests.get(url, headers=headers, params=params, timeout=10)
+            metrics.incr("api_calls", endpoint="geocode", key="map")
+            r = http_client.get(url, headers=headers, params=params, timeout=10)
             r.raise_for_status()
             addrs = r.json().get("addresses", [])
             if not addrs:
-                return None
+                return NOT_FOUND
             lat = float(addrs[0]["y"])
             lng = float(addrs[0]["x"])
             return (lat, lng)
         except requests.RequestException as e:
+            # Response.__bool__은 .ok라서 4xx 응답이면 False → status_code로 직접 판단
+            status = getattr(getattr(e, "response", None), "status_code", None)
             # 429 (Too Many Requests) 에러일 경우에만 재시도
-            if e.response and e.response.status_code == 429:
+            if status == 429:
+                metrics.incr("api_throttled", endpoint="geocode", key="map")
                 wait_time = backoff_factor * (2**attempt)
                 log.warning(
                     f"Geocode API 쿼터 초과 ({address}). {wait_time}초 후 재시도... ({attempt + 1}/{max_retries})"
                 )
                 time.sleep(wait_time)
             else:
+                metrics.incr("api_errors", endpoint="geocode", status=status)
                 log.warning(f"Geocode 실패 ({address}): {e}")
                 wait_time = backoff_factor * (2**attempt)
                 time.sleep(wait_time)
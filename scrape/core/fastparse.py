@@ -0,0 +1,71 @@
+# core/fastparse.py
+"""
+pandas 없이 dict 레코드를 파싱할 때 쓰는 함수 모음 (PARSE_ENGINE=dict).
+pandas 엔진의 astype("string").str.strip() / to_datetime(errors="coerce") /
+drop_duplicates(keep="first") 와 같은 결과를 내도록 맞춰 두었습니다.
+"""
+import math
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# ISO 형식이 아닐 때의 보조 패턴: 2026.01.05 / 2026/1/5 / 2026-01-05 10:30(:00)
+_DATE_RE = re.compile(
+    r"^(\d{4})[./-](\d{1,2})[./-](\d{1,2})\.?(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?$"
+)
+
+
+def clean_text(value: Any) -> Optional[str]:
+    """문자열 컬럼 값 정리 (None/NaN → None, 그 외 str 후 양끝 공백 제거)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value).strip()
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_text(text: str) -> Optional[datetime]:
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    m = _DATE_RE.match(text)
+    if not m:
+        return None
+    try:
+        return datetime(*(int(g) for g in m.groups() if g is not None))
+    except ValueError:
+        return None
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    날짜 문자열 → datetime (변환 불가 → None).
+    같은 날짜 문자열이 많이 반복되므로 결과를 캐시합니다.
+    pandas 엔진과 달리 열마다 형식을 추론하지 않아, 형식이 섞여 있어도 행마다 파싱됩니다.
+    """
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        return None
+    return _parse_date_text(value)
+
+
+def empty_record(columns: Iterable[str]) -> Dict[str, Any]:
+    return dict.fromkeys(columns)
+
+
+def dedupe(records: Iterable[Dict[str, Any]], key_columns: Sequence[str]) -> List[Dict[str, Any]]:
+    """key_columns 값이 같은 레코드는 처음 것만 남깁니다."""
+    seen = set()
+    out = []
+    for rec in records:
+        key = tuple(rec.get(c) for c in key_columns)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(rec)
+    return out
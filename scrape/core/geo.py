@@ -0,0 +1,72 @@
+# core/geo.py
+"""
+좌표 계산을 배치 단위(NumPy 배열)로 처리하는 함수 모음.
+입력은 None/NaN/Decimal/숫자 문자열이 섞인 시퀀스여도 되며, 값이 없거나
+변환할 수 없는 위치는 NaN으로 취급합니다.
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+# 한국 좌표 대략 범위 (위도 min/max, 경도 min/max)
+KOREA_LAT_RANGE = (33.0, 39.5)
+KOREA_LNG_RANGE = (124.0, 132.0)
+
+
+def to_float_array(values: Sequence) -> np.ndarray:
+    """값 시퀀스 → float64 배열 (None/변환 불가 → NaN)"""
+    arr = np.asarray(values, dtype=object)
+    try:
+        return np.where(arr == None, np.nan, arr).astype(np.float64)  # noqa: E711 (원소별 비교)
+    except (TypeError, ValueError):
+        out = np.empty(len(arr), dtype=np.float64)
+        for i, v in enumerate(arr):
+            try:
+                out[i] = float(v)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def haversine_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """두 좌표 배열 사이의 거리(meter). 어느 한쪽이라도 NaN이면 결과도 NaN."""
+    lat1, lng1, lat2, lng2 = (to_float_array(v) for v in (lat1, lng1, lat2, lng2))
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dlat = p2 - p1
+    dlng = np.radians(lng2 - lng1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def in_korea(lat, lng) -> np.ndarray:
+    """좌표가 한국 범위 안인지 여부 (NaN → False)"""
+    lat, lng = to_float_array(lat), to_float_array(lng)
+    return (
+        (lat >= KOREA_LAT_RANGE[0]) & (lat <= KOREA_LAT_RANGE[1])
+        & (lng >= KOREA_LNG_RANGE[0]) & (lng <= KOREA_LNG_RANGE[1])
+    )
+
+
+def from_mapxy(mapx, mapy) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    네이버 Local API의 mapx/mapy 배열 → (lat, lng) 배열.
+    - mapx: 경도 * 1e7, mapy: 위도 * 1e7
+    - 한국 범위를 벗어나거나 값이 없으면 NaN
+    """
+    lng = to_float_array(mapx) / 1e7
+    lat = to_float_array(mapy) / 1e7
+    ok = in_korea(lat, lng)
+    return np.where(ok, lat, np.nan), np.where(ok, lng, np.nan)
+
+
+def drift_mask(db_lat, db_lng, cur_lat, cur_lng, threshold_m: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    DB 좌표와 현재 좌표의 거리가 threshold_m를 넘는 행의 마스크와 거리 배열을 반환합니다.
+    좌표가 하나라도 없는 행은 False입니다.
+    """
+    dist = haversine_m(db_lat, db_lng, cur_lat, cur_lng)
+    with np.errstate(invalid="ignore"):
+        mask = dist > threshold_m
+    return mask, dist
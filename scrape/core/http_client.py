@@ -0,0 +1,146 @@
+# core/http_client.py
+"""
+외부 API 호출(Naver, Inflexer)이 공유하는 HTTP 클라이언트.
+
+- 호스트마다 requests.Session 하나를 두고 keep-alive 커넥션을 재사용합니다 (TCP/TLS 핸드셰이크 절약).
+- 응답 압축(gzip/deflate)을 요청합니다.
+- 타임아웃을 지정하지 않은 호출에는 기본 (connect, read) 타임아웃을 적용합니다.
+- 커넥션 오류 재시도는 urllib3 Retry로 처리하고, set_retry_policy()로 호스트별 정책을 바꿀 수 있습니다.
+  429 등 상태 코드 재시도는 호출하는 쪽(키 스케줄러, geocode backoff)이 담당하므로 기본 정책에는 넣지 않습니다.
+여러 스레드에서 동시에 사용할 수 있습니다.
+"""
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import metrics
+from .config import settings
+from .logger import get_logger
+
+log = get_logger("http_client")
+
+_sessions: Dict[str, requests.Session] = {}
+_retry_policies: Dict[str, Retry] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+_lock = threading.Lock()
+_recorder = None
+
+
+def default_retry() -> Retry:
+    """기본 재시도 정책: 커넥션 실패만 재시도 (요청이 서버에 도달하지 않은 경우)"""
+    return Retry(
+        total=None,
+        connect=settings.http.CONNECT_RETRIES,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=settings.http.RETRY_BACKOFF_SECONDS,
+        raise_on_status=False,
+    )
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _mount(session: requests.Session, host: str) -> None:
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.http.POOL_MAXSIZE,
+        max_retries=_retry_policies.get(host) or default_retry(),
+    )
+    session.mount(host, adapter)
+
+
+def get_session(url: str) -> requests.Session:
+    """url의 호스트(scheme://netloc)에 해당하는 공유 세션"""
+    host = _host(url)
+    session = _sessions.get(host)
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers["Accept-Encoding"] = "gzip, deflate"
+                _mount(session, host)
+                _sessions[host] = session
+                _stats.setdefault(host, {"requests": 0, "errors": 0, "seconds": 0.0})
+    return session
+
+
+def set_retry_policy(host_url: str, retry: Retry) -> None:
+    """호스트별 재시도 정책을 지정합니다 (이미 만든 세션에도 바로 반영)."""
+    host = _host(host_url)
+    with _lock:
+        _retry_policies[host] = retry
+        session = _sessions.get(host)
+        if session is not None:
+            _mount(session, host)
+
+
+def _get_recorder():
+    """HTTP_RECORD_DIR이 지정되어 있으면 cassette 기록기 (없으면 None)"""
+    global _recorder
+    if _recorder is None and settings.http.RECORD_DIR:
+        from .cassette import CassetteRecorder
+
+        with _lock:
+            if _recorder is None:
+                _recorder = CassetteRecorder(settings.http.RECORD_DIR)
+                log.info(f"HTTP 응답 기록 모드 → {settings.http.RECORD_DIR}")
+    return _recorder
+
+
+def request(method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+    """requests.request와 같은 인터페이스로 공유 세션을 통해 요청합니다."""
+    session = get_session(url)
+    if timeout is None:
+        timeout = settings.http.READ_TIMEOUT_SECONDS
+    if not isinstance(timeout, tuple):
+        timeout = (settings.http.CONNECT_TIMEOUT_SECONDS, timeout)
+
+    host = _host(url)
+    stats = _stats[host]
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, timeout=timeout, **kwargs)
+        recorder = _get_recorder()
+        if recorder is not None and method == "GET":
+            recorder.record(response)
+        return response
+    except requests.RequestException:
+        with _lock:
+            stats["errors"] += 1
+        metrics.incr("http_errors", host=host)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            stats["requests"] += 1
+            stats["seconds"] += elapsed
+        metrics.observe("http_request_seconds", elapsed, host=host)
+
+
+def get(url: str, params: Optional[dict] = None, headers: Optional[dict] = None, timeout=None, **kwargs) -> requests.Response:
+    """requests.get과 같은 인터페이스로 공유 세션을 통해 GET 합니다."""
+    return request("GET", url, params=params, headers=headers, timeout=timeout, **kwargs)
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """호스트별 요청 수/오류 수/누적 소요 시간"""
+    with _lock:
+        return {host: dict(s) for host, s in _stats.items()}
+
+
+def close_all() -> None:
+    """모든 세션을 닫습니다 (다음 호출 때 새로 만듦)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
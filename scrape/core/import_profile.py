@@ -0,0 +1,51 @@
+# core/import_profile.py
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from .logger import get_logger
+
+log = get_logger("import_profile")
+
+SCRAPE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_imports(code: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    새 인터프리터에서 `python -X importtime -c code`를 실행해
+    (전체 import 시간 ms, [(최상위 패키지, ms)] 시간 내림차순)을 반환합니다.
+    패키지별 시간은 하위 모듈의 self 시간을 합친 값입니다 (예: pandas.core.* → pandas).
+    이미 로드된 모듈의 영향을 받지 않도록 항상 별도 프로세스에서 측정합니다.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SCRAPE_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import 측정 실패: {proc.stderr.strip().splitlines()[-1:]}")
+
+    total_us = 0
+    by_package: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        total_us += int(self_us)
+        by_package[package] = by_package.get(package, 0) + int(self_us)
+    packages = sorted(((name, us / 1000) for name, us in by_package.items()), key=lambda x: x[1], reverse=True)
+    return total_us / 1000, packages
+
+
+def report(scraper_name: str, budget_ms: float, top: int = 15) -> bool:
+    """스크레이퍼 콜드 스타트(main + 스크레이퍼 모듈) import 비용을 출력하고, 예산 이내인지 반환합니다."""
+    code = f"import main; main.find_scraper_class({scraper_name!r})"
+    total_ms, packages = measure_imports(code)
+    log.info(f"[import-profile] {scraper_name} 콜드 스타트 import: {total_ms:.1f}ms (예산 {budget_ms:.0f}ms)")
+    for name, ms in packages[:top]:
+        log.info(f"[import-profile]   {ms:9.1f}ms  {name}")
+    if total_ms > budget_ms:
+        log.error(f"[import-profile] import 예산 초과: {total_ms:.1f}ms > {budget_ms:.0f}ms")
+        return False
+    return True
@@ -0,0 +1,160 @@
+# core/key_scheduler.py
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .logger import get_logger
+
+log = get_logger("key_scheduler")
+
+
+class ApiKeyState:
+    """키 하나의 호출 이력과 쿨다운 상태"""
+
+    def __init__(self, client_id: str, client_secret: str):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.requests = 0          # 누적 요청 수
+        self.throttled = 0         # 누적 429 수
+        self.errors = 0            # 누적 기타 오류 수
+        self.strikes = 0           # 연속 429 수 (성공 시 0으로 초기화)
+        self.cooldown_until = 0.0  # 이 시각(monotonic)까지 사용 중지
+        self.disabled = False      # 인증 실패 등 복구 불가 상태
+        self.recent = deque()      # 최근 윈도우 내 요청 시각
+
+    @property
+    def label(self) -> str:
+        return f"...{self.client_id[-4:]}"
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret,
+        }
+
+
+class NaverKeyScheduler:
+    """
+    여러 Naver 검색 API 키에 요청을 분배하는 스케줄러.
+    - 키별 요청 수, 윈도우 내 요청 수, 쿨다운 만료 시각을 추적합니다.
+    - 매 호출마다 쿨다운 중이 아닌 키 중 윈도우 여유(headroom)가 가장 큰 키를 고릅니다.
+    - 429를 받은 키는 지수적으로 늘어나는 쿨다운 후 자동으로 다시 로테이션에 들어갑니다.
+    - 일시적인 네트워크 오류는 짧은 쿨다운만 주고 키를 제거하지 않습니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        keys: List[Tuple[str, str]],
+        rate_per_window: int = 10,
+        window_seconds: float = 1.0,
+        cooldown_seconds: float = 1.0,
+        max_cooldown_seconds: float = 60.0,
+        error_cooldown_seconds: float = 0.5,
+        max_wait_seconds: float = 30.0,
+    ):
+        self._keys = [ApiKeyState(cid, secret) for cid, secret in keys]
+        self.rate_per_window = max(1, int(rate_per_window))
+        self.window_seconds = float(window_seconds)
+        self.cooldown_seconds = float(cooldown_seconds)
+        self.max_cooldown_seconds = float(max_cooldown_seconds)
+        self.error_cooldown_seconds = float(error_cooldown_seconds)
+        self.max_wait_seconds = float(max_wait_seconds)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(1 for k in self._keys if not k.disabled)
+
+    def _trim(self, key: ApiKeyState, now: float) -> None:
+        while key.recent and now - key.recent[0] >= self.window_seconds:
+            key.recent.popleft()
+
+    def _pick(self, now: float) -> Tuple[Optional[ApiKeyState], float]:
+        """사용 가능한 키와, 없다면 다음 키가 풀리기까지의 대기 시간을 반환합니다."""
+        best, best_headroom = None, 0
+        next_free = None
+        for key in self._keys:
+            if key.disabled:
+                continue
+            self._trim(key, now)
+            if key.cooldown_until > now:
+                free_at = key.cooldown_until
+            else:
+                headroom = self.rate_per_window - len(key.recent)
+                if headroom > 0:
+                    if best is None or headroom > best_headroom or (
+                        headroom == best_headroom and key.requests < best.requests
+                    ):
+                        best, best_headroom = key, headroom
+                    continue
+                free_at = key.recent[0] + self.window_seconds
+            next_free = free_at if next_free is None else min(next_free, free_at)
+        wait = 0.0 if next_free is None else max(0.0, next_free - now)
+        return best, wait
+
+    def acquire(self) -> Optional[ApiKeyState]:
+        """
+        여유가 가장 큰 키를 골라 요청 1건을 예약하고 반환합니다.
+        모든 키가 한도/쿨다운 상태면 풀릴 때까지 대기하며,
+        max_wait_seconds 이상 기다려야 하거나 사용 가능한 키가 없으면 None을 반환합니다.
+        """
+        deadline = time.monotonic() + self.max_wait_seconds
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                key, wait = self._pick(now)
+                if key is not None:
+                    key.recent.append(now)
+                    key.requests += 1
+                    return key
+                if not len(self):
+                    return None
+            if now + wait > deadline:
+                log.error(f"사용 가능한 Naver 검색 키 없음 (다음 키 복구까지 {wait:.1f}s)")
+                return None
+            time.sleep(wait)
+
+    def report_success(self, key: ApiKeyState) -> None:
+        with self._lock:
+            if key.strikes:
+                log.info(f"Key {key.label} 정상 응답 → 로테이션 복귀")
+            key.strikes = 0
+
+    def report_throttled(self, key: ApiKeyState) -> float:
+        """429 응답. 연속 횟수에 따라 쿨다운을 늘리고, 쿨다운 시간(초)을 반환합니다."""
+        with self._lock:
+            key.throttled += 1
+            key.strikes += 1
+            cooldown = min(self.max_cooldown_seconds, self.cooldown_seconds * (2 ** (key.strikes - 1)))
+            key.cooldown_until = max(key.cooldown_until, time.monotonic() + cooldown)
+        log.warning(f"Key {key.label} 429 (연속 {key.strikes}회) → {cooldown:.1f}s 쿨다운")
+        return cooldown
+
+    def report_error(self, key: ApiKeyState, status: Optional[int] = None) -> None:
+        """429 이외의 실패. 인증 오류(401/403)만 키를 비활성화하고, 나머지는 짧게 쉬게 합니다."""
+        with self._lock:
+            key.errors += 1
+            if status in (401, 403):
+                key.disabled = True
+            else:
+                key.cooldown_until = max(key.cooldown_until, time.monotonic() + self.error_cooldown_seconds)
+        if key.disabled:
+            log.error(f"Key {key.label} 인증 실패(status={status}) → 키 비활성화")
+
+    def stats(self) -> List[Dict]:
+        """키별 요청/429/오류 수 스냅샷"""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    "key": k.label,
+                    "requests": k.requests,
+                    "throttled": k.throttled,
+                    "errors": k.errors,
+                    "disabled": k.disabled,
+                    "cooling_down": k.cooldown_until > now,
+                }
+                for k in self._keys
+            ]
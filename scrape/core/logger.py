@@ -1,6 +1,119 @@
 # core/logger.py
+"""
+표준화된 로거 설정.
+
+- LOG_FORMAT=json이면 한 줄에 JSON 객체 하나로 출력합니다 (extra={"fields": {...}}의 값도 함께 기록).
+- LOG_ASYNC=true면 QueueHandler로 기록만 넘기고, 포맷/출력은 QueueListener 스레드가 합니다.
+- 행 단위로 반복되는 로그는 log_sampled()로 남기면 이벤트별로 샘플링됩니다.
+  건수는 activate_sampler()로 연 범위(run)마다 따로 세므로, 키워드마다 처음 N건이 다시 기록됩니다.
+- 메시지는 f-string 대신 %-포맷 인자로 넘기면, 출력되지 않는 레벨일 때 문자열을 만들지 않습니다.
+
+거의 모든 모듈이 import 시점에 get_logger를 부르므로, 여기서 core.config를 import 하면
+호출 측이 환경변수를 설정하기 전에 settings가 만들어질 수 있습니다. 그래서 로깅 설정만은
+첫 사용 시점에 환경변수(.env 포함)에서 직접 읽습니다.
+"""
+import atexit
+import contextvars
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+
+class LogSettings:
+    """로깅 설정"""
+
+    def __init__(self):
+        load_dotenv()
+        self.LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+        # "text"(기존 포맷) 또는 "json"(한 줄에 JSON 객체 하나, 로그 수집기용)
+        self.FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+        # true면 로그 기록을 큐로 넘기고 별도 스레드에서 포맷/출력 (호출 스레드가 stdout I/O를 기다리지 않음)
+        self.ASYNC: bool = os.getenv("LOG_ASYNC", "false").lower() == "true"
+        # 행 단위 로그(캐시 HIT/MISS/PUT, Naver 호출) 샘플링: 이벤트별 처음 N건은 모두, 이후는 M건마다 1건
+        # (LOG_SAMPLE_EVERY=1이면 모두 기록, 0이면 처음 N건 이후 기록 안 함. 건수는 run 메트릭으로 확인)
+        self.SAMPLE_FIRST: int = int(os.getenv("LOG_SAMPLE_FIRST", "20"))
+        self.SAMPLE_EVERY: int = int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+
+
+_settings: Optional[LogSettings] = None
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+_handler_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 포맷합니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    같은 프로세스의 리스너 스레드로만 넘기므로 prepare()에서 메시지를 미리 포맷하지 않습니다
+    (기본 QueueHandler는 호출 스레드에서 포맷해 버려 비동기로 얻는 이득이 줄어듦).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def log_settings() -> LogSettings:
+    global _settings
+    if _settings is None:
+        _settings = LogSettings()
+    return _settings
+
+
+def _build_handler() -> logging.Handler:
+    global _listener
+    cfg = log_settings()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if cfg.FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    if not cfg.ASYNC:
+        return stream_handler
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # 종료 시 큐에 남은 로그를 모두 출력
+    atexit.register(_listener.stop)
+    return _InProcessQueueHandler(log_queue)
+
+
+def _shared_handler() -> logging.Handler:
+    """프로세스 전체가 공유하는 핸들러 (첫 호출 시 생성)"""
+    global _handler
+    if _handler is None:
+        with _handler_lock:
+            if _handler is None:
+                _handler = _build_handler()
+    return _handler
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -11,18 +124,53 @@ def get_logger(name: str) -> logging.Logger:
 
     # 핸들러가 이미 설정되어 있다면 중복 추가를 방지합니다.
     if not logger.handlers:
-        logger.setLevel(logging.INFO)
+        logger.setLevel(getattr(logging, log_settings().LEVEL, logging.INFO))
+        logger.addHandler(_shared_handler())
 
-        # 콘솔 핸들러
-        stream_handler = logging.StreamHandler(sys.stdout)
-        stream_handler.setLevel(logging.INFO)
+    return logger
 
-        # 포맷터
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        stream_handler.setFormatter(formatter)
 
-        logger.addHandler(stream_handler)
+class _EventSampler:
+    """이벤트 이름별 발생 횟수"""
 
-    return logger
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def hit(self, event: str) -> int:
+        with self._lock:
+            n = self._counts.get(event, 0) + 1
+            self._counts[event] = n
+            return n
+
+
+# run 밖(범위를 열지 않은 호출)에서 쓰는 프로세스 공용 샘플러
+_sampler = _EventSampler()
+# 현재 run의 샘플러 (BaseScraper.run이 activate_sampler로 등록, 같은 run의 작업 스레드는 context 복사로 공유)
+_run_sampler: contextvars.ContextVar[Optional[_EventSampler]] = contextvars.ContextVar("scrape_log_sampler", default=None)
+
+
+def activate_sampler() -> contextvars.Token:
+    """현재 context에 새 샘플러를 등록해 이벤트 건수를 처음부터 셉니다 (deactivate_sampler로 해제)."""
+    return _run_sampler.set(_EventSampler())
+
+
+def deactivate_sampler(token: contextvars.Token) -> None:
+    _run_sampler.reset(token)
+
+
+def log_sampled(logger: logging.Logger, event: str, msg: str, *args, level: int = logging.INFO, **fields) -> None:
+    """
+    행 단위로 반복되는 로그를 이벤트(event)별로 샘플링해 남깁니다.
+    처음 LOG_SAMPLE_FIRST건은 모두, 이후는 LOG_SAMPLE_EVERY건마다 1건만 기록하며,
+    샘플링된 로그에는 몇 번째 이벤트인지 붙입니다. 기록하지 않을 때는 메시지를 포맷하지 않습니다.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    n = (_run_sampler.get() or _sampler).hit(event)
+    cfg = log_settings()
+    if n > cfg.SAMPLE_FIRST:
+        if cfg.SAMPLE_EVERY <= 0 or (n - cfg.SAMPLE_FIRST) % cfg.SAMPLE_EVERY:
+            return
+        msg = f"{msg} (샘플링: {event} {n}번째)"
+    logger.log(level, msg, *args, extra={"fields": {"event": event, "event_count": n, **fields}})
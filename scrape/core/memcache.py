@@ -0,0 +1,100 @@
+# core/memcache.py
+"""
+프로세스 메모리 LRU + TTL 캐시.
+
+BaseScraper가 local_search_cache / geocode_cache(Postgres) 앞단 tier로 씁니다.
+한 프로세스에서 여러 키워드를 처리할 때 반복 조회가 DB까지 가지 않도록 하며,
+다른 파드가 DB에 쓴 값은 TTL이 지나야 보이므로 TTL은 DB 캐시보다 훨씬 짧게 잡습니다.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def approx_size(key: Hashable, value: Any) -> int:
+    """엔트리 메모리 사용량 근사치 (키/값과 한 단계 안쪽 항목의 getsizeof 합)"""
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(key, tuple):
+        size += sum(sys.getsizeof(k) for k in key)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(v) for v in value.values())
+    elif isinstance(value, (tuple, list)):
+        size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+class LruTtlCache:
+    """
+    엔트리 수(max_entries)와 근사 바이트(max_bytes) 한도를 넘으면 가장 오래 안 쓴 엔트리부터 내보내고,
+    ttl_seconds가 지난 엔트리는 조회 시 만료시킵니다. 여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, max_entries: int = 50000, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 21600):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl_seconds = float(ttl_seconds)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()  # key → (만료 시각, 크기, 값)
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0     # TTL로 만료되어 버린 엔트리 수
+        self.evictions = 0   # 한도 때문에 내보낸 엔트리 수
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._bytes -= size
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = approx_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,220 @@
+# core/metrics.py
+"""
+스크레이퍼 run(키워드) 단위 메트릭.
+
+BaseScraper.run이 RunMetrics를 만들어 contextvar에 등록하고, 코드 곳곳에서는 모듈 함수
+incr()/observe()/stage()로 현재 run의 메트릭에 기록합니다 (run 밖에서 호출되면 아무 것도 하지 않음).
+run이 끝나면 다음으로 내보냅니다.
+- JSON 요약: 항상 로그 한 줄, METRICS_JSON_DIR이 있으면 파일로도 저장
+- Prometheus: METRICS_TEXTFILE_DIR(node_exporter textfile collector) 파일, METRICS_PUSHGATEWAY_URL 푸시
+
+스레드를 새로 만들 때는 contextvars.copy_context().run으로 실행해야 같은 run에 기록됩니다
+(asyncio.to_thread는 자동으로 복사합니다).
+"""
+import base64
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .config import settings
+from .logger import get_logger
+
+log = get_logger("metrics")
+
+_current: contextvars.ContextVar[Optional["RunMetrics"]] = contextvars.ContextVar("scrape_run_metrics", default=None)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, "" if v is None else str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class RunMetrics:
+    """한 run의 단계별 소요 시간, 카운터, 관측값(합계/횟수). 여러 스레드에서 동시에 기록할 수 있습니다."""
+
+    def __init__(self, scraper: str, keyword: Optional[str]):
+        self.scraper = scraper
+        self.keyword = keyword or ""
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = "running"
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, float]] = {}                     # stage → {seconds, calls}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}              # name → labels → value
+        self.observations: Dict[str, Dict[LabelKey, Tuple[float, int]]] = {}  # name → labels → (sum, count)
+
+    def incr(self, name: str, n: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + n
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.observations.setdefault(name, {})
+            total, count = series.get(key, (0.0, 0))
+            series[key] = (total + value, count + 1)
+
+    def total(self, name: str, **labels) -> float:
+        """카운터 합계 (labels를 주면 그 라벨 값이 일치하는 시리즈만)"""
+        wanted = {k: str(v) for k, v in labels.items()}
+        with self._lock:
+            return sum(
+                value for key, value in self.counters.get(name, {}).items()
+                if all(dict(key).get(k) == v for k, v in wanted.items())
+            )
+
+    def add_stage_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            s = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            s["seconds"] += seconds
+            s["calls"] += 1
+
+    def finish(self, status: str) -> None:
+        self.duration = time.perf_counter() - self._started
+        self.status = status
+
+    # ----- 내보내기 -----
+
+    def summary(self) -> Dict[str, Any]:
+        def flat(series):
+            return {",".join(f"{k}={v}" for k, v in key) or "total": value for key, value in series.items()}
+
+        with self._lock:
+            return {
+                "scraper": self.scraper,
+                "keyword": self.keyword,
+                "status": self.status,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_seconds": round(self.duration or 0.0, 3),
+                "stages": {k: {"seconds": round(v["seconds"], 3), "calls": v["calls"]} for k, v in self.stages.items()},
+                "counters": {name: flat(series) for name, series in self.counters.items()},
+                "observations": {
+                    name: {label: {"sum": round(s, 3), "count": c} for label, (s, c) in flat(series).items()}
+                    for name, series in self.observations.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        base = (("scraper", self.scraper), ("keyword", self.keyword))
+
+        def fmt(name: str, labels: LabelKey, value: float) -> str:
+            label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in base + labels)
+            return f"{name}{{{label_str}}} {value}"
+
+        lines = [
+            "# TYPE scrape_run_duration_seconds gauge",
+            fmt("scrape_run_duration_seconds", (), round(self.duration or 0.0, 3)),
+            "# TYPE scrape_run_success gauge",
+            fmt("scrape_run_success", (), 1 if self.status == "success" else 0),
+            "# TYPE scrape_run_finished_timestamp_seconds gauge",
+            fmt("scrape_run_finished_timestamp_seconds", (), int(time.time())),
+            "# TYPE scrape_stage_duration_seconds gauge",
+        ]
+        with self._lock:
+            for stage, s in self.stages.items():
+                lines.append(fmt("scrape_stage_duration_seconds", (("stage", stage),), round(s["seconds"], 3)))
+            for name, series in self.counters.items():
+                metric = f"scrape_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines += [fmt(metric, key, value) for key, value in series.items()]
+            for name, series in self.observations.items():
+                lines.append(f"# TYPE scrape_{name} summary")
+                for key, (total, count) in series.items():
+                    lines.append(fmt(f"scrape_{name}_sum", key, round(total, 6)))
+                    lines.append(fmt(f"scrape_{name}_count", key, count))
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> None:
+        """설정에 따라 JSON 요약/Prometheus textfile/pushgateway로 내보냅니다. 실패해도 run에 영향 없음."""
+        batch = settings.batch
+        summary = self.summary()
+        log.info(f"[metrics] {json.dumps(summary, ensure_ascii=False)}")
+
+        name = re.sub(r"[^\w-]", "_", f"{self.scraper}_{self.keyword or 'all'}")
+        if batch.METRICS_JSON_DIR:
+            self._write_atomic(os.path.join(batch.METRICS_JSON_DIR, f"{name}.json"),
+                               json.dumps(summary, ensure_ascii=False, indent=2))
+        if batch.METRICS_TEXTFILE_DIR:
+            self._write_atomic(os.path.join(batch.METRICS_TEXTFILE_DIR, f"scrape_{name}.prom"), self.to_prometheus())
+        if batch.METRICS_PUSHGATEWAY_URL:
+            self._push(batch.METRICS_PUSHGATEWAY_URL)
+
+    @staticmethod
+    def _write_atomic(path: str, content: str) -> None:
+        # textfile collector가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 rename
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning(f"[metrics] 파일 기록 실패 ({path}): {e}")
+
+    def _push(self, gateway_url: str) -> None:
+        from . import http_client
+
+        def segment(label: str, value: str) -> str:
+            # 한글/슬래시가 들어간 라벨 값은 pushgateway의 base64 표기 사용
+            encoded = base64.urlsafe_b64encode(value.encode("utf-8")).decode() or "="
+            return f"{label}@base64/{encoded}"
+
+        url = (
+            f"{gateway_url.rstrip('/')}/metrics/job/scraper/"
+            f"{segment('scraper', self.scraper)}/{segment('keyword', self.keyword)}"
+        )
+        try:
+            resp = http_client.request("PUT", url, data=self.to_prometheus().encode("utf-8"), timeout=5)
+            resp.raise_for_status()
+        except Exception as e:
+            log.warning(f"[metrics] pushgateway 전송 실패: {e}")
+
+
+def current() -> Optional[RunMetrics]:
+    return _current.get()
+
+
+def activate(metrics: Optional[RunMetrics]) -> contextvars.Token:
+    return _current.set(metrics)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def incr(name: str, n: float = 1, **labels) -> None:
+    m = _current.get()
+    if m is not None:
+        m.incr(name, n, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    m = _current.get()
+    if m is not None:
+        m.observe(name, value, **labels)
+
+
+@contextmanager
+def stage(name: str):
+    """with stage("enrich"): ... — 단계 소요 시간을 누적합니다 (스트리밍 모드에서는 단계가 겹쳐 실행됨)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        m = _current.get()
+        if m is not None:
+            m.add_stage_time(name, time.perf_counter() - started)
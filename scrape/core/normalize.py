@@ -0,0 +1,136 @@
+# core/normalize.py
+"""
+local_search_cache / geocode_cache 조회용 정규화 키.
+
+같은 업체/주소가 표기만 조금 달라 캐시를 놓치는 경우를 줄입니다.
+- 공통: 유니코드 NFKC(전각 → 반각), 대시 통일, 공백 정리, 소문자
+- 제목: 앞에 붙은 캠페인 말머리 [재방문] (이벤트) 【체험단】 제거.
+        [강남] (홍대점)처럼 지역/지점을 담은 말머리는 Local 검색어에 그대로 들어가므로 키에 남김
+        (지우면 [강남] 맛집과 [홍대] 맛집이 같은 키로 모여 서로의 주소/좌표를 받게 됨)
+- 주소: 시/도 약칭 통일(서울특별시 → 서울), 괄호 안 참고항목(역삼동) 제거,
+        쉼표 뒤 상세주소와 층/호수(3층, B1, 101호 …) 제거
+
+키는 조회 전용이며 캐시 행의 title/address 컬럼에는 원문을 저장합니다.
+CACHE_KEY_MODE=canonical로 바꾸기 전에 tools/rekey_cache.py로 기존 행을 새 키로 복사해야 합니다.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+_DASHES = str.maketrans({c: "-" for c in "‐‑‒–—―−ｰ"})
+_SPACES = re.compile(r"\s+")
+
+# 제목 앞 말머리: [강남] (이벤트) <체험단> 【모집】 〔광고〕 — 그룹 1~5가 괄호 안 내용
+_TITLE_PREFIX = re.compile(r"^\s*(?:\[([^\]]*)\]|\(([^)]*)\)|<([^>]*)>|【([^】]*)】|〔([^〕]*)〕)\s*")
+
+# 키에서 지워도 되는 캠페인 말머리 단어 (지역/지점이 아닌 것). 말머리 내용이 이 단어들로만 이루어져야 지움
+_CAMPAIGN_TAG_WORDS = (
+    "재방문", "재모집", "추가모집", "모집", "체험단", "기자단", "서포터즈", "이벤트", "광고", "협찬",
+    "방문형", "배송형", "구매평", "방문", "배송", "포장", "리뷰", "블로그", "블로거", "인스타", "인스타그램",
+    "유튜브", "릴스", "클립", "틱톡", "쇼츠", "원고료", "포인트", "제공", "마감임박", "긴급", "당일",
+    "신규", "오픈", "그랜드오픈", "선착순", "hot", "new", "best", "pr", "ad",
+)
+_CAMPAIGN_TAG = re.compile(
+    r"^(?:(?:%s|\d+명|d-\d+)[\s·,+/&]*)+$" % "|".join(sorted(_CAMPAIGN_TAG_WORDS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+# (제목 a, 제목 b, 같은 키여야 하는지) — 키 규칙을 바꿀 때 tools/rekey_cache.py·cache_key_report.py가 확인
+TITLE_KEY_CASES = (
+    ("[재방문] 강남 맛집", "강남 맛집", True),
+    ("【체험단 모집】 강남 맛집", "(이벤트) 강남 맛집", True),
+    ("[블로그/인스타] 카페", "카페", True),
+    ("[강남] 맛집", "[홍대] 맛집", False),
+    ("[강남] 맛집", "맛집", False),
+    ("(홍대점) 카페", "(강남점) 카페", False),
+    ("[재방문][강남] 맛집", "[홍대] 맛집", False),
+    ("[재방문][강남] 맛집", "[강남] 맛집", True),
+)
+
+SIDO_ALIASES = {
+    "서울특별시": "서울", "서울시": "서울",
+    "부산광역시": "부산", "부산시": "부산",
+    "대구광역시": "대구", "대구시": "대구",
+    "인천광역시": "인천", "인천시": "인천",
+    "광주광역시": "광주",
+    "대전광역시": "대전", "대전시": "대전",
+    "울산광역시": "울산", "울산시": "울산",
+    "세종특별자치시": "세종", "세종시": "세종",
+    "경기도": "경기",
+    "강원특별자치도": "강원", "강원도": "강원",
+    "충청북도": "충북",
+    "충청남도": "충남",
+    "전북특별자치도": "전북", "전라북도": "전북",
+    "전라남도": "전남",
+    "경상북도": "경북",
+    "경상남도": "경남",
+    "제주특별자치도": "제주", "제주도": "제주",
+}
+
+_PARENS = re.compile(r"\([^)]*\)")
+# 층/호수 등 상세주소가 시작되는 토큰 (이 토큰부터 끝까지 제거)
+_DETAIL_TOKEN = re.compile(
+    r"^(?:지하\d*층?|b\d+(?:층|f)?|\d+(?:층|f)|\d+(?:-\d+)?호|\d+동|\d+~\d+층|상가|일부|전체)$",
+    re.IGNORECASE,
+)
+
+
+def normalize_text(value: str) -> str:
+    """NFKC + 대시 통일 + 공백 정리 + 소문자"""
+    value = unicodedata.normalize("NFKC", value or "").translate(_DASHES)
+    return _SPACES.sub(" ", value).strip().lower()
+
+
+def _split_title_prefixes(title: str):
+    """제목 → ([(말머리 원문, 괄호 안 내용)], 나머지). 말머리뿐인 제목은 나누지 않음"""
+    rest = unicodedata.normalize("NFKC", title or "").translate(_DASHES)
+    prefixes = []
+    while True:
+        m = _TITLE_PREFIX.match(rest)
+        if not m or m.end() == len(rest):
+            break
+        prefixes.append((m.group(0).strip(), next(g for g in m.groups() if g is not None)))
+        rest = rest[m.end():]
+    return prefixes, rest
+
+
+def is_campaign_tag(content: str) -> bool:
+    """말머리 내용이 지역/지점이 아닌 캠페인 태그(재방문, 체험단 모집 …)인지"""
+    return bool(_CAMPAIGN_TAG.match(normalize_text(content)))
+
+
+@lru_cache(maxsize=65536)
+def canonical_title(title: str) -> str:
+    """local_search_cache 키로 쓸 제목 (캠페인 말머리만 지우고 지역/지점 말머리는 유지)"""
+    prefixes, rest = _split_title_prefixes(title)
+    kept = [raw for raw, content in prefixes if not is_campaign_tag(content)]
+    return normalize_text(" ".join(kept + [rest]))
+
+
+def title_region_tags(title: str) -> tuple:
+    """제목 앞 말머리 중 캠페인 태그가 아닌 것(지역/지점)의 정규화된 내용"""
+    prefixes, _ = _split_title_prefixes(title)
+    return tuple(normalize_text(content) for _, content in prefixes if not is_campaign_tag(content))
+
+
+def failed_title_cases() -> list:
+    """TITLE_KEY_CASES 중 canonical_title 결과가 기대와 다른 항목"""
+    return [
+        (a, b, same) for a, b, same in TITLE_KEY_CASES
+        if (canonical_title(a) == canonical_title(b)) != same
+    ]
+
+
+@lru_cache(maxsize=65536)
+def canonical_address(address: str) -> str:
+    """geocode_cache 키로 쓸 주소"""
+    text = normalize_text(address)
+    text = _PARENS.sub(" ", text.split(",", 1)[0])
+    tokens = text.split()
+    if tokens:
+        tokens[0] = SIDO_ALIASES.get(tokens[0], tokens[0])
+    for i, token in enumerate(tokens):
+        if i and _DETAIL_TOKEN.match(token):
+            tokens = tokens[:i]
+            break
+    return " ".join(tokens)
@@ -0,0 +1,219 @@
+# core/write_buffer.py
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .logger import get_logger
+
+log = get_logger("write_buffer")
+
+
+class CacheWriteBuffer:
+    """
+    local_search_cache / geocode_cache 쓰기를 모아 두었다가 한 번에 upsert 하는 write-behind 버퍼.
+    - 같은 키(local_key(title)/geocode_key(address))에 여러 번 쓰면 마지막 값만 남깁니다.
+      title/address 컬럼에는 마지막으로 쓴 원문을 저장합니다.
+    - 대기 건수가 max_pending 이상이거나 마지막 flush 후 flush_interval 초가 지나면 put 시점에 flush 합니다.
+    - run 종료 시 flush()를 호출해 남은 쓰기를 반영해야 합니다.
+    여러 스레드에서 동시에 사용할 수 있습니다.
+    """
+
+    LOCAL_UPSERT = text("""
+        INSERT INTO local_search_cache (title_hash, title, address, lat, lng, category, updated_at)
+        SELECT t.key_hash, t.title, t.address, t.lat, t.lng, t.category, NOW()
+        FROM unnest(
+            CAST(:hashes AS bytea[]), CAST(:titles AS text[]), CAST(:addresses AS text[]),
+            CAST(:lats AS double precision[]), CAST(:lngs AS double precision[]), CAST(:categories AS text[])
+        ) AS t(key_hash, title, address, lat, lng, category)
+        ON CONFLICT (title_hash) DO UPDATE
+        SET address = EXCLUDED.address,
+            lat = EXCLUDED.lat,
+            lng = EXCLUDED.lng,
+            category = EXCLUDED.category,
+            updated_at = NOW()
+    """)
+
+    NEGATIVE_UPSERT = text("""
+        INSERT INTO scrape_negative_cache (cache, key_hash, key_text, updated_at)
+        SELECT t.cache, t.key_hash, t.key_text, NOW()
+        FROM unnest(CAST(:caches AS text[]), CAST(:hashes AS bytea[]), CAST(:texts AS text[]))
+            AS t(cache, key_hash, key_text)
+        ON CONFLICT (cache, key_hash) DO UPDATE
+        SET key_text = EXCLUDED.key_text,
+            empty_count = scrape_negative_cache.empty_count + 1,
+            updated_at = NOW()
+    """)
+
+    GEOCODE_UPSERT = text("""
+        INSERT INTO geocode_cache (address_hash, address, lat, lng, updated_at)
+        SELECT t.key_hash, t.address, t.lat, t.lng, NOW()
+        FROM unnest(
+            CAST(:hashes AS bytea[]), CAST(:addresses AS text[]),
+            CAST(:lats AS double precision[]), CAST(:lngs AS double precision[])
+        ) AS t(key_hash, address, lat, lng)
+        ON CONFLICT (address_hash) DO UPDATE
+        SET address = EXCLUDED.address,
+            lat = EXCLUDED.lat,
+            lng = EXCLUDED.lng,
+            updated_at = NOW()
+    """)
+
+    def __init__(
+        self,
+        engine: Engine,
+        key_hash: Callable[[str], bytes],
+        local_key: Callable[[str], str] = str.strip,
+        geocode_key: Callable[[str], str] = str.strip,
+        max_pending: int = 500,
+        flush_interval: float = 5.0,
+    ):
+        self.engine = engine
+        self.key_hash = key_hash
+        self.local_key = local_key
+        self.geocode_key = geocode_key
+        self.max_pending = max(1, int(max_pending))
+        self.flush_interval = float(flush_interval)
+
+        self._local: Dict[str, Dict[str, Any]] = {}
+        self._geocode: Dict[str, Tuple[Any, Any]] = {}
+        self._texts: Dict[Tuple[str, str], str] = {}  # (종류, 키) → 저장할 원문
+        self._negative: Dict[Tuple[str, str], str] = {}  # ("local"|"geocode", 키) → 원문 (결과 없음)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        self.puts = 0      # put 호출 수
+        self.written = 0   # 실제 DB에 반영된 행 수 (중복 제거 후)
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._local) + len(self._geocode) + len(self._negative)
+
+    def put_local(self, title: str, address: Optional[str], lat, lng, category=None) -> Dict[str, Any]:
+        """쓰기를 버퍼에 넣고, 캐시 조회 결과와 같은 형태의 행을 반환합니다."""
+        entry = {"address": address, "lat": lat, "lng": lng, "category": category, "updated_at": datetime.now()}
+        key = self.local_key(title)
+        with self._lock:
+            self._local[key] = entry
+            self._texts["local", key] = title.strip()
+            self.puts += 1
+        self._maybe_flush()
+        return entry
+
+    def put_geocode(self, address: str, lat, lng) -> None:
+        key = self.geocode_key(address)
+        with self._lock:
+            self._geocode[key] = (lat, lng)
+            self._texts["geocode", key] = address.strip()
+            self.puts += 1
+        self._maybe_flush()
+
+    def put_negative(self, cache: str, value: str) -> None:
+        """API 결과가 없었던 title("local")/address("geocode")를 negative 캐시에 씁니다."""
+        key = self.local_key(value) if cache == "local" else self.geocode_key(value)
+        with self._lock:
+            self._negative[cache, key] = value.strip()
+            self.puts += 1
+        self._maybe_flush()
+
+    def get_local(self, title: str) -> Optional[Dict[str, Any]]:
+        """아직 flush 되지 않은 local 캐시 쓰기 (read-your-writes)"""
+        with self._lock:
+            return self._local.get(self.local_key(title))
+
+    def get_geocode(self, address: str) -> Optional[Tuple[Any, Any]]:
+        """아직 flush 되지 않은 geocode 캐시 쓰기 (read-your-writes)"""
+        with self._lock:
+            return self._geocode.get(self.geocode_key(address))
+
+    def _maybe_flush(self) -> None:
+        with self._lock:
+            pending = len(self._local) + len(self._geocode) + len(self._negative)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if pending >= self.max_pending or (pending and due):
+            self.flush()
+
+    @staticmethod
+    def _opt_float(v):
+        return None if v is None else float(v)
+
+    def flush(self) -> int:
+        """대기 중인 쓰기를 multi-row upsert로 반영하고, 반영한 행 수를 반환합니다."""
+        with self._flush_lock:
+            with self._lock:
+                local, self._local = self._local, {}
+                geocode, self._geocode = self._geocode, {}
+                texts, self._texts = self._texts, {}
+                negative, self._negative = self._negative, {}
+                self._last_flush = time.monotonic()
+            if not local and not geocode and not negative:
+                return 0
+            # negative 캐시는 별도 테이블/트랜잭션 (마이그레이션 전이라 실패해도 캐시 쓰기에 영향 없도록)
+            negative_written = self._flush_negative(negative) if negative else 0
+            if not local and not geocode:
+                return negative_written
+
+            try:
+                with self.engine.begin() as conn:
+                    if local:
+                        titles = list(local)
+                        conn.execute(self.LOCAL_UPSERT, {
+                            "hashes": [self.key_hash(t) for t in titles],
+                            "titles": [texts.get(("local", t), t) for t in titles],
+                            "addresses": [local[t]["address"] for t in titles],
+                            "lats": [self._opt_float(local[t]["lat"]) for t in titles],
+                            "lngs": [self._opt_float(local[t]["lng"]) for t in titles],
+                            "categories": [
+                                None if local[t]["category"] is None else str(local[t]["category"])
+                                for t in titles
+                            ],
+                        })
+                    if geocode:
+                        addresses = list(geocode)
+                        conn.execute(self.GEOCODE_UPSERT, {
+                            "hashes": [self.key_hash(a) for a in addresses],
+                            "addresses": [texts.get(("geocode", a), a) for a in addresses],
+                            "lats": [self._opt_float(geocode[a][0]) for a in addresses],
+                            "lngs": [self._opt_float(geocode[a][1]) for a in addresses],
+                        })
+            except Exception as e:
+                # 실패한 쓰기는 버리지 않고 되돌려 놓되, 그 사이 들어온 최신 값은 덮어쓰지 않습니다.
+                with self._lock:
+                    for k, v in local.items():
+                        self._local.setdefault(k, v)
+                    for k, v in geocode.items():
+                        self._geocode.setdefault(k, v)
+                    for k, v in texts.items():
+                        self._texts.setdefault(k, v)
+                log.error(f"캐시 flush 실패 (local {len(local)}, geocode {len(geocode)}): {e}", exc_info=True)
+                return 0
+
+            n = len(local) + len(geocode)
+            self.written += n
+            self.flushes += 1
+            log.info(
+                f"캐시 flush → local {len(local)}건, geocode {len(geocode)}건, negative {negative_written}건 "
+                f"(누적 put {self.puts}, 반영 {self.written})"
+            )
+            return n + negative_written
+
+    def _flush_negative(self, negative: Dict[Tuple[str, str], str]) -> int:
+        items = list(negative.items())
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.NEGATIVE_UPSERT, {
+                    "caches": [cache for (cache, _), _ in items],
+                    "hashes": [self.key_hash(key) for (_, key), _ in items],
+                    "texts": [value for _, value in items],
+                })
+        except Exception as e:
+            # 결과 없음 기록은 다음 run에서 다시 조회하면 되므로 되돌려 놓지 않음
+            log.warning(f"negative 캐시 flush 실패 ({len(items)}건): {e}")
+            return 0
+        self.written += len(items)
+        return len(items)
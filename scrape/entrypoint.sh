@@ -18,6 +18,7 @@ echo "==== Entrypoint ===="
 echo "SCRAPER_NAME: '$SCRAPER_NAME'"
 echo "SCRAPE_KEYWORDS: '$KEYWORDS_STR'"
 echo "JOB_COMPLETION_INDEX: '${POD_INDEX}'"
+echo "SCRAPE_MULTI_KEYWORD: '${SCRAPE_MULTI_KEYWORD:-false}'"
 
 # 키워드가 비어있으면 --keyword 없이 전체 실행
 if [ -z "$KEYWORDS_STR" ]; then
@@ -25,6 +26,18 @@ if [ -z "$KEYWORDS_STR" ]; then
   exec python main.py "$SCRAPER_NAME"
 fi
 
+# 멀티 키워드 모드: 한 프로세스에서 여러 키워드 처리 (콜드 스타트/엔진/캐시 공유)
+# - KEYWORD_SHARDS가 있으면 Indexed Job 파드마다 키워드 목록을 INDEX/SHARDS로 나눠 처리
+if [ "${SCRAPE_MULTI_KEYWORD:-false}" = "true" ]; then
+  if [ -n "${KEYWORD_SHARDS:-}" ]; then
+    SHARD="${POD_INDEX:-0}/${KEYWORD_SHARDS}"
+    echo "멀티 키워드 모드 (shard: $SHARD, workers: ${KEYWORD_WORKERS:-1})"
+    exec python main.py "$SCRAPER_NAME" --keywords "$KEYWORDS_STR" --shard "$SHARD"
+  fi
+  echo "멀티 키워드 모드 (workers: ${KEYWORD_WORKERS:-1})"
+  exec python main.py "$SCRAPER_NAME" --keywords "$KEYWORDS_STR"
+fi
+
 # 병렬 인덱스가 없으면(=비병렬) 첫 번째 키워드 사용
 if [ -z "$POD_INDEX" ]; then
   echo "JOB_COMPLETION_INDEX가 없습니다(비병렬 모드로 판단). 첫 번째 키워드 사용."
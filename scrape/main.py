@@ -2,49 +2,35 @@ import sys
 import os
 import time
 import argparse
-import importlib
-from inspect import isclass
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from core.config import settings
 from core.logger import get_logger
-from core.base import BaseScraper
+from core import http_client
+from core.db import pool_stats
+from scrapers import load_scraper_class
 
 log = get_logger("main")
 
 
-def find_scraper_class(scraper_name: str) -> type[BaseScraper]:
+def find_scraper_class(scraper_name: str) -> type:
     """
-    scrapers 폴더에서 이름에 맞는 스크레이퍼 클래스를 동적으로 찾아서 반환
+    scrapers 레지스트리에서 이름에 맞는 스크레이퍼 클래스를 찾아서 반환
+    (해당 스크레이퍼 모듈만 import 합니다)
     """
     try:
-        module_name = f"scrapers.{scraper_name}"
-
-        module = importlib.import_module(module_name)
-
-        for attribute_name in dir(module):
-            attribute = getattr(module, attribute_name)
-            if (
-                isclass(attribute)
-                and issubclass(attribute, BaseScraper)
-                and attribute is not BaseScraper
-            ):
-                log.info(f"'{attribute.__name__}' 클래스를 찾았습니다.")
-                return attribute
-
-        raise TypeError(
-            f"'{module_name}' 모듈에서 스크레이퍼 클래스를 찾지 못했습니다."
-        )
-
-    except ImportError:
-        log.error(
-            f"'{module_name}' 모듈을 찾을 수 없습니다. scrapers 폴더에 '{scraper_name}.py' 파일이 있는지 확인하세요."
-        )
+        scraper_class = load_scraper_class(scraper_name)
+    except KeyError as e:
+        log.error(e.args[0])
         sys.exit(1)
-    except TypeError as e:
-        log.error(e)
+    except ImportError as e:
+        log.error(f"'{scraper_name}' 스크레이퍼 모듈을 불러오지 못했습니다: {e}")
         sys.exit(1)
 
+    log.info(f"'{scraper_class.__name__}' 클래스를 찾았습니다.")
+    return scraper_class
+
 
 def run_job(scraper_name: str, keyword: Optional[str] = None):
     """
@@ -56,16 +42,91 @@ def run_job(scraper_name: str, keyword: Optional[str] = None):
     try:
         ScraperClass = find_scraper_class(scraper_name)
         scraper_instance = ScraperClass()
-        scraper_instance.run(keyword=keyword)  # run 메서드에 keyword를 전달합니다.
+        status = scraper_instance.run(keyword=keyword)  # run 메서드에 keyword를 전달합니다.
+        if status != "success":
+            log.error("작업 실패: %s (단계 에러 또는 저장 실패 행, 로그 참고)", scraper_name)
+            sys.exit(1)
         log.info("작업 성공: %s", scraper_name)
     except Exception as e:
         log.error("'%s' 실행 중 심각한 에러: %s", scraper_name, e, exc_info=True)
         sys.exit(1)
     finally:
+        log.info("DB 풀 통계: %s", pool_stats())
+        log.info("HTTP 통계: %s", http_client.stats())
         log.info("========== 작업 종료: %s (키워드: %s) ==========", scraper_name, keyword or "전체")
 
 
 
+def parse_keywords(raw: Optional[str]) -> List[str]:
+    """쉼표로 구분된 키워드 문자열 → 공백 제거, 중복 제거된 리스트"""
+    if not raw:
+        return []
+    return list(dict.fromkeys(k.strip() for k in raw.split(",") if k.strip()))
+
+
+def select_shard(keywords: List[str], shard: Optional[str]) -> List[str]:
+    """
+    "INDEX/COUNT" 형식의 shard 지정에 따라 키워드를 나눕니다. (예: 0/3 → 0, 3, 6번째 키워드)
+    여러 파드가 같은 키워드 목록을 나눠 처리할 때 사용합니다.
+    """
+    if not shard:
+        return keywords
+    index, count = (int(x) for x in shard.split("/"))
+    if not 0 <= index < count:
+        raise ValueError(f"잘못된 shard 지정: {shard}")
+    return keywords[index::count]
+
+
+def run_jobs(scraper_name: str, keywords: List[str], workers: int = 1):
+    """
+    여러 키워드를 한 프로세스에서 처리합니다.
+    스크레이퍼 인스턴스 하나(엔진/커넥션 풀, 검색 키 스케줄러, 캐시 버퍼, 카테고리 인덱스)를
+    모든 워커 스레드가 공유하므로 키워드마다 콜드 스타트 비용을 내지 않습니다.
+    """
+    workers = max(1, min(workers, len(keywords)))
+    log.info(
+        f"========== 작업 시작: {scraper_name} (키워드 {len(keywords)}개, 워커 {workers}) =========="
+    )
+    ScraperClass = find_scraper_class(scraper_name)
+    scraper_instance = ScraperClass()
+
+    failed = []
+
+    def _run_one(keyword: str):
+        started = time.monotonic()
+        try:
+            status = scraper_instance.run(keyword=keyword)
+            if status != "success":
+                log.error("키워드 실패: %s (%.1fs, 단계 에러 또는 저장 실패 행)", keyword, time.monotonic() - started)
+                failed.append(keyword)
+                return
+            log.info("키워드 완료: %s (%.1fs)", keyword, time.monotonic() - started)
+        except Exception as e:
+            log.error("키워드 '%s' 실행 중 에러: %s", keyword, e, exc_info=True)
+            failed.append(keyword)
+
+    try:
+        if workers == 1:
+            for keyword in keywords:
+                _run_one(keyword)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="keyword") as pool:
+                list(pool.map(_run_one, keywords))
+    finally:
+        scraper_instance.flush_writes()
+        log.info("캐시 tier 통계: %s", scraper_instance.cache_tier_stats())
+        log.info("DB 풀 통계: %s", pool_stats())
+        log.info("HTTP 통계: %s", http_client.stats())
+        log.info(
+            "========== 작업 종료: %s (성공 %d, 실패 %d) ==========",
+            scraper_name, len(keywords) - len(failed), len(failed),
+        )
+
+    if failed:
+        log.error("실패한 키워드: %s", ", ".join(failed))
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="웹 스크레이퍼 실행기")
     parser.add_argument("scraper_name", help="실행할 스크레이퍼의 이름 (예: mymilky).")
@@ -74,8 +135,46 @@ if __name__ == "__main__":
         type=str,
         help="검색할 특정 키워드. 지정하지 않으면 전체를 대상으로 합니다.",
     )
-    
+    parser.add_argument(
+        "--keywords",
+        type=str,
+        help="쉼표로 구분된 키워드 목록. 한 프로세스에서 모두 처리합니다. "
+             "--keyword/--keywords 모두 없으면 SCRAPE_KEYWORDS 환경변수를 사용합니다.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.batch.KEYWORD_WORKERS,
+        help="여러 키워드를 동시에 처리할 워커 수 (기본: KEYWORD_WORKERS).",
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        help="키워드 목록 중 이 프로세스가 맡을 몫 (INDEX/COUNT, 예: 0/4).",
+    )
+
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="스크레이퍼 콜드 스타트 import 비용을 패키지별로 출력하고 종료합니다. "
+             "IMPORT_BUDGET_MS를 넘으면 종료 코드 1.",
+    )
+
     args = parser.parse_args()
 
-    # 터미널에서 받은 인자를 바탕으로 작업을 실행
-    run_job(args.scraper_name, keyword=args.keyword)
+    if args.import_profile:
+        from core.import_profile import report
+
+        sys.exit(0 if report(args.scraper_name, settings.batch.IMPORT_BUDGET_MS) else 1)
+
+    if args.keyword:
+        # 터미널에서 받은 인자를 바탕으로 작업을 실행
+        run_job(args.scraper_name, keyword=args.keyword)
+    else:
+        keywords = select_shard(
+            parse_keywords(args.keywords or os.getenv("SCRAPE_KEYWORDS", "")), args.shard
+        )
+        if keywords:
+            run_jobs(args.scraper_name, keywords, workers=args.workers)
+        else:
+            run_job(args.scraper_name)
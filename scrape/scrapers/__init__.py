@@ -0,0 +1,28 @@
+"""
+스크레이퍼 레지스트리.
+
+이름 → "모듈:클래스" 경로만 선언해 두고, 실제 import는 load_scraper_class()가 호출될 때
+해당 스크레이퍼 모듈 하나만 수행합니다. 새 스크레이퍼를 추가하면 여기에 등록하세요.
+"""
+import importlib
+from typing import Dict, List
+
+SCRAPER_REGISTRY: Dict[str, str] = {
+    "inflexer": "scrapers.inflexer:InflexerScraper",
+}
+
+
+def available_scrapers() -> List[str]:
+    return sorted(SCRAPER_REGISTRY)
+
+
+def load_scraper_class(name: str) -> type:
+    """등록된 이름의 스크레이퍼 클래스를 import 해서 반환합니다 (미등록 → KeyError)."""
+    try:
+        target = SCRAPER_REGISTRY[name]
+    except KeyError:
+        raise KeyError(
+            f"등록되지 않은 스크레이퍼: '{name}' (사용 가능: {', '.join(available_scrapers())})"
+        ) from None
+    module_name, _, class_name = target.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
@@ -1,20 +1,23 @@
+from __future__ import annotations
+
+import hashlib
 import os
-import requests
-import pandas as pd
+from datetime import datetime
+from core import http_client, metrics
 from core.base import BaseScraper, DRIFT_METERS
+from core.config import settings
 from core.logger import get_logger
 import time
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, TYPE_CHECKING
 
-from sqlalchemy import create_engine
+from core.fastparse import clean_text, parse_datetime, empty_record, dedupe
+from core.enricher import NOT_FOUND, SingleFlight, clean_local_query, naver_local_search, naver_geocode
 
-from core.enricher import (
-    naver_local_search,
-    naver_geocode,
-    get_or_create_raw_category,
-    find_mapped_category_id,
-)
+# pandas/numpy는 import 비용이 커서 실제로 쓰는 단계에서 import 합니다 (PARSE_ENGINE=dict면 parse까지 불필요)
+if TYPE_CHECKING:
+    import pandas as pd
+    from core.checkpoint import EnrichCheckpoint
 
 logger = get_logger(__name__)
 
@@ -41,31 +44,56 @@ TYPE_MAP = {
     "서울오빠_기타": "구매평"
 }
 
+class _EnrichRun:
+    """enrich 한 번(run) 동안 행 처리에 공유되는 준비물"""
+
+    def __init__(self, local_search, geocode, pace, local_map, geocode_map, negative_local=None, negative_geocode=None):
+        self.local_search = local_search  # title → place | NOT_FOUND | None
+        self.geocode = geocode            # address → (lat, lng) | NOT_FOUND | None
+        self.pace = pace                  # 외부 API 호출 후 페이싱
+        self.local_map = local_map        # 일괄 조회한 local_search_cache
+        self.geocode_map = geocode_map    # 일괄 조회한 geocode_cache
+        self.negative_local = negative_local      # 결과 없음으로 확인된 title 키 (None이면 사용 안 함)
+        self.negative_geocode = negative_geocode  # 결과 없음으로 확인된 address 키
+
+
 class InflexerScraper(BaseScraper):
-    BASE_URL = "https://inflexer.net:5000/search"
+    BASE_URL = f"{settings.inflexer.BASE_URL}/search"
     PLATFORM_NAME = "inflexer"
 
-    def run(self, keyword = None):
+    def run_batch(self, keyword = None):
         logger.info(f"[인플렉서] 캠페인 수집 시작 — keyword={keyword}")
-        df = self.scrape(keyword)
-        df = self.parse(df)
-        df = self.enrich(df, keyword)
-        self.save(df)
+        with metrics.stage("scrape"):
+            df = self.scrape(keyword)
+        with metrics.stage("parse"):
+            df = self.parse(df)
+        with metrics.stage("enrich"):
+            df = self.enrich(df, keyword)
+        with metrics.stage("save"):
+            result = self.save(df)
+        if result and not result["failed"]:
+            self.clear_checkpoint(keyword)
 
     def scrape(self, keyword: str) -> pd.DataFrame:
         # API 호출
         params = {"query": keyword}
         logger.info(f"query: {params}")
         logger.info(f"BASE_URL: {self.BASE_URL}")
-        resp = requests.get(self.BASE_URL, params=params, timeout=30)
+        resp = http_client.get(self.BASE_URL, params=params, timeout=30)
         resp.raise_for_status()
         data = resp.json()
 
         if not data.get("is_valid"):
             logger.warning(f"API 응답 비정상: {data}")
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(data.get("result", []))
+            items = []
+        else:
+            items = data.get("result", [])
+
+        if self.settings.batch.PARSE_ENGINE == "dict":
+            return [{**item, "region": keyword, "search_text": keyword} for item in items]
+
+        import pandas as pd
+        df = pd.DataFrame(items)
 
         if df.empty:
             return df
@@ -75,7 +103,14 @@ class InflexerScraper(BaseScraper):
 
         return df
     
-    def parse(self, df: pd.DataFrame) -> pd.DataFrame:
+    def parse(self, df):
+        if self.settings.batch.PARSE_ENGINE == "dict":
+            records = df.to_dict("records") if hasattr(df, "to_dict") else df
+            return self._parse_records(records)
+
+        import pandas as pd
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame(df)
         if df.empty:
             return df
         
@@ -134,31 +169,91 @@ class InflexerScraper(BaseScraper):
         
         return result.to_dict("records")
     
-    def enrich(self, parsed_data: List[Dict[str, Any]], keyword: str = None) -> List[Dict[str, Any]]:
-        """
-        Inflexer: map API lat/lng → 조건부 보강 + 캐시 사용.
-        """
-        if not parsed_data:
+    def _parse_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """parse의 pandas-free 버전 (PARSE_ENGINE=dict). 결과 행은 pandas 엔진과 같은 키/값을 가집니다."""
+        if not records:
             return []
 
-        # --- 0) 기존 DB 스냅샷
-        existing = self._load_existing_map()
+        logger.info(f"sourceName >>> {self.PLATFORM_NAME}")
+        columns = list(self.BASE_DATA_TYPES)
+        source = clean_text(self.PLATFORM_NAME)
+        out = []
+        for item in records:
+            row = empty_record(columns)
+            row["source"] = source
+            row["platform"] = clean_text(item.get("domain"))
+            row["title"] = row["company"] = clean_text(item.get("title"))
+            row["offer"] = clean_text(item.get("offer"))
+            row["content_link"] = row["company_link"] = clean_text(item.get("url"))
+            row["campaign_channel"] = MEDIA_MAP.get(str(item.get("media")).strip(), "etc")
+            row["campaign_type"] = TYPE_MAP.get(str(item.get("type")).strip(), "etc")
+            row["apply_deadline"] = parse_datetime(item.get("apl_due_dt"))
+            row["review_deadline"] = parse_datetime(item.get("pub_due_dt"))
+            row["apply_from"] = parse_datetime(item.get("apl_stt_dt"))
+            row["region"] = clean_text(item.get("region"))
+            row["search_text"] = clean_text(item.get("search_text"))
+            out.append(row)
+
+        return dedupe(out, self.CONFLICT_COLUMNS)
+
+    def prepare_enrich(self, keyword: str = None) -> Dict[str, Any]:
+        return {
+            "map_df": self._fetch_map_df(keyword),
+            "flights": self._new_flights(),
+            # 체크포인트는 run 시작 때 한 번만 읽고 청크마다 조회만 함
+            "checkpoint": self.get_checkpoint(keyword),
+        }
+
+    def enrich_chunk(self, chunk, keyword, state):
+        return self.enrich(
+            chunk, keyword, map_df=state["map_df"], flights=state["flights"], checkpoint=state["checkpoint"]
+        )
+
+    def _new_flights(self):
+        """run 단위 single-flight (ENRICH_COALESCE=false면 None)"""
+        if not self.settings.batch.ENRICH_COALESCE:
+            return None
+        return {"local": SingleFlight("local_search"), "geocode": SingleFlight("geocode")}
+
+    def _fetch_map_df(self, keyword: str) -> pd.DataFrame:
+        """Inflexer map API에서 title별 좌표를 가져옵니다. 실패/빈 결과면 빈 (title, lat, lng) 프레임."""
+        import pandas as pd
 
-        # --- 1) Inflexer map API
-        request_url = "https://inflexer.net:5000/map"
+        request_url = f"{self.settings.inflexer.BASE_URL}/map"
         params = {"query": keyword, "type": "VST"}
         try:
-            resp = requests.get(request_url, params=params, timeout=20)
+            resp = http_client.get(request_url, params=params, timeout=20)
             resp.raise_for_status()
             map_df = pd.DataFrame(resp.json().get("result", []))
         except Exception as e:
             self.logger.warning(f"[inflexer] map API 실패: {e}")
             map_df = pd.DataFrame()
 
-        if not map_df.empty:
-            map_df = map_df.rename(columns={"latitude": "lat", "longitude": "lng", "title": "title"})[
-                ["title", "lat", "lng"]
-            ]
+        if map_df.empty:
+            # merge(on="title")가 실패하지 않도록 컬럼은 유지
+            return pd.DataFrame(columns=["title", "lat", "lng"])
+        return map_df.rename(columns={"latitude": "lat", "longitude": "lng", "title": "title"})[
+            ["title", "lat", "lng"]
+        ]
+
+    def enrich(self, parsed_data: List[Dict[str, Any]], keyword: str = None, map_df: pd.DataFrame = None,
+               flights: Dict[str, SingleFlight] = None, checkpoint: EnrichCheckpoint = None) -> List[Dict[str, Any]]:
+        """
+        Inflexer: map API lat/lng → 조건부 보강 + 캐시 사용.
+        flights를 넘기지 않으면 이번 호출 안에서만 같은 검색어/주소 호출을 합칩니다.
+        checkpoint를 넘기지 않으면 키워드의 체크포인트를 새로 읽습니다.
+        """
+        import pandas as pd
+
+        if not parsed_data:
+            return []
+
+        # --- 0) 기존 DB 스냅샷 (이번 배치의 충돌 키만)
+        existing = self._load_existing_map(keys=[self._conflict_key(r) for r in parsed_data])
+
+        # --- 1) Inflexer map API (스트리밍 모드에서는 키워드당 한 번만 호출해 전달됨)
+        if map_df is None:
+            map_df = self._fetch_map_df(keyword)
 
         merged = pd.DataFrame(parsed_data).merge(map_df, on="title", how="left", suffixes=("", "_map"))
         for c in ("address", "lat", "lng", "category_id"):
@@ -166,117 +261,363 @@ class InflexerScraper(BaseScraper):
                 merged[c] = None
 
         # --- 2) 준비물
-        engine = create_engine(self.settings.db.url)
-        search_api_keys = self.get_api_keys()
+        search_api_keys = self.key_scheduler
         map_id = self.settings.naver_api.MAP_CLIENT_ID
         map_secret = self.settings.naver_api.MAP_CLIENT_SECRET
 
-        # --- 3) 루프
-        processed = geocoded = from_mapxy = drift_fixed = 0
+        batch = self.settings.batch
+        use_async = batch.ENRICH_MODE == "async"
+        if use_async:
+            from core.async_enrich import EndpointLimiter, run_concurrently
+            limiter = EndpointLimiter({
+                "local": batch.LOCAL_SEARCH_CONCURRENCY,
+                "geocode": batch.GEOCODE_CONCURRENCY,
+            })
+            call = limiter.call
+            pace = lambda: None  # async 모드에서는 엔드포인트별 동시성 제한이 페이싱을 대신함
+        else:
+            call = lambda endpoint, fn, *args: fn(*args)
+            pace = lambda: time.sleep(0.2)
+
+        # --- 2-1) 캐시 일괄 조회 (행마다 SELECT 하지 않도록 run 시작 시 한 번에)
+        visit_titles = merged.loc[merged["campaign_type"] == "방문형", "title"].tolist()
+        local_map = self._prefetch_local_cache(visit_titles)
+        addresses = merged["address"].dropna().tolist()
+        addresses += [r["address"] for r in local_map.values() if r and r["address"]]
+        geocode_map = self._prefetch_geocode_cache(addresses)
+        uncached_titles = [t for t in visit_titles if not local_map.get(self._local_key(t))]
+        negative_local = self._prefetch_negative_cache("local", uncached_titles)
+        negative_geocode = self._prefetch_negative_cache("geocode", addresses)
+
+        local_search = lambda title: call("local", naver_local_search, search_api_keys, title)
+        geocode = lambda address: call("geocode", naver_geocode, map_id, map_secret, address)
+        # 같은 검색어/주소가 여러 행(채널/오퍼별)에 반복되면 업스트림 호출은 한 번만
+        if flights is None:
+            flights = self._new_flights()
+        if flights:
+            local_flight, geocode_flight = flights["local"], flights["geocode"]
+            local_search = lambda title, _fn=local_search: local_flight.do(clean_local_query(title), _fn, title)
+            geocode = lambda address, _fn=geocode: geocode_flight.do(address.strip(), _fn, address)
+
+        ctx = _EnrichRun(
+            local_search=local_search,
+            geocode=geocode,
+            pace=pace,
+            local_map=local_map,
+            geocode_map=geocode_map,
+            negative_local=negative_local,
+            negative_geocode=negative_geocode,
+        )
 
-        for i, row in merged.iterrows():
-            key = (row["platform"], row["title"], row["offer"], row["campaign_channel"])
-            db_row = existing.get(key)
-
-            # pandas NA 값 안전 처리
-            addr_val = row.get("address")
-            cur_addr = None if pd.isna(addr_val) else ((addr_val or "").strip() or None)
-            cur_lat = row.get("lat") or row.get("lat_map")
-            cur_lng = row.get("lng") or row.get("lng_map")
-            if pd.isna(cur_lat): cur_lat = None
-            if pd.isna(cur_lng): cur_lng = None
-
-            # 3-1) 주소가 없으면 local.search + mapx/mapy
-            if not cur_addr and row.get("campaign_type") == "방문형":
-                cache_row = self._get_local_cache(row["title"])
-                if cache_row:
-                    merged.at[i, "address"] = cache_row["address"]
-                    merged.at[i, "lat"] = cache_row["lat"]
-                    merged.at[i, "lng"] = cache_row["lng"]
-                    
-                    cat = cache_row["category"]
-                    if isinstance(cat, str):
-                        raw_id = get_or_create_raw_category(engine, cat)
-                        cat = find_mapped_category_id(engine, raw_id)
-                    merged.at[i, "category_id"] = cat
-                    cur_addr = cache_row["address"]
-                    cur_lat, cur_lng = cache_row["lat"], cache_row["lng"]
-
-                else:
-                    place = naver_local_search(search_api_keys, row["title"])
-                    if place:
-                        addr = place.get("roadAddress") or place.get("address")
-                        raw_cat = place.get("category")
-                        lat_m, lng_m = self._from_mapxy(place)
-
-                        if addr:
-                            merged.at[i, "address"] = addr
-                            cur_addr = addr
-                        if lat_m and lng_m:
-                            merged.at[i, "lat"], merged.at[i, "lng"] = lat_m, lng_m
-                            cur_lat, cur_lng = lat_m, lng_m
-                            from_mapxy += 1
-
-                        if raw_cat:
-                            raw_id = get_or_create_raw_category(engine, raw_cat)
-                            if raw_id:
-                                merged.at[i, "category_id"] = find_mapped_category_id(engine, raw_id)
-                                
-                        if raw_cat:
-                            raw_id = get_or_create_raw_category(engine, raw_cat)
-                            mapped_id = find_mapped_category_id(engine, raw_id)
-                            merged.at[i, "category_id"] = mapped_id
-                            self._put_local_cache(row["title"], addr, lat_m, lng_m, mapped_id)
-                                
-                    
-
-                        # local_cache
-                        if addr and lat_m and lng_m:
-                            self._put_local_cache(row["title"], addr, lat_m, lng_m, raw_cat)
-                    time.sleep(0.2)
-
-            # 3-2) 주소는 있는데 좌표가 없으면 geocode + 캐시
-            if cur_addr and (cur_lat is None or cur_lng is None):
-                cached = self._get_geocode_cache(cur_addr)
-                if cached:
-                    cur_lat, cur_lng = cached
-                    merged.at[i, "lat"], merged.at[i, "lng"] = cur_lat, cur_lng
-                else:
-                    coords = naver_geocode(map_id, map_secret, cur_addr)
-                    if coords:
-                        cur_lat, cur_lng = coords
-                        merged.at[i, "lat"], merged.at[i, "lng"] = coords
-                        self._put_geocode_cache(cur_addr, *coords)
-                        # ✅ local_cache에도 기록
-                        self._put_local_cache(row["title"], cur_addr, coords[0], coords[1], merged.at[i, "category_id"])
-                        geocoded += 1
-                time.sleep(0.2)
-
-            # 3-3) DB 좌표와 드리프트 체크
-            if db_row and all(v is not None for v in (db_row.get("lat"), db_row.get("lng"), cur_lat, cur_lng)) and cur_addr:
-                dist = self._haversine(float(db_row["lat"]), float(db_row["lng"]), float(cur_lat), float(cur_lng))
-                if dist and dist > DRIFT_METERS:
-                    coords = naver_geocode(map_id, map_secret, cur_addr)
-                    if coords:
-                        cur_lat, cur_lng = coords
-                        merged.at[i, "lat"], merged.at[i, "lng"] = cur_lat, cur_lng
-                        self._put_geocode_cache(cur_addr, *coords)
-                        # ✅ local_cache도 보정값으로 갱신
-                        self._put_local_cache(row["title"], cur_addr, coords[0], coords[1], merged.at[i, "category_id"])
-                        drift_fixed += 1
-                        geocoded += 1
-                    time.sleep(0.2)
-
-            # 3-4) 끝까지 좌표 없고 DB 좌표가 있으면 fallback
-            if (merged.at[i, "lat"] is None or merged.at[i, "lng"] is None) and db_row:
-                merged.at[i, "lat"] = db_row.get("lat")
-                merged.at[i, "lng"] = db_row.get("lng")
+        def run_rows(items, fn):
+            if use_async:
+                return run_concurrently(items, fn, batch.ENRICH_CONCURRENCY)
+            return [fn(item) for item in items]
+
+        stats = {"processed": 0, "from_mapxy": 0, "geocoded": 0, "drift_fixed": 0, "negative_skipped": 0}
+
+        def apply(i, updates, row_stats):
+            for col, val in updates.items():
+                merged.at[i, col] = val
+            for name, n in row_stats.items():
+                stats[name] += n
 
-            processed += 1
+        # --- 3) 루프 (체크포인트 단위 블록으로 처리)
+        if checkpoint is None:
+            checkpoint = self.get_checkpoint(keyword)
 
-        self.logger.info(f"[inflexer] enrich 통계 → 처리:{processed}, mapxy:{from_mapxy}, geocode:{geocoded}, drift_fix:{drift_fixed}")
+        rows, restored = [], 0
+        for i, row in merged.iterrows():
+            saved = checkpoint.get(self._conflict_key(row)) if checkpoint else None
+            if saved is None:
+                rows.append((i, row))
+                continue
+            for col, val in saved.items():
+                merged.at[i, col] = val
+            restored += 1
+        if restored:
+            metrics.incr("enrich_rows", restored, kind="checkpoint_restored")
+            self.logger.info(f"[inflexer] 체크포인트에서 {restored}건 복원, 남은 {len(rows)}건 보강")
+
+        # --- 3-0) 증분 모드: 입력이 바뀌지 않은 기존 캠페인은 저장된 주소/좌표/카테고리를 그대로 사용
+        if batch.ENRICH_INCREMENTAL:
+            rows = self._carry_forward_unchanged(rows, merged, existing)
+
+        block_size = batch.CHECKPOINT_EVERY if checkpoint else len(rows)
+        try:
+            for start in range(0, len(rows), max(1, block_size)):
+                block = rows[start:start + max(1, block_size)]
+                self._enrich_block(block, merged, existing, ctx, run_rows, apply)
+                if checkpoint:
+                    for i, row in block:
+                        checkpoint.record(
+                            self._conflict_key(row),
+                            {c: merged.at[i, c] for c in ("address", "lat", "lng", "category_id")},
+                        )
+                    checkpoint.flush()
+        finally:
+            # 버퍼에 남은 캐시/카테고리 쓰기 반영 (중간 실패 시에도 이미 받은 API 결과는 저장)
+            self.flush_writes()
+
+        for k in self.key_scheduler.stats():
+            self.logger.info(
+                f"[inflexer] 검색 키 {k['key']} → 요청:{k['requests']}, 429:{k['throttled']}, "
+                f"오류:{k['errors']}, 비활성:{k['disabled']}"
+            )
+        for flight in (flights or {}).values():
+            f = flight.stats()
+            self.logger.info(f"[inflexer] single-flight {f['endpoint']} → 호출:{f['calls']}, 절약:{f['saved']}")
+        for name, n in stats.items():
+            metrics.incr("enrich_rows", n, kind=name)
+        self.logger.info(
+            f"[inflexer] enrich 통계 → 처리:{stats['processed']}, mapxy:{stats['from_mapxy']}, "
+            f"geocode:{stats['geocoded']}, drift_fix:{stats['drift_fixed']}, negative:{stats['negative_skipped']}"
+        )
 
         # --- 4) 최종 반환
         final_cols = [c for c in self.RESULT_TABLE_COLUMNS if c in merged.columns]
         final_df = merged.reindex(columns=final_cols).astype(object).where(pd.notna(merged), None)
         return final_df.to_dict("records")
+
+    def _carry_forward_unchanged(self, rows, merged, existing):
+        """
+        DB 값을 그대로 쓸 수 있는 행은 merged에 채우고, 조회가 필요한 행(신규/변경/재검증 표본)만 반환합니다.
+        """
+        salt = datetime.now(self.settings.batch.tz).strftime("%Y%m%d")
+        rate = self.settings.batch.ENRICH_REVERIFY_RATE
+        remaining, carried, sampled = [], 0, 0
+        for i, row in rows:
+            key = self._conflict_key(row)
+            stored = self._carry_forward_values(row, existing.get(key))
+            if stored is None:
+                remaining.append((i, row))
+                continue
+            if self._reverify_sampled(key, salt, rate):
+                sampled += 1
+                remaining.append((i, row))
+                continue
+            for col, val in stored.items():
+                merged.at[i, col] = val
+            carried += 1
+
+        metrics.incr("enrich_rows", carried, kind="carried_forward")
+        metrics.incr("enrich_rows", sampled, kind="reverify_sampled")
+        self.logger.info(
+            f"[inflexer] 증분 enrich → 기존 값 유지 {carried}건, 재검증 표본 {sampled}건, "
+            f"조회 대상 {len(remaining)}건 (신규/변경/저장값 없음 {len(remaining) - sampled}건)"
+        )
+        return remaining
+
+    def _carry_forward_values(self, row, db_row):
+        """
+        저장된 행을 그대로 쓸 수 있으면 {address, lat, lng, category_id}, 아니면 None.
+        주소/좌표가 모두 저장되어 있고, 이번 입력의 주소나 map API 좌표가 저장값과 달라지지 않았을 때만 재사용합니다.
+        """
+        import pandas as pd
+
+        if not db_row or not db_row.get("address") or db_row.get("lat") is None or db_row.get("lng") is None:
+            return None
+
+        addr = row.get("address")
+        if not pd.isna(addr) and (addr or "").strip() and addr.strip() != db_row["address"].strip():
+            return None
+
+        lat, lng = row.get("lat"), row.get("lng")
+        if not pd.isna(lat) and not pd.isna(lng) and lat is not None and lng is not None:
+            dist = self._haversine(float(lat), float(lng), float(db_row["lat"]), float(db_row["lng"]))
+            if dist is None or dist > DRIFT_METERS:
+                return None
+
+        return {c: db_row.get(c) for c in ("address", "lat", "lng", "category_id")}
+
+    @staticmethod
+    def _reverify_sampled(key, salt: str, rate: float) -> bool:
+        """충돌 키 + 날짜 기준 결정적 표본 (같은 날 재실행/스트리밍 청크 사이에 일관되고, 날마다 대상이 바뀜)"""
+        if rate <= 0:
+            return False
+        if rate >= 1:
+            return True
+        digest = hashlib.sha1("\x1f".join(map(str, (salt, *key))).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64 < rate
+
+    def _enrich_block(self, rows, merged, existing, ctx: "_EnrichRun", run_rows, apply):
+        """
+        행 묶음 하나를 끝까지 보강해 merged에 반영합니다.
+        local search → mapx/mapy 좌표 변환(묶음 한 번) → geocode → 드리프트 → DB fallback 순서입니다.
+        """
+        import numpy as np
+        from core.geo import drift_mask, from_mapxy, in_korea, to_float_array
+
+        db_rows = [existing.get(self._conflict_key(row)) for _, row in rows]
+
+        # 3-1) 행 단위 local search (캐시/negative/API)
+        cur, places = [], []
+        for (i, _), (updates, row_stats, row_cur, place) in zip(
+            rows, run_rows(rows, lambda item: self._enrich_local(item[1], ctx))
+        ):
+            apply(i, updates, row_stats)
+            cur.append(row_cur)
+            places.append(place)
+
+        # 3-1-1) API 결과의 mapx/mapy를 묶음 전체로 한 번에 변환, 한국 범위 밖/값 없음은 좌표 없음
+        place_idx = [j for j, place in enumerate(places) if place]
+        if place_idx:
+            lat_m, lng_m = from_mapxy(
+                [places[j].get("mapx") for j in place_idx],
+                [places[j].get("mapy") for j in place_idx],
+            )
+            ok = in_korea(lat_m, lng_m)
+            for n, j in enumerate(place_idx):
+                i, row = rows[j]
+                coords = (float(lat_m[n]), float(lng_m[n])) if ok[n] else (None, None)
+                updates, row_stats, cur[j] = self._apply_place(row, places[j], coords, cur[j], ctx)
+                apply(i, updates, row_stats)
+
+        # 3-2) 주소는 있는데 좌표가 없는 행만 geocode
+        has_addr = np.array([bool(c[0]) for c in cur], dtype=bool)
+        has_coords = ~(np.isnan(to_float_array([c[1] for c in cur])) | np.isnan(to_float_array([c[2] for c in cur])))
+        geo_rows = [(j, rows[j][1], cur[j]) for j in np.flatnonzero(has_addr & ~has_coords)]
+        for (j, *_), (updates, row_stats, row_cur) in zip(
+            geo_rows,
+            run_rows(geo_rows, lambda item: self._enrich_geocode(item[1], item[2], merged.at[rows[item[0]][0], "category_id"], ctx)),
+        ):
+            apply(rows[j][0], updates, row_stats)
+            cur[j] = row_cur
+
+        # 3-3) DB 좌표와 드리프트 체크 — 묶음 전체 거리를 한 번에 계산해 재지오코딩 대상 선택
+        has_addr = np.array([bool(c[0]) for c in cur], dtype=bool)
+        mask, _ = drift_mask(
+            [r.get("lat") if r else None for r in db_rows],
+            [r.get("lng") if r else None for r in db_rows],
+            [c[1] for c in cur],
+            [c[2] for c in cur],
+            DRIFT_METERS,
+        )
+        targets = [
+            (rows[j][0], rows[j][1], cur[j][0], merged.at[rows[j][0], "category_id"])
+            for j in np.flatnonzero(mask & has_addr)
+        ]
+        if targets:
+            self.logger.info(f"[inflexer] 드리프트 의심 {len(targets)}건 재지오코딩")
+        for (i, *_), (updates, row_stats) in zip(
+            targets, run_rows(targets, lambda item: self._fix_drift(item[1], item[2], item[3], ctx))
+        ):
+            apply(i, updates, row_stats)
+
+        # 3-4) 끝까지 좌표 없고 DB 좌표가 있으면 fallback
+        for (i, _), db_row in zip(rows, db_rows):
+            if db_row and (merged.at[i, "lat"] is None or merged.at[i, "lng"] is None):
+                merged.at[i, "lat"] = db_row.get("lat")
+                merged.at[i, "lng"] = db_row.get("lng")
+
+    def _enrich_local(self, row, ctx: "_EnrichRun"):
+        """
+        주소가 없는 방문형 행의 local search (캐시 → negative → API).
+        merged를 직접 수정하지 않고 (변경 컬럼, 통계, (현재 주소, 위도, 경도), API 결과)를 반환하므로
+        순차/비동기 모드 모두 같은 로직을 공유합니다. API 결과의 좌표 변환은 묶음 단위로 따로 합니다.
+        """
+        import pandas as pd
+
+        out = {}
+        stats = {"processed": 1, "negative_skipped": 0}
+
+        # pandas NA 값 안전 처리
+        addr_val = row.get("address")
+        cur_addr = None if pd.isna(addr_val) else ((addr_val or "").strip() or None)
+        cur_lat = row.get("lat") or row.get("lat_map")
+        cur_lng = row.get("lng") or row.get("lng_map")
+        if pd.isna(cur_lat): cur_lat = None
+        if pd.isna(cur_lng): cur_lng = None
+
+        place = None
+        if not cur_addr and row.get("campaign_type") == "방문형":
+            cache_row = self._get_local_cache(row["title"], ctx.local_map)
+            if cache_row:
+                out["address"] = cache_row["address"]
+                out["lat"] = cache_row["lat"]
+                out["lng"] = cache_row["lng"]
+
+                cat = cache_row["category"]
+                if isinstance(cat, str):
+                    cat = self.category_resolver.resolve(cat)
+                out["category_id"] = cat
+                cur_addr = cache_row["address"]
+                cur_lat, cur_lng = cache_row["lat"], cache_row["lng"]
+
+            elif self._negative_hit("local", row["title"], ctx.negative_local):
+                stats["negative_skipped"] += 1
+
+            else:
+                place = ctx.local_search(row["title"])
+                if place is NOT_FOUND:
+                    self._put_negative_cache("local", row["title"], ctx.negative_local)
+                ctx.pace()
+
+        return out, stats, (cur_addr, cur_lat, cur_lng), (place or None)
+
+    def _apply_place(self, row, place, coords, cur, ctx: "_EnrichRun"):
+        """local search 결과(주소/카테고리)와 변환된 좌표를 반영하고 local_cache에 씁니다."""
+        cur_addr, cur_lat, cur_lng = cur
+        out = {}
+        stats = {"from_mapxy": 0}
+        lat_m, lng_m = coords
+        addr = place.get("roadAddress") or place.get("address")
+        raw_cat = place.get("category")
+
+        if addr:
+            out["address"] = addr
+            cur_addr = addr
+        if lat_m is not None and lng_m is not None:
+            out["lat"], out["lng"] = lat_m, lng_m
+            cur_lat, cur_lng = lat_m, lng_m
+            stats["from_mapxy"] += 1
+
+        if raw_cat:
+            mapped_id = self.category_resolver.resolve(raw_cat)
+            out["category_id"] = mapped_id
+            self._put_local_cache(row["title"], addr, lat_m, lng_m, mapped_id, prefetched=ctx.local_map)
+
+        # local_cache
+        if addr and lat_m is not None and lng_m is not None:
+            self._put_local_cache(row["title"], addr, lat_m, lng_m, raw_cat, prefetched=ctx.local_map)
+        return out, stats, (cur_addr, cur_lat, cur_lng)
+
+    def _enrich_geocode(self, row, cur, category_id, ctx: "_EnrichRun"):
+        """주소는 있는데 좌표가 없는 행의 geocode (캐시 → negative → API). (변경 컬럼, 통계, 현재 값)을 반환합니다."""
+        cur_addr, cur_lat, cur_lng = cur
+        out = {}
+        stats = {"geocoded": 0, "negative_skipped": 0}
+        cached = self._get_geocode_cache(cur_addr, ctx.geocode_map)
+        if cached:
+            cur_lat, cur_lng = cached
+            out["lat"], out["lng"] = cur_lat, cur_lng
+        elif self._negative_hit("geocode", cur_addr, ctx.negative_geocode):
+            stats["negative_skipped"] += 1
+        else:
+            coords = ctx.geocode(cur_addr)
+            if coords is NOT_FOUND:
+                self._put_negative_cache("geocode", cur_addr, ctx.negative_geocode)
+            if coords:
+                cur_lat, cur_lng = coords
+                out["lat"], out["lng"] = coords
+                self._put_geocode_cache(cur_addr, *coords, prefetched=ctx.geocode_map)
+                # ✅ local_cache에도 기록
+                self._put_local_cache(row["title"], cur_addr, coords[0], coords[1], category_id, prefetched=ctx.local_map)
+                stats["geocoded"] += 1
+        ctx.pace()
+        return out, stats, (cur_addr, cur_lat, cur_lng)
+
+    def _fix_drift(self, row, cur_addr, category_id, ctx: "_EnrichRun"):
+        """DB 좌표와 드리프트가 큰 행을 다시 지오코딩합니다. (변경 컬럼, 통계)를 반환합니다."""
+        out = {}
+        stats = {"drift_fixed": 0, "geocoded": 0}
+        coords = ctx.geocode(cur_addr)
+        if coords:
+            out["lat"], out["lng"] = coords
+            self._put_geocode_cache(cur_addr, *coords, prefetched=ctx.geocode_map)
+            # ✅ local_cache도 보정값으로 갱신
+            self._put_local_cache(row["title"], cur_addr, coords[0], coords[1], category_id, prefetched=ctx.local_map)
+            stats["drift_fixed"] += 1
+            stats["geocoded"] += 1
+        ctx.pace()
+        return out, stats
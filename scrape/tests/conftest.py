@@ -0,0 +1,13 @@
+# tests/conftest.py
+"""
+순수 모듈 단위 테스트 (DB 없이 실행).
+
+사용법 (scrape 디렉터리에서, pytest 필요):
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+SCRAPE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRAPE_ROOT not in sys.path:
+    sys.path.insert(0, SCRAPE_ROOT)
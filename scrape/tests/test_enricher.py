@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+
+import pytest
+
+from core import enricher, metrics
+from core.config import settings
+from core.enricher import NOT_FOUND, SingleFlight, naver_geocode, naver_local_search
+from core.key_scheduler import NaverKeyScheduler
+from tools.stub_server import StubServer
+
+
+@pytest.fixture
+def run_metrics():
+    rm = metrics.RunMetrics("test", "키워드")
+    token = metrics.activate(rm)
+    yield rm
+    metrics.deactivate(token)
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(enricher.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def cassette(path, body, status=200):
+    key = path + "?"
+    return {key: [{"key": key, "status": status, "content_type": "application/json",
+                   "body": json.dumps(body, ensure_ascii=False)}]}
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    servers = []
+
+    def start(cassettes, **kwargs):
+        server = StubServer(cassettes, **kwargs).start()
+        servers.append(server)
+        monkeypatch.setattr(settings.naver_api, "MAPS_BASE_URL", server.url)
+        monkeypatch.setattr(settings.naver_api, "OPENAPI_BASE_URL", server.url)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+GEOCODE = "/map-geocode/v2/geocode"
+LOCAL = "/v1/search/local.json"
+
+
+def test_geocode_retries_after_429(stub, no_sleep, run_metrics):
+    server = stub(cassette(GEOCODE, {"addresses": [{"y": "37.51", "x": "127.01"}]}),
+                  fault_paths=[GEOCODE], throttle_first=2)
+    assert naver_geocode("id", "secret", "서울 강남구 테헤란로 1") == (37.51, 127.01)
+    assert server.stats["throttled"] == 2
+    assert no_sleep == [1, 2]
+    assert run_metrics.total("api_throttled", endpoint="geocode") == 2
+    assert run_metrics.total("api_calls", endpoint="geocode") == 3
+    assert run_metrics.total("api_errors", endpoint="geocode") == 0
+
+
+def test_geocode_gives_up_after_max_retries(stub, no_sleep, run_metrics):
+    stub(cassette(GEOCODE, {"addresses": []}), fault_paths=[GEOCODE], throttle_first=10)
+    assert naver_geocode("id", "secret", "서울 강남구 테헤란로 1") is None
+    assert run_metrics.total("api_throttled", endpoint="geocode") == 3
+
+
+def test_geocode_other_error_is_not_retried(stub, no_sleep, run_metrics):
+    stub(cassette(GEOCODE, {"addresses": []}), error_rate=1.0)
+    assert naver_geocode("id", "secret", "서울 강남구 테헤란로 1") is None
+    assert run_metrics.total("api_errors", endpoint="geocode", status=500) == 1
+    assert run_metrics.total("api_throttled", endpoint="geocode") == 0
+
+
+def test_geocode_empty_result_is_not_found(stub, no_sleep, run_metrics):
+    stub(cassette(GEOCODE, {"addresses": []}))
+    assert naver_geocode("id", "secret", "없는 주소") is NOT_FOUND
+
+
+def test_local_search_moves_to_next_key_on_429(stub, run_metrics):
+    place = {"roadAddress": "서울 강남구 테헤란로 1", "mapx": "1270276543", "mapy": "375001234"}
+    stub(cassette(LOCAL, {"items": [place]}), fault_paths=[LOCAL], throttle_first=1)
+    scheduler = NaverKeyScheduler([("id-a", "s"), ("id-b", "s")], cooldown_seconds=60)
+    assert naver_local_search(scheduler, "강남 맛집") == place
+    assert run_metrics.total("api_throttled", endpoint="local_search") == 1
+    assert sorted(s["throttled"] for s in scheduler.stats()) == [0, 1]
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight("geocode")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(key):
+        calls.append(key)
+        started.set()
+        release.wait(5)
+        return (37.5, 127.0)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("a", slow, "a"))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    while flight.saved < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert calls == ["a"]
+    assert results == [(37.5, 127.0)] * 4
+    assert flight.stats() == {"endpoint": "geocode", "calls": 1, "saved": 3}
+    # 끝난 결과(None 포함)는 재사용
+    assert flight.do("a", lambda: pytest.fail("재호출됨")) == (37.5, 127.0)
+    assert flight.do("b", lambda: None) is None
+    assert flight.do("b", lambda: pytest.fail("재호출됨")) is None
+
+
+def test_single_flight_does_not_remember_errors():
+    flight = SingleFlight("local_search")
+
+    def boom():
+        raise RuntimeError("fail")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    assert flight.do("k", lambda: "ok") == "ok"
+    assert flight.calls == 2
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+
+from core.fastparse import clean_text, dedupe, empty_record, parse_datetime
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    (float("nan"), None),
+    ("  a b  ", "a b"),
+    (12, "12"),
+    ("", ""),
+])
+def test_clean_text(value, expected):
+    assert clean_text(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-01-05", datetime(2026, 1, 5)),
+    ("2026-01-05T10:30:00", datetime(2026, 1, 5, 10, 30)),
+    ("2026.01.05", datetime(2026, 1, 5)),
+    ("2026.1.5.", datetime(2026, 1, 5)),
+    ("2026/1/5 10:30", datetime(2026, 1, 5, 10, 30)),
+    (" 2026-01-05 ", datetime(2026, 1, 5)),
+    ("2026-02-30", None),
+    ("마감", None),
+    ("", None),
+    (None, None),
+    (20260105, None),
+])
+def test_parse_datetime(value, expected):
+    assert parse_datetime(value) == expected
+
+
+def test_parse_datetime_passes_datetime_through():
+    dt = datetime(2026, 1, 5, 1, 2, 3)
+    assert parse_datetime(dt) is dt
+
+
+def test_dedupe_keeps_first():
+    records = [
+        {"platform": "a", "title": "x", "n": 1},
+        {"platform": "a", "title": "x", "n": 2},
+        {"platform": "b", "title": "x", "n": 3},
+    ]
+    assert [r["n"] for r in dedupe(records, ["platform", "title"])] == [1, 3]
+
+
+def test_empty_record():
+    assert empty_record(["a", "b"]) == {"a": None, "b": None}
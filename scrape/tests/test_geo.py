@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+import numpy as np
+
+from core.geo import drift_mask, from_mapxy, haversine_m, in_korea, to_float_array
+
+
+def test_to_float_array_handles_mixed_values():
+    arr = to_float_array([None, "1.5", Decimal("2"), "x", 3])
+    assert np.isnan(arr[0]) and np.isnan(arr[3])
+    assert arr[[1, 2, 4]].tolist() == [1.5, 2.0, 3.0]
+
+
+def test_from_mapxy_converts_and_masks_outside_korea():
+    lat, lng = from_mapxy(["1270276543", "", None, "-740000000"], ["375001234", "", None, "407000000"])
+    assert lat[0] == 37.5001234 and lng[0] == 127.0276543
+    assert np.isnan(lat[1:]).all() and np.isnan(lng[1:]).all()
+
+
+def test_in_korea():
+    mask = in_korea([37.5, 33.0, 39.6, None, float("nan")], [127.0, 124.0, 127.0, 127.0, 127.0])
+    assert mask.tolist() == [True, True, False, False, False]
+
+
+def test_haversine_and_drift_mask():
+    dist = haversine_m([37.5], [127.0], [37.51], [127.0])
+    assert abs(dist[0] - 1112) < 2
+    mask, dist = drift_mask([37.5, 37.5, None], [127.0, 127.0, 127.0], [37.5, 37.6, 37.5], [127.0, 127.0, 127.0], 500)
+    assert mask.tolist() == [False, True, False]
+    assert dist[0] == 0 and np.isnan(dist[2])
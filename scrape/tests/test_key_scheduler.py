@@ -0,0 +1,50 @@
+from core.key_scheduler import NaverKeyScheduler
+
+
+def make(n_keys=2, **kwargs):
+    return NaverKeyScheduler([(f"id-{i}", f"secret-{i}") for i in range(n_keys)], **kwargs)
+
+
+def test_acquire_spreads_requests_by_headroom():
+    scheduler = make(2, rate_per_window=10, window_seconds=60)
+    picked = [scheduler.acquire().client_id for _ in range(4)]
+    assert sorted(picked) == ["id-0", "id-0", "id-1", "id-1"]
+
+
+def test_acquire_returns_none_when_window_full_and_wait_too_long():
+    scheduler = make(1, rate_per_window=1, window_seconds=60, max_wait_seconds=0.01)
+    assert scheduler.acquire() is not None
+    assert scheduler.acquire() is None
+
+
+def test_throttled_key_cools_down_with_backoff():
+    scheduler = make(2, rate_per_window=10, window_seconds=60, cooldown_seconds=1, max_cooldown_seconds=3)
+    key = scheduler.acquire()
+    assert scheduler.report_throttled(key) == 1
+    assert scheduler.report_throttled(key) == 2
+    assert scheduler.report_throttled(key) == 3  # max_cooldown_seconds에서 멈춤
+    # 쿨다운 중인 키는 건너뜀
+    assert all(scheduler.acquire() is not key for _ in range(3))
+    stats = {s["key"]: s for s in scheduler.stats()}
+    assert stats[key.label]["throttled"] == 3
+    assert stats[key.label]["cooling_down"]
+
+
+def test_success_resets_strikes():
+    scheduler = make(1, cooldown_seconds=0.001)
+    key = scheduler.acquire()
+    scheduler.report_throttled(key)
+    scheduler.report_throttled(key)
+    scheduler.report_success(key)
+    assert key.strikes == 0
+
+
+def test_auth_error_disables_key_but_transient_error_does_not():
+    scheduler = make(2, error_cooldown_seconds=0.001)
+    a, b = scheduler._keys
+    scheduler.report_error(a, 500)
+    assert not a.disabled and len(scheduler) == 2
+    scheduler.report_error(b, 401)
+    assert b.disabled and len(scheduler) == 1
+    scheduler.report_error(a, 403)
+    assert scheduler.acquire() is None
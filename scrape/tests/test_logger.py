@@ -0,0 +1,34 @@
+import logging
+
+from core import logger as logger_mod
+from core.logger import activate_sampler, deactivate_sampler, log_sampled
+
+
+def sampled_counts(caplog, event, n):
+    caplog.clear()
+    for i in range(n):
+        log_sampled(logging.getLogger("test.sampler"), event, "event %d", i)
+    return [r.fields["event_count"] for r in caplog.records]
+
+
+def test_sampling_restarts_for_each_run(caplog, monkeypatch):
+    monkeypatch.setattr(logger_mod.log_settings(), "SAMPLE_FIRST", 2)
+    monkeypatch.setattr(logger_mod.log_settings(), "SAMPLE_EVERY", 3)
+    caplog.set_level(logging.INFO, logger="test.sampler")
+    for _ in range(2):
+        token = activate_sampler()
+        try:
+            assert sampled_counts(caplog, "run.event", 8) == [1, 2, 5, 8]
+        finally:
+            deactivate_sampler(token)
+
+
+def test_sampling_every_zero_logs_only_first(caplog, monkeypatch):
+    monkeypatch.setattr(logger_mod.log_settings(), "SAMPLE_FIRST", 1)
+    monkeypatch.setattr(logger_mod.log_settings(), "SAMPLE_EVERY", 0)
+    caplog.set_level(logging.INFO, logger="test.sampler")
+    token = activate_sampler()
+    try:
+        assert sampled_counts(caplog, "run.event", 5) == [1]
+    finally:
+        deactivate_sampler(token)
@@ -0,0 +1,64 @@
+import pytest
+
+from core import memcache
+from core.memcache import LruTtlCache, approx_size
+
+
+def test_get_put_and_stats():
+    cache = LruTtlCache(max_entries=10)
+    assert cache.get("a") is None
+    cache.put("a", {"lat": 37.5})
+    assert cache.get("a") == {"lat": 37.5}
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 1, 0.5)
+    assert stats["bytes"] == approx_size("a", {"lat": 37.5})
+
+
+def test_evicts_least_recently_used_by_entries():
+    cache = LruTtlCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # a가 최근 사용 → b가 먼저 나감
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_evicts_by_bytes_and_skips_oversized_values():
+    size = approx_size("k0", "x" * 100)
+    cache = LruTtlCache(max_entries=100, max_bytes=size * 2)
+    for i in range(3):
+        cache.put(f"k{i}", "x" * 100)
+    assert len(cache) == 2 and cache.get("k0") is None
+    cache.put("big", "x" * (size * 3))
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_put_same_key_replaces_size():
+    cache = LruTtlCache()
+    cache.put("a", "x")
+    cache.put("a", "y" * 1000)
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == approx_size("a", "y" * 1000)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memcache.time, "monotonic", lambda: now[0])
+    cache = LruTtlCache(ttl_seconds=10)
+    cache.put("a", 1)
+    now[0] += 9.9
+    assert cache.get("a") == 1
+    now[0] += 0.2
+    assert cache.get("a") is None
+    assert cache.expired == 1 and cache.stats()["bytes"] == 0
+
+
+@pytest.mark.parametrize("value", [None, 0, ""])
+def test_falsy_values_are_cached_as_is(value):
+    # None은 조회 실패와 구분되지 않으므로 호출 측은 None을 넣지 않음 — 다른 falsy 값은 그대로 돌려줌
+    cache = LruTtlCache()
+    cache.put("k", value)
+    assert cache.get("k") == value
@@ -0,0 +1,50 @@
+import pytest
+
+from core.normalize import (
+    TITLE_KEY_CASES,
+    canonical_address,
+    canonical_title,
+    failed_title_cases,
+    is_campaign_tag,
+    title_region_tags,
+)
+
+
+@pytest.mark.parametrize("a, b, same", TITLE_KEY_CASES)
+def test_title_key_cases(a, b, same):
+    assert (canonical_title(a) == canonical_title(b)) == same
+
+
+def test_failed_title_cases_is_empty():
+    assert failed_title_cases() == []
+
+
+def test_canonical_title_normalizes_width_and_spaces():
+    assert canonical_title("  [재방문]  ＡＢＣ   카페 ") == "abc 카페"
+
+
+def test_title_only_prefix_is_kept():
+    # 말머리뿐인 제목은 지우지 않음 (빈 키가 되지 않도록)
+    assert canonical_title("[재방문]") == "[재방문]"
+
+
+def test_campaign_tags_vs_region_tags():
+    assert is_campaign_tag("체험단 모집")
+    assert is_campaign_tag("D-3")
+    assert not is_campaign_tag("강남")
+    assert title_region_tags("[재방문][강남] 맛집") == ("강남",)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("서울특별시 강남구 테헤란로 1", "서울 강남구 테헤란로 1"),
+    ("서울 강남구 테헤란로 1 2층", "서울 강남구 테헤란로 1"),
+    ("서울 강남구 테헤란로 1 (역삼동)", "서울 강남구 테헤란로 1"),
+    ("서울 강남구 테헤란로 1, 101호", "서울 강남구 테헤란로 1"),
+    ("경기도 성남시 분당구 판교로 1 B1", "경기 성남시 분당구 판교로 1"),
+])
+def test_canonical_address_same_key(a, b):
+    assert canonical_address(a) == canonical_address(b)
+
+
+def test_canonical_address_keeps_different_buildings_apart():
+    assert canonical_address("서울 강남구 테헤란로 1") != canonical_address("서울 강남구 테헤란로 2")
@@ -0,0 +1,54 @@
+import hashlib
+
+from core.normalize import canonical_address, canonical_title
+from core.write_buffer import CacheWriteBuffer
+
+
+def make(**kwargs):
+    # max_pending/flush_interval을 크게 잡아 put 시점 flush(DB 쓰기)가 일어나지 않게 함
+    kwargs.setdefault("max_pending", 1000)
+    kwargs.setdefault("flush_interval", 3600)
+    return CacheWriteBuffer(None, lambda k: hashlib.sha1(k.encode()).digest(), **kwargs)
+
+
+def test_read_your_writes_with_last_write_wins():
+    buf = make(local_key=canonical_title, geocode_key=canonical_address)
+    buf.put_local("Cafe", "주소1", 37.5, 127.0)
+    entry = buf.put_local(" [재방문] cafe ", "주소2", 37.6, 127.1, category="카페")
+    assert buf.get_local("CAFE") is entry
+    assert entry["address"] == "주소2" and entry["category"] == "카페"
+    buf.put_geocode("서울특별시 강남구 테헤란로 1", 1, 2)
+    buf.put_geocode("서울 강남구 테헤란로 1 2층", 3, 4)
+    assert buf.get_geocode("서울 강남구 테헤란로 1") == (3, 4)
+    assert len(buf) == 2 and buf.puts == 4
+    # 원문은 마지막으로 쓴 값 (양끝 공백 제거)
+    assert buf._texts["local", "cafe"] == "[재방문] cafe"
+
+
+def test_negative_entries_are_keyed_per_cache():
+    buf = make()
+    buf.put_negative("local", " 없는 가게 ")
+    buf.put_negative("local", "없는 가게")
+    buf.put_negative("geocode", "없는 가게")
+    assert len(buf) == 2
+    assert buf.get_local("없는 가게") is None
+
+
+def test_flush_with_nothing_pending_does_not_touch_db():
+    assert make().flush() == 0
+
+
+def test_failed_flush_keeps_pending_writes():
+    class BrokenEngine:
+        def begin(self):
+            raise RuntimeError("db down")
+
+    buf = make()
+    buf.engine = BrokenEngine()
+    buf.put_local("카페", "주소", 37.5, 127.0)
+    buf.put_geocode("주소", 37.5, 127.0)
+    buf.put_negative("local", "없는 가게")
+    assert buf.flush() == 0
+    # local/geocode는 되돌려 놓고, negative는 다음 run에서 다시 조회하므로 버림
+    assert buf.get_local("카페") is not None and buf.get_geocode("주소") == (37.5, 127.0)
+    assert len(buf) == 2 and buf.written == 0
@@ -0,0 +1,153 @@
+# tools/cache_key_report.py
+"""
+캐시 키를 정규화(core/normalize.py)했을 때의 hit rate 변화를 기존 데이터로 측정합니다.
+
+campaign 테이블의 과거 캠페인을 enrich 조회 이력으로 보고, 키 방식(raw/canonical)마다 다음을 계산합니다.
+- 현재 캐시 기준 hit rate: 조회 키가 지금 캐시 행(같은 방식으로 만든 키)에 있는 비율
+- 재사용 상한: 빈 캐시에서 이력을 순서대로 조회할 때의 hit rate (1 - 서로 다른 키 수 / 조회 수)
+  ─ 같은 업체/주소가 표기만 달라 따로 조회되던 건이 얼마나 합쳐지는지를 보여 줍니다.
+- 잘못 합쳐진 조회(false_hits): 같은 키지만 제목의 지역/지점 말머리([강남] vs [홍대])가 다른 경우.
+  다른 업체의 주소/좌표를 받게 되므로 두 hit rate 모두에서 빼고 건수를 따로 보여 줍니다.
+- 키 규칙 확인: normalize.TITLE_KEY_CASES 중 기대와 다른 항목이 있으면 먼저 출력합니다.
+
+사용법 (scrape 디렉터리에서):
+    python tools/cache_key_report.py --days 90
+    python tools/cache_key_report.py --json bench/results/cache_keys.json
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from core.db import get_engine  # noqa: E402
+from core.normalize import (  # noqa: E402
+    canonical_address, canonical_title, failed_title_cases, title_region_tags,
+)
+
+KEY_MODES: Dict[str, Dict[str, Callable[[str], str]]] = {
+    "raw": {"local": str.strip, "geocode": str.strip},
+    "canonical": {"local": canonical_title, "geocode": canonical_address},
+}
+# 같은 키라도 이 값이 다르면 다른 업체/주소 (잘못 합쳐진 조회)
+TAG_FNS: Dict[str, Callable[[str], tuple]] = {"local": title_region_tags}
+
+
+def load_history(engine, days: int) -> Dict[str, List[str]]:
+    """enrich가 조회했을 title(방문형)/address 목록 (created_at 순)"""
+    since = "AND created_at > NOW() - make_interval(days => :days)" if days else ""
+    with engine.connect() as conn:
+        titles = conn.execute(text(f"""
+            SELECT title FROM campaign
+            WHERE campaign_type = '방문형' AND title IS NOT NULL {since}
+            ORDER BY created_at
+        """), {"days": days}).scalars().all()
+        addresses = conn.execute(text(f"""
+            SELECT address FROM campaign
+            WHERE address IS NOT NULL AND address <> '' {since}
+            ORDER BY created_at
+        """), {"days": days}).scalars().all()
+    return {"local": titles, "geocode": addresses}
+
+
+def load_cache_texts(engine) -> Dict[str, List[str]]:
+    with engine.connect() as conn:
+        titles = conn.execute(text("SELECT title FROM local_search_cache WHERE title IS NOT NULL")).scalars().all()
+        addresses = conn.execute(text("SELECT address FROM geocode_cache WHERE address IS NOT NULL")).scalars().all()
+    return {"local": titles, "geocode": addresses}
+
+
+def measure(history: List[str], cache_texts: List[str], key_fn: Callable[[str], str],
+            tags_fn: Optional[Callable[[str], tuple]] = None) -> Dict[str, float]:
+    """
+    tags_fn(원문)이 다른 두 값이 같은 키로 모이면 잘못 합쳐진 것으로 보고 hit에서 뺍니다
+    (local 캐시: 제목의 지역/지점 말머리).
+    """
+    tags_fn = tags_fn or (lambda v: ())
+    cached: Dict[str, Set[tuple]] = {}
+    for v in cache_texts:
+        k = key_fn(v)
+        if k:
+            cached.setdefault(k, set()).add(tags_fn(v))
+
+    lookups = cache_hits = cache_false = reuse_hits = reuse_false = 0
+    seen: Dict[str, Set[tuple]] = {}
+    for v in history:
+        k = key_fn(v)
+        if not k:
+            continue
+        lookups += 1
+        tags = tags_fn(v)
+        if k in cached:
+            if tags in cached[k]:
+                cache_hits += 1
+            else:
+                cache_false += 1
+        if k in seen:
+            if tags in seen[k]:
+                reuse_hits += 1
+            else:
+                reuse_false += 1
+        seen.setdefault(k, set()).add(tags)
+
+    return {
+        "lookups": lookups,
+        "distinct_keys": len(seen),
+        "cache_keys": len(cached),
+        "cache_hit_rate": round(cache_hits / lookups, 4) if lookups else 0.0,
+        "reuse_hit_rate": round(reuse_hits / lookups, 4) if lookups else 0.0,
+        "false_hits": cache_false + reuse_false,
+    }
+
+
+def build_report(days: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    engine = get_engine()
+    history = load_history(engine, days)
+    cache_texts = load_cache_texts(engine)
+    return {
+        cache: {
+            mode: measure(history[cache], cache_texts[cache], fns[cache], TAG_FNS.get(cache))
+            for mode, fns in KEY_MODES.items()
+        }
+        for cache in ("local", "geocode")
+    }
+
+
+def print_report(report) -> None:
+    print(f"{'cache':>8} {'mode':>10} {'lookups':>9} {'distinct':>9} {'cache_hit':>10} {'reuse_hit':>10} {'false':>7}")
+    for cache, modes in report.items():
+        for mode, m in modes.items():
+            print(
+                f"{cache:>8} {mode:>10} {m['lookups']:>9} {m['distinct_keys']:>9} "
+                f"{m['cache_hit_rate']:>10.1%} {m['reuse_hit_rate']:>10.1%} {m['false_hits']:>7}"
+            )
+        raw, canon = modes["raw"], modes["canonical"]
+        print(
+            f"{cache:>8} {'Δ':>10} {'':>9} {canon['distinct_keys'] - raw['distinct_keys']:>+9} "
+            f"{(canon['cache_hit_rate'] - raw['cache_hit_rate']) * 100:>+9.1f}p "
+            f"{(canon['reuse_hit_rate'] - raw['reuse_hit_rate']) * 100:>+9.1f}p"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정규화 캐시 키 hit rate 리포트")
+    parser.add_argument("--days", type=int, default=0, help="최근 N일 캠페인만 사용 (0이면 전체)")
+    parser.add_argument("--json", help="결과를 JSON으로도 저장할 경로")
+    args = parser.parse_args()
+
+    for a, b, same in failed_title_cases():
+        print(f"[키 규칙 확인 실패] {a!r} / {b!r} → 같은 키{'여야' if same else '면 안'} 함")
+    report = build_report(args.days)
+    print_report(report)
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"days": args.days, "report": report}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# tools/rekey_cache.py
+"""
+local_search_cache / geocode_cache 행을 정규화 키(core/normalize.py)로 다시 저장합니다.
+CACHE_KEY_MODE=canonical로 바꾸기 전에 한 번 실행합니다.
+
+- 기존 행은 그대로 두고 새 키의 행을 추가합니다 (go-scraper 등 기존 키를 쓰는 곳은 계속 HIT).
+- 여러 기존 행이 같은 정규화 키로 모이면 updated_at이 가장 최근인 행을 씁니다.
+  새 키 행이 이미 있으면 더 최근 값일 때만 덮어씁니다. updated_at은 원래 값을 유지합니다 (TTL 동일).
+- 제목의 지역/지점 말머리([강남] vs [홍대])가 다른 행이 같은 키로 모이면 그 키는 쓰지 않고 건수만 셉니다
+  (region_conflicts). 키 규칙(normalize.TITLE_KEY_CASES) 확인이 실패하면 아무것도 쓰지 않고 종료합니다.
+- --prune-legacy: 기존 키 행을 지웁니다. 기존 키를 쓰는 프로세스가 없을 때만 사용하세요.
+
+사용법 (scrape 디렉터리에서):
+    python tools/rekey_cache.py --dry-run
+    python tools/rekey_cache.py
+"""
+import argparse
+import hashlib
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+from core.db import get_engine  # noqa: E402
+from core.logger import get_logger  # noqa: E402
+from core.normalize import (  # noqa: E402
+    canonical_address, canonical_title, failed_title_cases, title_region_tags,
+)
+
+log = get_logger("rekey_cache")
+
+
+def _hash(key: str) -> bytes:
+    # BaseScraper._cache_hash와 같은 해시
+    return hashlib.sha1(key.strip().encode("utf-8")).digest()
+
+
+class _Table:
+    def __init__(self, name: str, hash_col: str, text_col: str, value_cols: List[str], key_fn: Callable[[str], str],
+                 tags_fn: Optional[Callable[[str], tuple]] = None):
+        self.name = name
+        self.hash_col = hash_col
+        self.text_col = text_col
+        self.value_cols = value_cols
+        self.key_fn = key_fn
+        self.tags_fn = tags_fn  # 같은 키로 모여도 이 값이 다르면 다른 업체 (local: 지역/지점 말머리)
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.hash_col, self.text_col] + self.value_cols + ["updated_at"]
+
+
+TABLES = [
+    _Table("local_search_cache", "title_hash", "title", ["address", "lat", "lng", "category"], canonical_title,
+           title_region_tags),
+    _Table("geocode_cache", "address_hash", "address", ["lat", "lng"], canonical_address),
+]
+
+_CASTS = {"lat": "double precision", "lng": "double precision", "updated_at": "timestamptz"}
+
+
+def rekey_table(engine, table: _Table, dry_run: bool, prune_legacy: bool, batch_size: int) -> Dict[str, int]:
+    stats = {
+        "scanned": 0, "already_canonical": 0, "legacy": 0, "new_keys": 0, "region_conflicts": 0,
+        "written": 0, "pruned": 0,
+    }
+    best: Dict[bytes, Dict[str, Any]] = {}   # 정규화 키 해시 → 가장 최근 행
+    tags: Dict[bytes, Set[tuple]] = {}       # 정규화 키 해시 → 모인 행들의 지역/지점 말머리
+    legacy: List[Tuple[bytes, bytes]] = []   # (기존 키 해시, 정규화 키 해시)
+
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            text(f"SELECT {', '.join(table.columns)} FROM {table.name}")
+        )
+        for r in result.mappings():
+            stats["scanned"] += 1
+            row = dict(r)
+            key = table.key_fn(row[table.text_col] or "")
+            if not key:
+                continue
+            new_hash = _hash(key)
+            if table.tags_fn is not None:
+                tags.setdefault(new_hash, set()).add(table.tags_fn(row[table.text_col] or ""))
+            if new_hash == bytes(row[table.hash_col]):
+                stats["already_canonical"] += 1
+                continue
+            stats["legacy"] += 1
+            legacy.append((bytes(row[table.hash_col]), new_hash))
+            cur = best.get(new_hash)
+            if cur is None or (row["updated_at"] and (cur["updated_at"] is None or row["updated_at"] > cur["updated_at"])):
+                best[new_hash] = {**row, table.hash_col: new_hash}
+    # 지역/지점이 다른 행이 모인 키는 어느 값을 써도 다른 업체에 잘못된 주소를 주므로 건너뜀
+    for new_hash in [h for h in best if len(tags.get(h, ())) > 1]:
+        del best[new_hash]
+        stats["region_conflicts"] += 1
+    stats["new_keys"] = len(best)
+    # 복사하지 않은(지역 충돌) 키의 기존 행은 지우지 않음
+    legacy_hashes = [old for old, new in legacy if new in best]
+
+    if dry_run:
+        return stats
+
+    cols = table.columns
+    upsert = text(f"""
+        INSERT INTO {table.name} ({", ".join(cols)})
+        SELECT {", ".join("t." + c for c in cols)}
+        FROM unnest({", ".join(
+            f"CAST(:{c} AS {_CASTS.get(c, 'bytea' if c == table.hash_col else 'text')}[])" for c in cols
+        )}) AS t({", ".join(cols)})
+        ON CONFLICT ({table.hash_col}) DO UPDATE
+        SET {", ".join(f"{c} = EXCLUDED.{c}" for c in cols if c != table.hash_col)}
+        WHERE {table.name}.updated_at IS NULL OR {table.name}.updated_at < EXCLUDED.updated_at
+    """)
+    rows = list(best.values())
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        params = {c: [None if r[c] is None else (str(r[c]) if c == "category" else r[c]) for r in chunk] for c in cols}
+        with engine.begin() as conn:
+            res = conn.execute(upsert, params)
+        stats["written"] += max(res.rowcount or 0, 0)
+
+    if prune_legacy and legacy_hashes:
+        delete = text(f"DELETE FROM {table.name} WHERE {table.hash_col} = ANY(:hashes)")
+        for start in range(0, len(legacy_hashes), batch_size):
+            with engine.begin() as conn:
+                res = conn.execute(delete, {"hashes": legacy_hashes[start:start + batch_size]})
+            stats["pruned"] += max(res.rowcount or 0, 0)
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캐시 행을 정규화 키로 다시 저장")
+    parser.add_argument("--dry-run", action="store_true", help="쓰지 않고 건수만 출력")
+    parser.add_argument("--prune-legacy", action="store_true", help="정규화 키로 복사한 뒤 기존 키 행 삭제")
+    parser.add_argument("--batch", type=int, default=2000)
+    args = parser.parse_args()
+
+    failed = failed_title_cases()
+    if failed:
+        for a, b, same in failed:
+            log.error(f"[키 규칙 확인 실패] {a!r} / {b!r} → 같은 키{'여야' if same else '면 안'} 함")
+        sys.exit(1)
+
+    engine = get_engine()
+    for table in TABLES:
+        stats = rekey_table(engine, table, args.dry_run, args.prune_legacy, max(1, args.batch))
+        log.info(
+            f"[{table.name}] 조회 {stats['scanned']}건 → 이미 정규화 {stats['already_canonical']}, "
+            f"기존 키 {stats['legacy']} → 정규화 키 {stats['new_keys']}개 (지역 충돌 제외 {stats['region_conflicts']})"
+            + ("" if args.dry_run else f", 기록 {stats['written']}, 삭제 {stats['pruned']}")
+        )
+
+
+if __name__ == "__main__":
+    main()
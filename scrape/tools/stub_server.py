@@ -0,0 +1,211 @@
+# tools/stub_server.py
+"""
+기록한 cassette(HTTP_RECORD_DIR)를 재생하는 로컬 stub HTTP 서버.
+Inflexer(/search, /map)와 Naver(/v1/search/local.json, /map-geocode/v2/geocode) 응답을
+네트워크/쿼터 없이 재현해 enrich 부하 테스트를 오프라인으로 돌릴 수 있습니다.
+
+1) 기록:  HTTP_RECORD_DIR=cassettes python main.py inflexer --keyword 강남
+2) 재생:  python tools/stub_server.py --cassettes cassettes --port 8900 --latency-ms 80 --rate-429 0.02
+3) 실행:  INFLEXER_BASE_URL=http://127.0.0.1:8900 NAVER_OPENAPI_BASE_URL=http://127.0.0.1:8900 \\
+          NAVER_MAPS_BASE_URL=http://127.0.0.1:8900 python main.py inflexer --keyword 강남
+
+- 요청 키(경로 + 정렬된 쿼리)가 일치하는 응답을 기록 순서대로 돌려가며 반환합니다.
+- 일치하는 키가 없으면 --on-miss=cycle(기본)은 같은 경로의 응답을 돌려가며, 404는 404를 반환합니다.
+- --latency-ms/--jitter-ms로 지연, --rate-429/--error-rate로 429/500 응답 비율을 지정합니다
+  (--fault-path로 장애 주입 대상 경로를 제한할 수 있습니다).
+- --throttle-first N: 장애 주입 대상 경로마다 처음 N건은 항상 429 (재시도/백오프 경로를 확실히 태울 때.
+  --fault-path가 없으면 경로별로 따로 셉니다).
+"""
+import argparse
+import gzip
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.cassette import load_cassettes, url_key  # noqa: E402
+
+THROTTLED_BODY = json.dumps({"errorMessage": "Rate limit exceeded. (속도 제한을 초과했습니다.)", "errorCode": "012"})
+ERROR_BODY = json.dumps({"errorMessage": "stub injected error"})
+
+
+class StubServer:
+    """cassette 재생 서버. start()로 백그라운드 스레드에서 실행하고 stop()으로 종료합니다."""
+
+    def __init__(
+        self,
+        cassettes: Union[str, Dict[str, List[Dict[str, Any]]]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_429: float = 0.0,
+        error_rate: float = 0.0,
+        on_miss: str = "cycle",
+        seed: Optional[int] = None,
+        fault_paths: Optional[List[str]] = None,
+        throttle_first: int = 0,
+    ):
+        by_key = load_cassettes(cassettes) if isinstance(cassettes, str) else cassettes
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.on_miss = on_miss
+        self.fault_paths = tuple(fault_paths or ())
+        self.throttle_first = int(throttle_first)
+        self._fault_counts: Dict[str, int] = {}   # 장애 주입 대상 경로(prefix)별 요청 수
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._by_key = {key: itertools.cycle(entries) for key, entries in by_key.items()}
+        by_path: Dict[str, List[Dict[str, Any]]] = {}
+        for entries in by_key.values():
+            for entry in entries:
+                by_path.setdefault(urlsplit(entry["key"]).path, []).append(entry)
+        self._by_path = {path: itertools.cycle(entries) for path, entries in by_path.items()}
+
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "throttled": 0, "errors": 0, "not_found": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _pick(self, path_with_query: str):
+        """(status, content_type, body) 선택 — 지연/장애 주입 포함"""
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            delay = max(0.0, self._random.gauss(self.latency_ms, self.jitter_ms)) if self.latency_ms else 0.0
+        if delay:
+            time.sleep(delay / 1000)
+
+        path = urlsplit(path_with_query).path
+        fault_path = next((p for p in self.fault_paths if path.startswith(p)), None) if self.fault_paths else path
+        if fault_path is None:
+            roll = 1.0  # 장애 주입 대상 경로가 아님
+        elif self.throttle_first:
+            with self._lock:
+                n = self._fault_counts[fault_path] = self._fault_counts.get(fault_path, 0) + 1
+            if n <= self.throttle_first:
+                roll = -1.0
+        if roll < self.rate_429 or roll < 0:
+            self._count("throttled")
+            return 429, "application/json", THROTTLED_BODY
+        if roll < self.rate_429 + self.error_rate:
+            self._count("errors")
+            return 500, "application/json", ERROR_BODY
+
+        key = url_key(path_with_query)
+        with self._lock:
+            entries = self._by_key.get(key)
+            if entries is not None:
+                self.stats["hits"] += 1
+                entry = next(entries)
+            elif self.on_miss == "cycle" and urlsplit(key).path in self._by_path:
+                self.stats["misses"] += 1
+                entry = next(self._by_path[urlsplit(key).path])
+            else:
+                self.stats["not_found"] += 1
+                entry = None
+        if entry is None:
+            return 404, "application/json", json.dumps({"errorMessage": f"no cassette for {key}"})
+        return entry["status"], entry["content_type"], entry["body"]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"     # keep-alive
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, content_type, body = server._pick(self.path)
+                data = body.encode("utf-8")
+                gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+                if gzipped:
+                    data = gzip.compress(data)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cassette 재생 stub 서버")
+    parser.add_argument("--cassettes", required=True, help="HTTP_RECORD_DIR로 기록한 디렉터리")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 평균(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="응답 지연 표준편차(ms)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument(
+        "--fault-path", action="append", dest="fault_paths",
+        help="429/500 주입을 이 경로 prefix로 제한 (여러 번 지정 가능, 예: /v1/search)",
+    )
+    parser.add_argument("--throttle-first", type=int, default=0, help="장애 주입 대상 경로마다 처음 N건은 429")
+    parser.add_argument("--on-miss", choices=["cycle", "404"], default="cycle")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StubServer(
+        args.cassettes, host=args.host, port=args.port,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429, error_rate=args.error_rate,
+        on_miss=args.on_miss, seed=args.seed, fault_paths=args.fault_paths,
+        throttle_first=args.throttle_first,
+    )
+    print(f"stub 서버 실행 중: {server.url}")
+    for name in ("INFLEXER_BASE_URL", "NAVER_OPENAPI_BASE_URL", "NAVER_MAPS_BASE_URL"):
+        print(f"  export {name}={server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(f"종료 — {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+-- Migration: Add content_hash column to campaign table for skip-unchanged upserts
+-- Created: 2026-10-17
+-- Purpose: The Python scraper stores a sha1 fingerprint of the upserted columns and only
+--          updates a row (and bumps updated_at) when the fingerprint changes.
+--          Apply before deploying a scraper with SAVE_SKIP_UNCHANGED=true (the default).
+
+BEGIN;
+
+-- Add content_hash column (nullable; NULL rows are rewritten once on the next run)
+ALTER TABLE campaign
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(40);
+
+COMMIT;
+
+-- Rollback script (if needed):
+-- BEGIN;
+-- ALTER TABLE campaign DROP COLUMN IF EXISTS content_hash;
+-- COMMIT;
@@ -0,0 +1,23 @@
+-- Migration: Add scrape_enrich_checkpoint table for resumable scraper enrichment
+-- Created: 2026-10-17
+-- Purpose: The Python scraper records the enrichment result of each finished row per
+--          (scraper, keyword). A pod restarted mid-enrich restores those rows instead of
+--          calling the Naver APIs again. Rows are deleted once the run is saved.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS scrape_enrich_checkpoint (
+    scraper VARCHAR(50) NOT NULL,
+    keyword VARCHAR(100) NOT NULL DEFAULT '',
+    row_key VARCHAR(40) NOT NULL,
+    result JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (scraper, keyword, row_key)
+);
+
+COMMIT;
+
+-- Rollback script (if needed):
+-- BEGIN;
+-- DROP TABLE IF EXISTS scrape_enrich_checkpoint;
+-- COMMIT;
@@ -0,0 +1,27 @@
+-- Migration: Add scrape_negative_cache table for empty Naver lookup results
+-- Created: 2026-10-17
+-- Purpose: The Python scraper records titles (cache = 'local') and addresses (cache = 'geocode')
+--          for which Naver local search / geocoding returned no result, and skips them until
+--          NEGATIVE_CACHE_TTL_HOURS has passed. key_hash uses the same key as
+--          local_search_cache.title_hash / geocode_cache.address_hash. Kept separate from those
+--          tables because their lat/lng rows are also read by the Go scraper.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS scrape_negative_cache (
+    cache VARCHAR(20) NOT NULL,
+    key_hash BYTEA NOT NULL,
+    key_text TEXT NOT NULL,
+    empty_count INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (cache, key_hash)
+);
+
+CREATE INDEX IF NOT EXISTS idx_scrape_negative_cache_updated_at ON scrape_negative_cache (updated_at);
+
+COMMIT;
+
+-- Rollback script (if needed):
+-- BEGIN;
+-- DROP TABLE IF EXISTS scrape_negative_cache;
+-- COMMIT;